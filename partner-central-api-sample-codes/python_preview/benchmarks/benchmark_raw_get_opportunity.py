@@ -0,0 +1,100 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+#!/usr/bin/env python
+
+"""
+Purpose
+Compare the CPU time of GetOpportunity calls made with the boto3 client (botocore parsing followed by
+helpers.to_json_safe) and with utils.raw_client.RawPartnerCentralClient, decoded and as bytes.
+Both clients serialize, sign and send every request; the HTTP layer is replaced by a canned response,
+so only client-side CPU is measured.
+
+Usage: python benchmarks/benchmark_raw_get_opportunity.py [history_entries] [responses]
+"""
+import json
+import os
+import sys
+import time
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.credentials import Credentials
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+import utils.helpers as helper
+import utils.raw_client as raw_client
+from utils.raw_client import RawPartnerCentralClient
+from benchmark_to_json_safe import build_get_opportunity_response
+
+CREDENTIALS = Credentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY")
+HEADERS = {"Content-Type": "application/x-amz-json-1.0", "x-amzn-RequestId": "00000000-0000-0000-0000-000000000000"}
+
+class CannedBody:
+    def __init__(self, content):
+        self.content = content
+
+    def stream(self, **kwargs):
+        yield self.content
+
+class CannedHttpSession:
+    """Stands in for the raw client's connection pool."""
+    def __init__(self, content):
+        self.content = content
+
+    def send(self, request):
+        return AWSResponse(request.url, 200, HEADERS, CannedBody(self.content))
+
+    def close(self):
+        pass
+
+def build_response_body(history_entries):
+    """GetOpportunity response as the service sends it: ISO 8601 timestamps in UTC, no ResponseMetadata."""
+    response = build_get_opportunity_response(history_entries)
+    del response["ResponseMetadata"]
+    return json.dumps(response, default=lambda value: value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")).encode("utf-8")
+
+def boto3_client(content):
+    client = boto3.client("partnercentral-selling", region_name="us-east-1", aws_access_key_id=CREDENTIALS.access_key,
+                          aws_secret_access_key=CREDENTIALS.secret_key)
+    client.meta.events.register("before-send.partnercentral-selling.GetOpportunity",
+                                lambda request, **kwargs: AWSResponse(request.url, 200, HEADERS, CannedBody(content)))
+    return client
+
+def raw_partner_central_client(content):
+    client = RawPartnerCentralClient(credentials=CREDENTIALS)
+    client._http = CannedHttpSession(content)
+    return client
+
+def cpu_seconds(call, responses):
+    started = time.process_time()
+    for _ in range(responses):
+        call()
+    return time.process_time() - started
+
+def main():
+    history_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    responses = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    content = build_response_body(history_entries)
+    request_params = {"Catalog": "AWS", "Identifier": "O1234567"}
+    boto3_partner_central_client = boto3_client(content)
+    raw_client_instance = raw_partner_central_client(content)
+
+    boto3_response = helper.to_json_safe(boto3_partner_central_client.get_opportunity(**request_params))
+    raw_response = raw_client_instance.get_opportunity(**request_params)
+    assert boto3_response["Id"] == raw_response["Id"]
+    assert len(boto3_response["LifeCycle"]["NextStepsHistory"]) == len(raw_response["LifeCycle"]["NextStepsHistory"])
+
+    boto3_seconds = cpu_seconds(lambda: helper.to_json_safe(boto3_partner_central_client.get_opportunity(**request_params)), responses)
+    decoded_seconds = cpu_seconds(lambda: raw_client_instance.get_opportunity(**request_params), responses)
+    bytes_seconds = cpu_seconds(lambda: raw_client_instance.get_opportunity(raw=True, **request_params), responses)
+
+    print("-" * 88)
+    print(f"{responses} GetOpportunity responses of {len(content)} bytes with {history_entries} NextStepsHistory entries, "
+          f"JSON parser: {'orjson' if raw_client.orjson is not None else 'json'}")
+    print("-" * 88)
+    print(f"boto3 + helpers.to_json_safe: {boto3_seconds:8.2f}s CPU, {boto3_seconds * 1e6 / responses:8.1f} us per response")
+    print(f"Raw client, decoded:          {decoded_seconds:8.2f}s CPU, {decoded_seconds * 1e6 / responses:8.1f} us per response")
+    print(f"Raw client, bytes:            {bytes_seconds:8.2f}s CPU, {bytes_seconds * 1e6 / responses:8.1f} us per response")
+    print(f"Speed-up (decoded):           {boto3_seconds / decoded_seconds:8.1f}x")
+
+if __name__ == "__main__":
+    main()
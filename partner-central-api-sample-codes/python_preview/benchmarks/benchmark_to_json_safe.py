@@ -0,0 +1,67 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+#!/usr/bin/env python
+
+"""
+Purpose
+Compare helpers.to_json_safe with the json.loads(json.dumps(..., cls=DateTimeEncoder, indent=4))
+round-trip previously used to convert GetOpportunity responses into JSON-safe structures.
+
+Usage: python benchmarks/benchmark_to_json_safe.py [history_entries] [iterations]
+"""
+import copy
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+import utils.helpers as helper
+
+SAMPLE_PAYLOAD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "create_opportunity", "createOpportunity.json")
+
+def build_get_opportunity_response(history_entries):
+    """Build a large GetOpportunity-shaped response with datetimes, as botocore returns it."""
+    response = helper.remove_nulls(helper.open_json_file(SAMPLE_PAYLOAD))
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    response.pop("ClientToken", None)
+    response["Id"] = "O1234567"
+    response["Arn"] = "arn:aws:partnercentral:us-east-1::catalog/Sandbox/opportunity/O1234567"
+    response["CreatedDate"] = now
+    response["LastModifiedDate"] = now
+    response["LifeCycle"]["NextStepsHistory"] = [
+        {"Time": now + timedelta(hours=i), "Value": f"Next step {i}: follow up with the customer"}
+        for i in range(history_entries)
+    ]
+    response["Customer"]["Contacts"] = [copy.deepcopy(response["Customer"]["Contacts"][0]) for _ in range(history_entries // 10 + 1)]
+    response["ResponseMetadata"] = {
+        "RequestId": "00000000-0000-0000-0000-000000000000",
+        "HTTPStatusCode": 200,
+        "HTTPHeaders": {"content-type": "application/x-amz-json-1.0", "date": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        "RetryAttempts": 0
+    }
+    return response
+
+def round_trip(response):
+    return json.loads(json.dumps(response, cls=helper.DateTimeEncoder, indent=4))
+
+def main():
+    history_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    response = build_get_opportunity_response(history_entries)
+
+    assert helper.to_json_safe(response) == round_trip(response)
+
+    round_trip_seconds = min(timeit.repeat(lambda: round_trip(response), number=iterations, repeat=3))
+    single_pass_seconds = min(timeit.repeat(lambda: helper.to_json_safe(response), number=iterations, repeat=3))
+
+    print("-" * 88)
+    print(f"GetOpportunity response with {history_entries} NextStepsHistory entries, {iterations} conversions")
+    print("-" * 88)
+    print(f"json.loads(json.dumps(...)): {round_trip_seconds * 1e6 / iterations:8.1f} us per response")
+    print(f"helpers.to_json_safe:        {single_pass_seconds * 1e6 / iterations:8.1f} us per response")
+    print(f"Speed-up:                    {round_trip_seconds / single_pass_seconds:8.1f}x")
+
+if __name__ == "__main__":
+    main()
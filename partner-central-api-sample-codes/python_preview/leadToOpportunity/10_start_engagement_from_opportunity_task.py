@@ -8,7 +8,6 @@ Purpose
 PC-API -14 Start Engagement from Opportunity Task
 """
 import logging
-import boto3
 import sys
 import os
 import json
@@ -16,15 +15,12 @@ import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.config as config
+from utils.aws_client import get_boto3_client
 from botocore.client import ClientError
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1',
-        endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"]
-)
+partner_central_client = get_boto3_client(serviceName, endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"])
 
 def load_shared_env_values():
     """Load values from shared environment file"""
@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 #!/usr/bin/env python
-import boto3
 import logging
 import sys
 import os
@@ -10,6 +9,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.config as config
+from utils.aws_client import get_boto3_client
 from botocore.client import ClientError
 
 serviceName = "partnercentral-selling"
@@ -118,11 +118,7 @@ def usage_demo():
     print(f"\nUsing Engagement Invitation ID: {invitation_id}")
     print()
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1',
-        endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"]
-    )
+    partner_central_client = get_boto3_client(serviceName, endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"])
 
     response = get_engagement_invitation(partner_central_client, invitation_id)
     if response:
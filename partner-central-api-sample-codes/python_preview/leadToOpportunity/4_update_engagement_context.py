@@ -2,20 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 #!/usr/bin/env python
-import boto3
 import logging
 import sys
 import os
 import json
 import uuid
-import requests
 from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.config as config
+from utils.aws_client import get_boto3_client
+from utils.signed_transport import get_signed_transport
 from botocore.client import ClientError
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
 
 serviceName = "partnercentral-selling"
 
@@ -66,29 +64,16 @@ def get_engagement_id_from_args_and_env():
 def get_engagement_details_raw_json(partner_central_client, engagement_id):
     """Get engagement details with raw JSON to preserve exact timestamp precision"""
     try:
-        # Get AWS credentials from the boto3 client
-        credentials = partner_central_client._get_credentials()
-        
-        # Prepare the request
-        url = config.CONFIG_VARS["ENDPOINT_URL"] + "/"
-        headers = {
-            'Content-Type': 'application/x-amz-json-1.0',
-            'X-Amz-Target': 'AWSPartnerCentralSelling.GetEngagement'
-        }
+        # Signed over the client's pooled session with cached credentials, so repeated calls are cheap
+        transport = get_signed_transport(partner_central_client)
         
         payload = {
             "Catalog": config.CONFIG_VARS["CATALOG"],
             "Identifier": engagement_id
         }
         
-        # Create AWS request for signing
-        request = AWSRequest(method='POST', url=url, data=json.dumps(payload), headers=headers)
-        
-        # Sign the request
-        SigV4Auth(credentials, 'partnercentral-selling', 'us-east-1').add_auth(request)
-        
         # Make the HTTP request
-        response = requests.post(url, data=request.body, headers=dict(request.headers))
+        response = transport.post('GetEngagement', payload)
         
         if response.status_code == 200:
             # Parse the raw JSON to preserve exact timestamp format
@@ -237,11 +222,7 @@ def usage_demo():
     print(f"\nUpdating context for Engagement ID: {engagement_id}")
     print()
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1',
-        endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"]
-    )
+    partner_central_client = get_boto3_client(serviceName, endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"])
 
     update_engagement_context(partner_central_client, engagement_id)
 
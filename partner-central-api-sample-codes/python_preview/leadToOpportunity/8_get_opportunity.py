@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 #!/usr/bin/env python
-import boto3
 import logging
 import sys
 import os
@@ -10,6 +9,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.config as config
+from utils.aws_client import get_boto3_client
 from botocore.client import ClientError
 
 serviceName = "partnercentral-selling"
@@ -72,7 +72,7 @@ def create_update_opportunity_json(opportunity_data):
         return None
     
     # Make a deep copy to avoid modifying the original
-    update_data = json.loads(json.dumps(opportunity_data, default=str))
+    update_data = helper.to_json_safe(opportunity_data)
     
     # Remove ResponseMetadata if present
     if 'ResponseMetadata' in update_data:
@@ -124,11 +124,7 @@ def usage_demo():
     print(f"\nGetting details for Opportunity ID: {opportunity_id}")
     print()
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1',
-        endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"]
-    )
+    partner_central_client = get_boto3_client(serviceName, endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"])
 
     # Get opportunity details
     response = get_opportunity(partner_central_client, opportunity_id)
@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 #!/usr/bin/env python
-import boto3
 import logging
 import sys
 import os
@@ -11,6 +10,7 @@ import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.config as config
+from utils.aws_client import get_boto3_client
 from botocore.client import ClientError
 
 serviceName = "partnercentral-selling"
@@ -86,7 +86,7 @@ def transform_opportunity_for_update(opportunity_data):
     print("Transforming opportunity data for update...")
     
     # Make a deep copy to avoid modifying the original
-    update_data = json.loads(json.dumps(opportunity_data, default=str))
+    update_data = helper.to_json_safe(opportunity_data)
     
     # Remove ResponseMetadata if present
     if 'ResponseMetadata' in update_data:
@@ -256,11 +256,7 @@ def usage_demo():
     print()
 
     # Create the boto3 client
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1',
-        endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"]
-    )
+    partner_central_client = get_boto3_client(serviceName, endpoint_url=config.CONFIG_VARS["ENDPOINT_URL"])
     
     # Step 1: Get the full opportunity using get_opportunity API
     opportunity_data = get_opportunity_details(partner_central_client, opportunity_id)
@@ -0,0 +1,40 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+Client factory for the sample scripts. Every client retries throttling and transient errors
+through the shared policy in utils.retry and uses the pooled, keep-alive connection settings
+of utils.client_config.
+"""
+
+import boto3
+
+from utils.client_config import build_config
+from utils.retry import install_retry
+
+
+def get_boto3_client(service_name, region_name='us-east-1', retry_policy=None, config=None, concurrency=None,
+                     **client_kwargs):
+    """
+    Get a boto3 client that retries with backoff and jitter.
+
+    Args:
+        service_name (str): The AWS service name
+        region_name (str): The AWS region name (default: us-east-1, None for the default region)
+        retry_policy (RetryPolicy): Policy to use; a new policy with its own budget by default.
+            Pass one policy to several clients to share a job's retry budget.
+        config (botocore.config.Config): Extra client configuration
+        concurrency (int): Threads that will share the client; sizes the connection pool
+        client_kwargs: Passed through to boto3.client (e.g. endpoint_url)
+
+    Returns:
+        boto3.client: A boto3 client for the specified service
+    """
+    client = boto3.client(
+        service_name=service_name,
+        region_name=region_name,
+        config=build_config(concurrency, config),
+        **client_kwargs
+    )
+    return install_retry(client, retry_policy)
@@ -24,6 +24,22 @@ def pretty_print_datetime(json_object):
         print("Oject to print is null.")
 
 
+def to_json_safe(data):
+    """
+    Convert a botocore response into JSON-safe structures in a single pass:
+    datetimes become ISO 8601 strings and nested dicts and lists are copied.
+    Same result as json.loads(json.dumps(data, cls=DateTimeEncoder)) without serializing and parsing.
+    """
+    if isinstance(data, dict):
+        return {k: to_json_safe(v) for k, v in data.items()}
+    elif isinstance(data, (list, tuple)):
+        return [to_json_safe(item) for item in data]
+    elif isinstance(data, datetime):
+        return data.isoformat()
+    else:
+        return data
+
+
 def load_shared_env_vars():
     """Load shared environment variables from the shared_env.json file"""
     import os
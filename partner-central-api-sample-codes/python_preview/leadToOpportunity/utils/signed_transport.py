@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+Signed transport for raw Partner Central Selling API calls, such as GetEngagement with the exact
+timestamp strings of the response. Requests are SigV4-signed JSON POSTs sent over one requests.Session,
+so consecutive calls reuse pooled keep-alive connections instead of a new TCP and TLS handshake each.
+Signing credentials are frozen once and reused; when the credentials are close to expiry, one caller
+refreshes them while the others keep signing with the cached ones, which are still valid.
+Error responses are classified by their error code (x-amzn-ErrorType or the __type of the body) and
+throttling, transient and connection errors are retried with the policy of utils.retry, the same one
+the boto3 clients of utils.aws_client use.
+"""
+
+import json
+import threading
+
+import requests
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.client import ClientError
+from botocore.exceptions import EndpointConnectionError, ReadTimeoutError
+from requests.adapters import HTTPAdapter
+
+from utils.client_config import build_config
+from utils.retry import RetryPolicy, is_idempotent
+
+TARGET_PREFIX = "AWSPartnerCentralSelling."
+CONTENT_TYPE = "application/x-amz-json-1.0"
+
+_transports_lock = threading.Lock()
+
+
+class SignedTransport:
+    """
+    Signs and sends API calls for one endpoint:
+
+        transport = SignedTransport.from_client(partner_central_client)
+        response = transport.post("GetEngagement", {"Catalog": "Sandbox", "Identifier": engagement_id})
+
+    `response` is a requests.Response. The transport is safe to share across threads; the
+    connection pool and timeouts follow utils.client_config, sized for `concurrency` threads.
+    """
+
+    def __init__(self, credentials, endpoint_url, region_name='us-east-1', signing_name='partnercentral-selling',
+                 concurrency=None, retry_policy=None):
+        self.endpoint_url = endpoint_url.rstrip("/") + "/"
+        self.region_name = region_name
+        self.signing_name = signing_name
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._credentials = credentials
+        self._frozen_credentials = None
+        self._refresh_lock = threading.Lock()
+        config = build_config(concurrency)
+        self.timeout = (config.connect_timeout, config.read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.max_pool_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_client(cls, client, concurrency=None):
+        """Transport with the credentials, endpoint, region and retry policy of a boto3 client."""
+        return cls(client._get_credentials(), client.meta.endpoint_url, client.meta.region_name,
+                   client.meta.service_model.signing_name, concurrency, getattr(client, "retry_policy", None))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def credentials(self):
+        """Frozen signing credentials, refreshed ahead of their expiry."""
+        refresh_needed = getattr(self._credentials, "refresh_needed", None)
+        if self._frozen_credentials is None or (refresh_needed and refresh_needed()):
+            # Without cached credentials every caller waits for them; otherwise only one caller refreshes
+            if self._refresh_lock.acquire(blocking=self._frozen_credentials is None):
+                try:
+                    self._frozen_credentials = self._credentials.get_frozen_credentials()
+                finally:
+                    self._refresh_lock.release()
+        return self._frozen_credentials
+
+    def _send(self, operation_name, body):
+        request = AWSRequest(method='POST', url=self.endpoint_url, data=body, headers={
+            'Content-Type': CONTENT_TYPE,
+            'X-Amz-Target': TARGET_PREFIX + operation_name
+        })
+        SigV4Auth(self.credentials(), self.signing_name, self.region_name).add_auth(request)
+        try:
+            return self.session.post(self.endpoint_url, data=request.body, headers=dict(request.headers),
+                                     timeout=self.timeout)
+        except requests.exceptions.ReadTimeout as error:
+            raise ReadTimeoutError(endpoint_url=self.endpoint_url, error=error) from error
+        except requests.exceptions.ConnectionError as error:
+            raise EndpointConnectionError(endpoint_url=self.endpoint_url, error=error) from error
+
+    def post(self, operation_name, payload):
+        """
+        Sign and send an operation with its JSON payload; returns the requests.Response.
+        Error responses are retried when the transport's RetryPolicy classifies their error code as
+        throttling or transient (a ThrottlingException may come as HTTP 400), like connection errors;
+        writes without a ClientToken are only retried after throttling. A terminal error response,
+        or the last one when the retries are spent, is returned.
+        """
+        body = json.dumps(payload)
+        responses = []
+
+        def send():
+            response = self._send(operation_name, body)
+            if response.status_code >= 400:
+                responses.append(response)
+                raise ClientError(_error_response(response), operation_name)
+            return response
+
+        try:
+            return self.retry_policy.call(operation_name, send,
+                                          idempotent=is_idempotent(operation_name, "ClientToken" in payload))
+        except ClientError:
+            return responses[-1]
+
+
+def _error_response(response):
+    """boto3-style error of an awsJson 1.0 error response, for the retry policy."""
+    try:
+        details = response.json() if response.content else {}
+    except ValueError:
+        details = {}
+    if not isinstance(details, dict):
+        details = {}
+    code = details.get("__type") or response.headers.get("x-amzn-ErrorType") or f"HTTP{response.status_code}"
+    return {
+        "Error": {"Code": code.split("#")[-1].split(":")[0], "Message": response.text},
+        "ResponseMetadata": {"HTTPStatusCode": response.status_code},
+    }
+
+
+def get_signed_transport(client, concurrency=None):
+    """The signed transport of a boto3 client, created on first use and kept on the client."""
+    transport = getattr(client, "signed_transport", None)
+    if transport is None:
+        with _transports_lock:
+            transport = getattr(client, "signed_transport", None)
+            if transport is None:
+                transport = client.signed_transport = SignedTransport.from_client(client, concurrency)
+    return transport
@@ -31,7 +31,7 @@ import socket
 import start_engagement_by_accepting_invitation_task
 import update_opportunity_stage_api
 import datetime
-from utils.helpers import DateTimeEncoder
+from utils.helpers import to_json_safe
 from functools import wraps
 from config import CONFIG
 
@@ -424,8 +424,7 @@ def fetch_opportunity():
         result = get_opportunity.get_opportunity(opportunity_id)
         if isinstance(result, dict) and "error" in result:
             return jsonify({"error": result["error"]}), 500
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -436,8 +435,7 @@ def fetch_opportunities():
         result = list_opportunities_noPaging.get_list_of_opportunities()
         if isinstance(result, dict) and "error" in result:
             return jsonify({"error": result["error"]}), 500
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -448,8 +446,7 @@ def fetch_solutions():
         result = list_solutions.get_list_of_solutions()
         if isinstance(result, dict) and "error" in result:
             return jsonify({"error": result["error"]}), 500
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -460,8 +457,7 @@ def fetch_engagement_invitations():
         result = list_engagement_invitations.list_engagement_invitations()
         if isinstance(result, dict) and "error" in result:
             return jsonify({"error": result["error"]}), 500
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -475,8 +471,7 @@ def fetch_engagement_invitation():
         result = get_engagement_invitation.get_opportunity_engagement_invitation(invitation_id)
         if isinstance(result, dict) and "error" in result:
             return jsonify({"error": result["error"]}), 500
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -503,9 +498,7 @@ def create_opportunity():
             result = create_opportunity_api.create_opportunity_with_payload(payload_json, client_token)
         
         # Convert datetime objects to ISO format for JSON serialization
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -522,8 +515,7 @@ def associate_opportunity():
     
     try:
         result = associate_opportunity_api.associate_opportunity_with_entity(opportunity_id, entity_type, entity_id)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -535,8 +527,7 @@ def start_engagement():
         return jsonify({"error": "Opportunity ID is required"}), 400
     try:
         result = start_engagement_from_opportunity_api.start_engagement_from_opportunity(opportunity_id)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -548,8 +539,7 @@ def simulate_approval():
         return jsonify({"error": "Opportunity ID is required"}), 400
     try:
         result = simulate_approval_api.get_and_update_opportunity(opportunity_id)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -561,8 +551,7 @@ def simulate_action_required():
         return jsonify({"error": "Opportunity ID is required"}), 400
     try:
         result = simulate_action_required_api.get_and_update_opportunity(opportunity_id)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -574,8 +563,7 @@ def accept_invitation():
         return jsonify({"error": "Invitation ID is required"}), 400
     try:
         result = start_engagement_by_accepting_invitation_task.start_engagement_by_accepting_invitation_task(invitation_id)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
@@ -588,8 +576,7 @@ def update_opportunity_stage():
         return jsonify({"error": "Opportunity ID and stage are required"}), 400
     try:
         result = update_opportunity_stage_api.update_opportunity_stage(opportunity_id, stage)
-        json_result = json.dumps(result, cls=DateTimeEncoder, indent=4)
-        return jsonify({"result": json.loads(json_result)})
+        return jsonify({"result": to_json_safe(result)})
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
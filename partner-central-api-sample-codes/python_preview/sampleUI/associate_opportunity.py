@@ -10,18 +10,15 @@ PC-API -12 Associating a solution
 PC-API -13 Associating an offer
 """
 import logging
-import boto3
 import utils.helpers as helper
 from botocore.client import ClientError
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def associate_opportunity(entity_type, entity_identifier, opportunityIdentifier):
     associate_opportunity_request ={
@@ -7,7 +7,6 @@
 Purpose
 PC-API -19 Bulk Creating Opportunities
 """
-import boto3
 import time
 import logging
 import sys
@@ -17,6 +16,7 @@ import utils.helpers as helper
 import utils.stringify_details as sd
 from botocore.client import ClientError
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
@@ -46,10 +46,7 @@ def usage_demo():
     print("Create Opportunity.")
     print("-" * 88)
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-    )
+    partner_central_client = get_boto3_client(serviceName)
 
     file_paths = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
 
@@ -15,16 +15,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import logging
-import boto3
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 SERVICE_NAME = "partnercentral-selling"
 REGION_NAME = 'us-east-1'
 
-partner_central_client = boto3.client(
-    service_name=SERVICE_NAME,
-    region_name=REGION_NAME
-)
+partner_central_client = get_boto3_client(SERVICE_NAME, REGION_NAME)
 
 def fetch_opportunity_list():
     """Fetch the list of opportunities from the API with filters."""
@@ -132,7 +129,7 @@ def save_individual_files(data_records, directory, aws):
         os.makedirs(directory)
 
     # Initialize S3 client
-    s3_client = boto3.client('s3')
+    s3_client = get_boto3_client('s3', region_name=None)
     bucket_name = os.getenv('S3_BUCKET_NAME')  # Get bucket name from environment variable
     
     if not bucket_name:
@@ -171,12 +168,12 @@ def main():
     detailed_opportunities_aws = []
 
     for opportunity in opportunities:
-        opportunity_data = json.loads(json.dumps(opportunity, cls=helper.DateTimeEncoder, indent=4))
+        opportunity_data = helper.to_json_safe(opportunity)
         opportunity_details = fetch_opportunity_details(opportunity_data.get("Id"))
         opportunity_details_aws = fetch_opportunity_details_aws(opportunity_data.get("Id"))
         print(opportunity_data.get("Id"))
-        detailed_opportunity_data = json.loads(json.dumps(opportunity_details, cls=helper.DateTimeEncoder, indent=4))
-        detailed_opportunity_aws_data = json.loads(json.dumps(opportunity_details_aws, cls=helper.DateTimeEncoder, indent=4))
+        detailed_opportunity_data = helper.to_json_safe(opportunity_details)
+        detailed_opportunity_aws_data = helper.to_json_safe(opportunity_details_aws)
         detailed_opportunities.append(detailed_opportunity_data)
         detailed_opportunities_aws.append(detailed_opportunity_aws_data)
 
@@ -10,18 +10,15 @@ PC-API -15 Removing an offer
 PC-API -16 Removing a product
 """
 import logging
-import boto3
 import utils.helpers as helper
 from botocore.client import ClientError
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def disassociate_opportunity(entity_type, entity_identifier, opportunityIdentifier):
     disassociate_opportunity_request ={
@@ -13,17 +13,14 @@ Subsequently, the invitation will no longer be available for the partner to act
 """
 import json
 import logging
-import boto3
 import utils.helpers as helper
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def reject_opportunity_engagement_invitation(identifier, reject_reason):
     reject_opportunity_engagement_invitation_request ={
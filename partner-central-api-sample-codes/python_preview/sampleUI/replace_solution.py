@@ -8,18 +8,15 @@ Purpose
 PC-API -17 Replacing a solution
 """
 import logging
-import boto3
 import utils.helpers as helper
 from botocore.client import ClientError
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def replace_solution(original_entity_identifier, new_entity_identifier, opportunityIdentifier):
     disassociate_opportunity_request ={
@@ -8,7 +8,6 @@ Purpose
 PC-API-2  Updating Partner Originated Opportunity
 """
 import logging
-import boto3
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,13 +15,11 @@ import utils.helpers as helper
 from botocore.client import ClientError
 import utils.stringify_details as sd
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def get_opportunity(identifier):
     get_opportunity_request ={
@@ -9,133 +9,134 @@ Utility functions for creating AWS clients with flexible credential sources
 """
 
 import os
+import hashlib
+import logging
+import threading
 import boto3
-import datetime
 import botocore.session
-from botocore.exceptions import ProfileNotFound
+from utils.client_config import build_config
+from utils.retry import RetryBudget, RetryPolicy, install_retry
 
 # Create logs directory and log file
 log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
 os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(log_dir, 'aws_client.log')
 
-# Create the log file if it doesn't exist
-if not os.path.exists(log_file):
+# One file handler, opened once, for the whole module
+logger = logging.getLogger(__name__)
+logger.propagate = False
+if not logger.handlers:
     try:
-        with open(log_file, 'w') as f:
-            f.write(f"{datetime.datetime.now()} - Log file created\n")
-        print(f"Created log file: {log_file}")
-    except Exception as e:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    except OSError as e:
         print(f"Error creating log file: {str(e)}")
 
-# Simple direct file logging
 def log_message(message):
-    """Write a message directly to the log file"""
-    try:
-        with open(log_file, 'a') as f:
-            f.write(f"{datetime.datetime.now()} - {message}\n")
-    except Exception as e:
-        print(f"Error writing to log file: {str(e)}")
+    """Write a message to the log file"""
+    logger.info(message)
 
 
 # Log initialization
 log_message("AWS client module initialized")
 
-def get_boto3_client(service_name, region_name='us-east-1'):
+AWS_ENV_CREDENTIALS = ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN', 'AWS_REGION')
+
+# Clients by (service, region, credential identity, retry policy)
+_clients = {}
+_clients_lock = threading.Lock()
+_use_login = None
+# Last (environment values, identity) pair, so the hash is only computed when the login changes
+_last_identity = (None, None)
+
+
+def use_login():
+    """The useLogin flag from config.py, read once"""
+    global _use_login
+    if _use_login is None:
+        try:
+            from config import CONFIG
+            _use_login = CONFIG.get('useLogin', False)
+            log_message(f"useLogin is {_use_login}")
+        except ImportError:
+            _use_login = False
+            log_message("Failed to import CONFIG, defaulting useLogin to False")
+    return _use_login
+
+
+def _credential_identity():
+    """
+    Identify the credentials a client would be created with: the login credentials that app.py
+    keeps in the environment, or the default chain without environment variables.
+    Secrets are hashed so that they are not used as dictionary keys in clear text.
+    """
+    global _last_identity
+    if use_login() and os.environ.get('AWS_ACCESS_KEY_ID') and os.environ.get('AWS_SECRET_ACCESS_KEY'):
+        values = tuple(os.environ.get(var, '') for var in AWS_ENV_CREDENTIALS)
+        last_values, identity = _last_identity
+        if values != last_values:
+            identity = ("env", hashlib.sha256("\0".join(values).encode("utf-8")).hexdigest())
+            _last_identity = (values, identity)
+        return identity
+    return ("default",)
+
+
+def _create_client(service_name, region_name, identity, retry_policy):
+    if identity[0] == "env":
+        log_message(f"Creating {service_name} client using environment variables")
+        session = boto3.Session(
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            aws_session_token=os.environ.get('AWS_SESSION_TOKEN'),
+            region_name=os.environ.get('AWS_REGION', region_name)
+        )
+    else:
+        # The AWS credentials file, then the instance profile: the default chain minus environment variables
+        log_message(f"Creating {service_name} client using the credentials file or instance profile")
+        botocore_session = botocore.session.Session()
+        botocore_session.get_component('credential_provider').remove('env')
+        session = boto3.Session(botocore_session=botocore_session, region_name=region_name)
+    # Cached clients live as long as the app, so they are bounded per call rather than by a total budget
+    retry_policy = retry_policy or RetryPolicy(budget=RetryBudget(None))
+    return install_retry(session.client(service_name, config=build_config()), retry_policy)
+
+
+def get_boto3_client(service_name, region_name='us-east-1', retry_policy=None):
     """
-    Get a boto3 client using the best available credential source
+    Get a cached boto3 client using the best available credential source.
+    Clients are cached by service, region and credential identity, so repeated calls cost a
+    dictionary lookup; the cache is safe to use from many threads and never changes os.environ.
+    Every client retries throttling and transient errors through the shared policy in utils.retry.
     
-    Priority order when useLogin is True:
+    Credentials when useLogin is True:
     1. Environment variables (set from session in app.py)
     2. AWS credentials file (for local development)
     3. Instance profile (for EC2 deployment)
     
-    Priority order when useLogin is False:
+    Credentials when useLogin is False (environment variables are ignored):
     1. AWS credentials file (for local development)
     2. Instance profile (for EC2 deployment)
     
     Args:
         service_name (str): The AWS service name
         region_name (str): The AWS region name (default: us-east-1)
+        retry_policy (RetryPolicy): Policy to use; by default retries are bounded per call only
         
     Returns:
         boto3.client: A boto3 client for the specified service
     """
-    # Import CONFIG to check useLogin flag
-    try:
-        from config import CONFIG
-        use_login = CONFIG.get('useLogin', False)
-        log_message(f"useLogin is {use_login}")
-    except ImportError:
-        use_login = False
-        log_message("Failed to import CONFIG, defaulting useLogin to False")
-    
-    # Save environment variables
-    saved_env_vars = {}
-    aws_env_vars = ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN', 'AWS_REGION']
-    
-    # If useLogin is False, temporarily clear environment variables
-    if not use_login:
-        for var in aws_env_vars:
-            if var in os.environ:
-                saved_env_vars[var] = os.environ[var]
-                del os.environ[var]
-                log_message(f"Temporarily removed {var} from environment")
-    
-    try:
-        # Check for environment variables only if useLogin is True
-        if use_login and os.environ.get('AWS_ACCESS_KEY_ID') and os.environ.get('AWS_SECRET_ACCESS_KEY'):
-            log_message(f"Creating {service_name} client using environment variables")
-            
-            # Explicitly pass credentials to ensure we're using the right ones
-            client_kwargs = {
-                'service_name': service_name,
-                'region_name': os.environ.get('AWS_REGION', region_name),
-                'aws_access_key_id': os.environ.get('AWS_ACCESS_KEY_ID'),
-                'aws_secret_access_key': os.environ.get('AWS_SECRET_ACCESS_KEY')
-            }
-            
-            # Add session token if available
-            if os.environ.get('AWS_SESSION_TOKEN'):
-                client_kwargs['aws_session_token'] = os.environ.get('AWS_SESSION_TOKEN')
-            
-            return boto3.client(**client_kwargs)
-        
-        # Try to use the default profile from ~/.aws/credentials
-        try:
-            log_message("Attempting to load credentials from AWS credentials file")
-            boto_session = boto3.Session(region_name=region_name)
-            credentials = boto_session.get_credentials()
-            
-            if credentials and credentials.access_key and credentials.secret_key:
-                log_message("Found credentials in AWS credentials file")
-                
-                # Create a client with explicit credentials
-                client_kwargs = {
-                    'service_name': service_name,
-                    'region_name': region_name,
-                    'aws_access_key_id': credentials.access_key,
-                    'aws_secret_access_key': credentials.secret_key
-                }
-                
-                # Add token if available
-                if hasattr(credentials, 'token') and credentials.token:
-                    client_kwargs['aws_session_token'] = credentials.token
-                    
-                return boto3.client(**client_kwargs)
-            else:
-                log_message("No credentials found in AWS credentials file")
-        except Exception as e:
-            log_message(f"Error loading credentials from file: {str(e)}")
-        
-        # Finally, fall back to instance profile (for production)
-        log_message(f"Creating {service_name} client using instance profile")
-        return boto3.client(
-            service_name=service_name,
-            region_name=region_name
-        )
-    finally:
-        # Restore environment variables
-        for var, value in saved_env_vars.items():
-            os.environ[var] = value
-            log_message(f"Restored {var} to environment")
+    key = (service_name, region_name, _credential_identity(), retry_policy)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                if key[2][0] == "env":
+                    # The environment holds one login at a time; clients of earlier logins are unreachable
+                    for stale in [k for k in _clients if k[2][0] == "env" and k[2] != key[2]]:
+                        del _clients[stale]
+                client = _clients[key] = _create_client(service_name, region_name, key[2], retry_policy)
+    return client
+
@@ -0,0 +1,165 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Shared retry policy for Partner Central and Marketplace API calls: throttling, transient and
+connection errors are retried with exponential backoff and full jitter, within a per-job RetryBudget.
+Writes without a ClientToken are only retried after throttling, so a retry never applies them twice.
+"""
+
+# Copied to sampleUI/utils and leadToOpportunity/utils; see test/test_shared_modules.py
+
+import logging
+import random
+import threading
+import time
+
+from botocore.client import ClientError
+from botocore.exceptions import ConnectionError, HTTPClientError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 20.0
+DEFAULT_RETRY_BUDGET = 500
+
+IDEMPOTENT_OPERATION_PREFIXES = ("Get", "List", "Describe")
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException", "Throttling", "ThrottledException", "TooManyRequestsException",
+    "RequestLimitExceeded", "SlowDown",
+}
+
+RETRYABLE_ERROR_CODES = THROTTLING_ERROR_CODES | {
+    # Transient service errors
+    "InternalServerException", "InternalServiceException", "InternalFailure", "InternalError",
+    "ServiceUnavailable", "ServiceUnavailableException", "RequestTimeout", "RequestTimeoutException",
+    # Marketplace Catalog: the entity is still locked by another change set
+    "ResourceInUseException", "ResourceNotReadyException",
+}
+
+TERMINAL_ERROR_CODES = {
+    "ValidationException", "AccessDeniedException", "ResourceNotFoundException", "ConflictException",
+    "ServiceQuotaExceededException", "ResourceNotSupportedException", "UnauthorizedException",
+    "ExpiredTokenException", "UnrecognizedClientException", "InvalidParameterException",
+}
+
+def is_retryable(error):
+    """Return True if `error` (a ClientError or botocore connection error) is worth retrying."""
+    if isinstance(error, (ConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code")
+    if code in RETRYABLE_ERROR_CODES:
+        return True
+    if code in TERMINAL_ERROR_CODES:
+        return False
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+    return status == 429 or status >= 500
+
+def is_throttling(error):
+    """Return True if `error` is a throttling error, i.e. the request was rejected without being run."""
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code")
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in THROTTLING_ERROR_CODES or status == 429
+
+def is_idempotent(operation_name, has_client_token=False):
+    """
+    Return True if repeating the operation cannot apply it twice: reads (Get, List, Describe) and
+    operations that carry a ClientToken, which the service uses to recognize a repeated request.
+    """
+    return has_client_token or operation_name.startswith(IDEMPOTENT_OPERATION_PREFIXES)
+
+
+class RetryBudget:
+    """Thread-safe count of the retries a job may still spend across all of its calls."""
+
+    def __init__(self, max_retries=DEFAULT_RETRY_BUDGET):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        with self._lock:
+            if self.max_retries is not None and self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self):
+        with self._lock:
+            return None if self.max_retries is None else self.max_retries - self.used
+
+
+class RetryPolicy:
+    """
+    Retries retryable errors with exponential backoff and full jitter:
+    before attempt n+1 the call sleeps a random time between 0 and min(max_delay, base_delay * 2**n).
+    Terminal errors, the last attempt and an exhausted budget re-raise the error unchanged.
+    With a rate_limiter (utils.rate_limiter.RateLimiter), each retry waits for a token of its operation.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, budget=None, rate_limiter=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget is not None else RetryBudget()
+        self.rate_limiter = rate_limiter
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, operation_name, fn, *args, idempotent=True, **kwargs):
+        """
+        Call fn(*args, **kwargs), retrying retryable errors.
+        With idempotent=False only throttling errors are retried.
+        """
+        should_retry = is_retryable if idempotent else is_throttling
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except (ClientError, ConnectionError, HTTPClientError) as err:
+                attempt += 1
+                if not should_retry(err) or attempt >= self.max_attempts or not self.budget.try_spend():
+                    raise
+                delay = self.backoff(attempt - 1)
+                logger.warning("Retrying %s after %s (attempt %d of %d) in %.2fs",
+                               operation_name, _error_code(err), attempt + 1, self.max_attempts, delay)
+                time.sleep(delay)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(operation_name)
+
+
+def _error_code(error):
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code")
+    return type(error).__name__
+
+
+def install_retry(client, policy=None):
+    """
+    Route every API call of a boto3 client (operations, paginators and waiters) through `policy`.
+    Operations with an idempotency token in their model are idempotent: botocore fills in a missing
+    ClientToken in api_params, and every attempt sends the same one.
+    This overrides _make_api_call on the client instance only, so other clients are unaffected.
+    """
+    policy = policy or RetryPolicy()
+    make_api_call = client._make_api_call
+    service_model = client.meta.service_model
+
+    def _make_api_call(operation_name, api_params):
+        idempotent = is_idempotent(operation_name, bool(service_model.operation_model(operation_name).idempotent_members))
+        return policy.call(operation_name, make_api_call, operation_name, api_params, idempotent=idempotent)
+
+    client._make_api_call = _make_api_call
+    client.retry_policy = policy
+    return client
@@ -8,18 +8,15 @@ Purpose
 PC-API-07 Assigning a new owner
 """
 import logging
-import boto3
 import utils.helpers as helper
 from botocore.client import ClientError
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def assign_opportunity(identifier):
     assign_opportunity_request ={
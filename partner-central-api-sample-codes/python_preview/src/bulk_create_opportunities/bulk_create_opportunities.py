@@ -7,7 +7,7 @@
 Purpose
 PC-API -19 Bulk Creating Opportunities
 """
-import boto3
+import argparse
 import time
 import logging
 import sys
@@ -16,50 +16,119 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.stringify_details as sd
 from botocore.client import ClientError
-from utils.constants import CATALOG_TO_USE
+from utils.verification import Verifier, VERIFICATION_POLICIES, DEFAULT_VERIFICATION
+import utils.verification as verification
+import utils.payload_validator as payload_validator
+import utils.bulk_input as bulk_input
+import utils.bulk_runner as bulk_runner
+from utils.run_journal import RunJournal, content_hash, derive_client_token, CREATED, SUBMITTED
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
+# Run journal shared with bulk_create_submit_opportunities.py: files created by either script are skipped
+JOURNAL_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bulk_create_journal.db")
 
-def create_opportunitiy(partner_central_client, file_path):
-    create_opportunity_request_orig= sd.stringify_json(file_path)
-    create_opportunity_request = helper.remove_nulls(create_opportunity_request_orig)
+def create_opportunitiy(partner_central_client, file_path, verifier=None, create_opportunity_request=None):
+    if create_opportunity_request is None:
+        create_opportunity_request_orig= sd.stringify_json(file_path)
+        create_opportunity_request = helper.remove_nulls(create_opportunity_request_orig)
+    # Same content, same ClientToken: rerunning the script does not create duplicates
+    create_opportunity_request["ClientToken"] = derive_client_token(
+        "CreateOpportunity", content_hash(create_opportunity_request))
     try:
         # Perform an API call
         response = partner_central_client.create_opportunity(**create_opportunity_request)
-        get_response = partner_central_client.get_opportunity(
-            Identifier=response["Id"],
-            Catalog=CATALOG_TO_USE
-        )
-        print(f"GetOpportunity: {get_response}")
+        if verifier:
+            verifier.written(response["Id"], create_opportunity_request, file_path)
         return response
 
     except ClientError as err:
         # Catch all client exceptions
         print(err.response)
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Bulk create opportunities from JSON files.")
+    parser.add_argument("--input", default='src/bulk_create_opportunities/opportunities',
+                        help="Directory with one JSON file per opportunity, or an NDJSON (.ndjson/.jsonl) "
+                             "or flat CSV file with one opportunity per line/row")
+    parser.add_argument("--verify", choices=VERIFICATION_POLICIES, default=DEFAULT_VERIFICATION,
+                        help="Read written opportunities back: off, inline after each write, "
+                             f"or deferred to one concurrent batch at the end (default: {DEFAULT_VERIFICATION})")
+    parser.add_argument("--skip-validation", action="store_true",
+                        help="Do not validate the files against opportunity-samples/ before the run")
+    parser.add_argument("--journal", default=JOURNAL_DB,
+                        help="SQLite run journal used to skip files that were already created")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each creating a deterministic shard of the input with its own client (default: 1)")
+    return parser.parse_args()
+
+def new_counts():
+    return {"created": 0, "failed": 0, "skipped": 0}
+
+def create_records(partner_central_client, records, counts, journal, verifier=None, validator=None):
+    """
+    Create an opportunity per record, tallying created, failed and skipped records in counts.
+    Records whose content the journal has already seen created or submitted are skipped.
+    """
+    # wait for a second if the create opportunity is not finished with response status code = 200
+    for record in records:
+        print(record.source)
+        create_opportunity_request, load_error = bulk_input.load_request(record)
+        if load_error:
+            print(load_error)
+            counts["failed"] += 1
+            continue
+        errors = validator.validate(create_opportunity_request, payload_validator.OPERATION_CREATE) if validator else []
+        if errors:
+            payload_validator.print_rejections({record.source: errors})
+            counts["failed"] += 1
+            continue
+        request_hash = content_hash(create_opportunity_request)
+        entry = journal.get(request_hash)
+        if entry and entry["status"] in (CREATED, SUBMITTED):
+            print(f"- Skipping {record.source}: already created as {entry['opportunity_id']}")
+            counts["skipped"] += 1
+            continue
+        response = create_opportunitiy(partner_central_client, record.source, verifier, create_opportunity_request)
+        counts["created" if response else "failed"] += 1
+        if response:
+            journal.record_created(request_hash, record.source, response["Id"])
+        helper.pretty_print_datetime(response)
+        time.sleep(1)
+
+def create_shard(shard, counts, args):
+    """Create the input, or one shard of it, with its own client. Returns (verifier, {}) for bulk_runner."""
+    partner_central_client = get_boto3_client(serviceName)
+    verifier = Verifier(partner_central_client, args.verify)
+    records, validator = bulk_runner.collect_records(
+        args.input, payload_validator.OPERATION_CREATE, args.skip_validation, shard)
+    journal = RunJournal(args.journal)
+    create_records(partner_central_client, records, counts, journal, verifier, validator)
+    journal.close()
+    return verifier, {}
+
 def usage_demo():
 
-    directory_path = 'src/bulk_create_opportunities/opportunities'
+    args = parse_arguments()
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     print("-" * 88)
     print("Create Opportunity.")
     print("-" * 88)
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-    )
+    if args.processes > 1:
+        # Create the journal once before the workers open it concurrently
+        RunJournal(args.journal).close()
+        counts, verifier, verification_failures, _ = bulk_runner.run_processes(
+            create_shard, new_counts, args.processes, args.verify, (args,))
+    else:
+        counts = new_counts()
+        verifier, _ = create_shard(None, counts, args)
+        verification_failures = verifier.finish()
 
-    file_paths = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
-
-    # wait for a second if the create opportunity is not finished with response status code = 200
-    for file_path in file_paths:
-        print(file_path)
-        response = create_opportunitiy(partner_central_client, file_path)
-        helper.pretty_print_datetime(response)
-        time.sleep(1)
+    print("-" * 88)
+    print(f"Created: {counts['created']}, failed: {counts['failed']}, already created: {counts['skipped']}")
+    verification.print_report(verifier, verification_failures)
 
 if __name__ == "__main__":
     usage_demo()
-
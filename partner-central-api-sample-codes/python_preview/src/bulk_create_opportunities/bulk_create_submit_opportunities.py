@@ -6,52 +6,64 @@
 """
 Purpose
 Bulk Creating and Submitting Opportunities
-Creates opportunities from JSON files and submits them for engagement.
-Logs results to separate files based on success/failure status.
+Creates opportunities from JSON files, or from one NDJSON/CSV file, and submits them for engagement.
+Writes one JSONL result record per file with its outcome, stage timings and error code.
 """
-import boto3
+import argparse
+import math
 import time
 import logging
 import sys
 import os
-import json
-import uuid
-from datetime import datetime
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.stringify_details as sd
+from utils.pipeline import Pipeline, Stage
+from utils.rate_limiter import parse_rates, worker_rate_limiter
+import utils.payload_validator as payload_validator
+import utils.bulk_input as bulk_input
+import utils.bulk_runner as bulk_runner
+from utils.result_sink import ResultSink, new_run_id
+import utils.result_sink as result_sink
+from utils.run_journal import RunJournal, content_hash, derive_client_token, CREATED, SUBMITTED
+from utils.verification import Verifier, VERIFICATION_POLICIES, DEFAULT_VERIFICATION
+import utils.verification as verification
 from botocore.client import ClientError
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
+from utils.retry import RetryPolicy, RetryBudget, DEFAULT_MAX_ATTEMPTS, DEFAULT_RETRY_BUDGET
+from utils.process_runner import segment_path, merge_segments
 
 serviceName = "partnercentral-selling"
 
 # Log file paths
 LOG_DIR = os.path.dirname(os.path.abspath(__file__))
-CREATE_FAILED_LOG = os.path.join(LOG_DIR, "create_failed.log")
-SUBMIT_FAILED_LOG = os.path.join(LOG_DIR, "submit_failed.log")
-SUCCESS_LOG = os.path.join(LOG_DIR, "success.log")
+RESULTS_LOG = os.path.join(LOG_DIR, "results.jsonl")
+# Run journal mapping each input's content hash to the created opportunity
+JOURNAL_DB = os.path.join(LOG_DIR, "bulk_create_journal.db")
 
+# Number of workers in the create and submit stages
+DEFAULT_WORKERS = 4
+# Capacity of the queues between pipeline stages
+DEFAULT_QUEUE_SIZE = 100
+# Requests per second allowed for each API operation unless overridden with --rate
+DEFAULT_REQUESTS_PER_SECOND = 2.0
 
-def log_to_file(log_file, message):
-    """Append a log message to a file with timestamp"""
-    timestamp = datetime.now().isoformat()
-    with open(log_file, 'a') as f:
-        f.write(f"[{timestamp}] {message}\n")
 
-
-def create_opportunity(partner_central_client, file_path):
-    """Create an opportunity from a JSON file"""
-    create_opportunity_request_orig = sd.stringify_json(file_path)
-    create_opportunity_request = helper.remove_nulls(create_opportunity_request_orig)
+def create_opportunity(partner_central_client, file_path, rate_limiter=None, create_opportunity_request=None, verifier=None):
+    """Create an opportunity from a JSON file, or from its already loaded request; the verifier reads it back"""
+    if create_opportunity_request is None:
+        create_opportunity_request = helper.remove_nulls(sd.stringify_json(file_path))
     
     try:
         # Perform an API call
+        if rate_limiter:
+            rate_limiter.acquire("CreateOpportunity")
         response = partner_central_client.create_opportunity(**create_opportunity_request)
-        get_response = partner_central_client.get_opportunity(
-            Identifier=response["Id"],
-            Catalog=CATALOG_TO_USE
-        )
         print(f"✓ Created Opportunity: {response['Id']}")
+        if verifier:
+            verifier.written(response["Id"], create_opportunity_request, file_path)
         return response, None
     
     except ClientError as err:
@@ -61,10 +73,10 @@ def create_opportunity(partner_central_client, file_path):
         return None, err.response
 
 
-def start_engagement_from_opportunity_task(partner_central_client, opportunity_id):
+def start_engagement_from_opportunity_task(partner_central_client, opportunity_id, rate_limiter=None, client_token=None):
     """Submit an opportunity for engagement"""
-    # Generate random ClientToken
-    client_token = str(uuid.uuid4())
+    # Derive the ClientToken from the opportunity so a retried submission is idempotent
+    client_token = client_token or derive_client_token("StartEngagementFromOpportunityTask", opportunity_id)
     
     start_engagement_request = {
         "AwsSubmission": {
@@ -78,6 +90,8 @@ def start_engagement_from_opportunity_task(partner_central_client, opportunity_i
     
     try:
         # Perform an API call
+        if rate_limiter:
+            rate_limiter.acquire("StartEngagementFromOpportunityTask")
         response = partner_central_client.start_engagement_from_opportunity_task(**start_engagement_request)
         print(f"  ✓ Submitted Opportunity: {opportunity_id}")
         return response, None
@@ -89,98 +103,227 @@ def start_engagement_from_opportunity_task(partner_central_client, opportunity_i
         return None, err.response
 
 
-def process_opportunity_file(partner_central_client, file_path):
+def build_pipeline(partner_central_client, rate_limiter, counts, journal, sink, load_workers=1, create_workers=DEFAULT_WORKERS,
+                   submit_workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, verifier=None, validator=None):
     """
-    Process a single opportunity file: create and submit
-    Returns: (success, opportunity_id, create_error, submit_error)
+    Build the load/validate -> create -> submit pipeline over bulk_input.InputRecord items.
+    Creates for later files overlap with submissions for earlier ones; outcomes are tallied in counts
+    and every record gets one entry in the result sink, with the time it spent in each stage.
+    With a validator, the load stage rejects invalid payloads (used for streamed input, which is
+    not validated upfront).
+    The journal lets files that were already submitted skip the pipeline and files that were
+    created but not submitted skip the create stage.
+    An unexpected error in a stage (e.g. a connection error that outlasted the retries) is recorded
+    as a failure of that stage, so every record still gets exactly one result.
     """
-    print(f"\nProcessing: {file_path}")
-    
-    # Step 1: Create opportunity
-    create_response, create_error = create_opportunity(partner_central_client, file_path)
-    
-    if create_error:
-        # Log creation failure
-        log_message = f"File: {file_path}\nError: {json.dumps(create_error, indent=2)}\n{'-'*80}"
-        log_to_file(CREATE_FAILED_LOG, log_message)
-        return False, None, create_error, None
-    
-    opportunity_id = create_response['Id']
-    
-    # Step 2: Submit opportunity
-    submit_response, submit_error = start_engagement_from_opportunity_task(
-        partner_central_client, 
-        opportunity_id
-    )
-    
-    if submit_error:
-        # Log submission failure
-        log_message = f"File: {file_path}\nOpportunity ID: {opportunity_id}\nError: {json.dumps(submit_error, indent=2)}\n{'-'*80}"
-        log_to_file(SUBMIT_FAILED_LOG, log_message)
-        return False, opportunity_id, None, submit_error
-    
-    # Log success
-    log_message = f"File: {file_path}\nOpportunity ID: {opportunity_id}\nCreate Response: {json.dumps(create_response, cls=helper.DateTimeEncoder, indent=2)}\nSubmit Response: {json.dumps(submit_response, cls=helper.DateTimeEncoder, indent=2)}\n{'-'*80}"
-    log_to_file(SUCCESS_LOG, log_message)
-    
-    return True, opportunity_id, None, None
+    counts_lock = threading.Lock()
 
+    def finish(item, outcome, opportunity_id=None, error=None):
+        sink.record(item["source"], outcome, opportunity_id, error, item["timings"])
+        with counts_lock:
+            counts[outcome] += 1
 
-def usage_demo():
-    directory_path = 'src/bulk_create_opportunities/opportunities'
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    def unexpected(error):
+        return {"Error": {"Code": type(error).__name__, "Message": str(error)}}
 
-    print("=" * 88)
-    print("Bulk Create and Submit Opportunities")
-    print("=" * 88)
-    print(f"Log files will be created in: {LOG_DIR}")
-    print(f"  - Success: {SUCCESS_LOG}")
-    print(f"  - Create Failed: {CREATE_FAILED_LOG}")
-    print(f"  - Submit Failed: {SUBMIT_FAILED_LOG}")
-    print("=" * 88)
+    def load(record):
+        started = time.perf_counter()
+        source = record.source
+        create_opportunity_request, load_error = bulk_input.load_request(record)
+        item = {"source": source, "request": create_opportunity_request, "timings": {}}
+        if load_error:
+            item["timings"]["load"] = time.perf_counter() - started
+            print(f"✗ Invalid opportunity input {source}: {load_error['Error']['Message']}")
+            finish(item, "create_failed", error=load_error)
+            return None
+        if validator:
+            errors = validator.validate(create_opportunity_request, payload_validator.OPERATION_CREATE)
+            if errors:
+                item["timings"]["load"] = time.perf_counter() - started
+                payload_validator.print_rejections({source: errors})
+                finish(item, "rejected", error=payload_validator.rejection_error(errors))
+                return None
+
+        request_hash = content_hash(create_opportunity_request)
+        item["hash"] = request_hash
+        entry = journal.get(request_hash)
+        item["timings"]["load"] = time.perf_counter() - started
+        if entry and entry["status"] == SUBMITTED:
+            print(f"- Skipping {source}: already submitted as {entry['opportunity_id']}")
+            finish(item, "skipped", entry["opportunity_id"])
+            return None
+        if entry and entry["status"] == CREATED:
+            print(f"- Resuming {source}: already created as {entry['opportunity_id']}")
+            item["create_response"] = {"Id": entry["opportunity_id"]}
+        return item
+
+    def create(item):
+        if "create_response" in item:
+            return item
+        started = time.perf_counter()
+        # The same content always gets the same ClientToken, so a retried create is idempotent
+        item["request"]["ClientToken"] = derive_client_token("CreateOpportunity", item["hash"])
+        create_response, create_error = create_opportunity(
+            partner_central_client, item["source"], rate_limiter, item["request"], verifier)
+        item["timings"]["create"] = time.perf_counter() - started
+        if create_error:
+            journal.record_error(item["hash"], item["source"], create_error["Error"]["Code"])
+            finish(item, "create_failed", error=create_error)
+            return None
+        journal.record_created(item["hash"], item["source"], create_response["Id"])
+        item["create_response"] = create_response
+        return item
+
+    def submit(item):
+        opportunity_id = item["create_response"]["Id"]
+        started = time.perf_counter()
+        submit_response, submit_error = start_engagement_from_opportunity_task(
+            partner_central_client, opportunity_id, rate_limiter)
+        item["timings"]["submit"] = time.perf_counter() - started
+        if submit_error:
+            journal.record_error(item["hash"], item["source"], submit_error["Error"]["Code"])
+            finish(item, "submit_failed", opportunity_id, submit_error)
+            return None
+        journal.record_submitted(item["hash"], item["source"], opportunity_id)
+        finish(item, "success", opportunity_id)
+        return opportunity_id
+
+    def load_failed(record, error):
+        finish({"source": record.source, "timings": {}}, "create_failed", error=unexpected(error))
+
+    def create_failed(item, error):
+        journal.record_error(item["hash"], item["source"], type(error).__name__)
+        finish(item, "create_failed", error=unexpected(error))
+
+    def submit_failed(item, error):
+        journal.record_error(item["hash"], item["source"], type(error).__name__)
+        finish(item, "submit_failed", item["create_response"]["Id"], unexpected(error))
+
+    return Pipeline([
+        Stage("load", load, load_workers, on_error=load_failed),
+        Stage("create", create, create_workers, on_error=create_failed),
+        Stage("submit", submit, submit_workers, on_error=submit_failed),
+    ], queue_size=queue_size)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Bulk create and submit opportunities from JSON files.")
+    parser.add_argument("--directory", default='src/bulk_create_opportunities/opportunities',
+                        help="Directory with one opportunity JSON file per opportunity")
+    parser.add_argument("--input",
+                        help="NDJSON (.ndjson/.jsonl) or flat CSV file with one opportunity per line/row, "
+                             "read as a stream; takes precedence over --directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Default number of workers in the create and submit stages (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--load-workers", type=int, default=1,
+                        help="Number of workers loading and validating files (default: 1)")
+    parser.add_argument("--create-workers", type=int,
+                        help="Number of workers calling CreateOpportunity (default: --workers)")
+    parser.add_argument("--submit-workers", type=int,
+                        help="Number of workers calling StartEngagementFromOpportunityTask (default: --workers)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Capacity of the queues between stages (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--default-rate", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"Requests per second for each API operation (default: {DEFAULT_REQUESTS_PER_SECOND})")
+    parser.add_argument("--rate", action="append", metavar="OPERATION=RPS",
+                        help="Requests per second for one operation, e.g. --rate CreateOpportunity=5 (repeatable)")
+    parser.add_argument("--results", default=RESULTS_LOG,
+                        help="JSONL file that gets one result record per input file (appended to)")
+    parser.add_argument("--skip-validation", action="store_true",
+                        help="Do not validate the files against opportunity-samples/ before the run")
+    parser.add_argument("--validation-workers", type=int,
+                        help="Processes used for pre-flight validation (default: number of CPUs)")
+    parser.add_argument("--journal", default=JOURNAL_DB,
+                        help="SQLite run journal used to skip files that were already created or submitted")
+    parser.add_argument("--verify", choices=VERIFICATION_POLICIES, default=DEFAULT_VERIFICATION,
+                        help="Read created opportunities back: off, inline after each create, "
+                             f"or deferred to one concurrent batch at the end (default: {DEFAULT_VERIFICATION})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Attempts per API call for throttling and transient errors (default: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--retry-budget", type=int, default=DEFAULT_RETRY_BUDGET,
+                        help=f"Retries the whole run may spend before errors are reported as-is (default: {DEFAULT_RETRY_BUDGET})")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each running the pipeline on a deterministic shard of the input "
+                             "with its own client and results segment, all sharing the run journal; rates and "
+                             "the retry budget are split between them (default: 1)")
+    return parser.parse_args()
+
+
+def new_counts():
+    return {"success": 0, "create_failed": 0, "submit_failed": 0, "skipped": 0, "rejected": 0}
+
+
+def collect_records(args, counts, sink, shard=None, validation_workers=None):
+    """Return (records, validator) for the input, or for one shard of it; rejected files are recorded right away."""
+    def rejected(file_path, errors):
+        sink.record(file_path, "rejected", error=payload_validator.rejection_error(errors))
+        counts["rejected"] += 1
+
+    return bulk_runner.collect_records(args.input or args.directory, payload_validator.OPERATION_CREATE,
+                                       args.skip_validation, shard, validation_workers, rejected)
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
+
+def run_pipeline(args, records, counts, journal, sink, validator=None, processes=1):
+    """
+    Run the records through a pipeline with its own client and rate limiter.
+    With several processes, each gets its share of the request rates and of the retry budget.
+    Returns (pipeline, verifier, verification failures, retries used).
+    """
+    # Token buckets per API operation replace a fixed delay between files; retries take tokens too
+    rate_limiter = worker_rate_limiter(parse_rates(args.rate), args.default_rate, processes)
+    retry_policy = RetryPolicy(max_attempts=args.max_attempts, budget=RetryBudget(math.ceil(args.retry_budget / processes)),
+                               rate_limiter=rate_limiter)
+    create_workers = args.create_workers or args.workers
+    submit_workers = args.submit_workers or args.workers
+    # One pooled connection per thread that calls the API: create and submit workers, or the deferred verification
+    partner_central_client = get_boto3_client(serviceName, retry_policy=retry_policy,
+                                              concurrency=max(create_workers + submit_workers, args.workers))
+
+    verifier = Verifier(partner_central_client, args.verify, rate_limiter, concurrency=args.workers)
+    pipeline = build_pipeline(
+        partner_central_client,
+        rate_limiter,
+        counts,
+        journal,
+        sink,
+        load_workers=args.load_workers,
+        create_workers=create_workers,
+        submit_workers=submit_workers,
+        queue_size=args.queue_size,
+        verifier=verifier,
+        validator=validator
     )
 
-    # Get all JSON files in the opportunities directory
-    file_paths = [
-        os.path.join(directory_path, f) 
-        for f in os.listdir(directory_path) 
-        if os.path.isfile(os.path.join(directory_path, f)) and f.endswith('.json')
-    ]
+    # Stream the opportunity records through the load -> create -> submit stages
+    pipeline.run(records)
+    journal.close()
+    sink.close()
+    return pipeline, verifier, verifier.finish(), retry_policy.budget.used
 
-    if not file_paths:
-        print(f"No JSON files found in {directory_path}")
-        return
 
-    print(f"Found {len(file_paths)} opportunity file(s) to process\n")
+def run_shard(shard, counts, args, run_id):
+    """
+    Run the pipeline on one shard of the input for a --processes run, with its own results segment and
+    the run journal shared by all workers. Returns (verifier, {"retries": retries used}) for bulk_runner.
+    """
+    # One journal for every process count, so any rerun sees the work finished by every worker
+    journal = RunJournal(args.journal)
+    sink = ResultSink(segment_path(args.results, shard), run_id=run_id)
+    records, validator = collect_records(args, counts, sink, shard)
+    if not records:
+        journal.close()
+        sink.close()
+        return Verifier(None, args.verify), {"retries": 0}
+    _, verifier, _, retries = run_pipeline(args, records, counts, journal, sink, validator, processes=shard.count)
+    return verifier, {"retries": retries}
+
+
+def print_summary(args, counts, run_id, elapsed, retries, verifier, verification_failures, pipeline=None):
+    total = sum(counts.values())
+    success_count = counts["success"]
+    create_failed_count = counts["create_failed"]
+    submit_failed_count = counts["submit_failed"]
 
-    # Statistics
-    total = len(file_paths)
-    success_count = 0
-    create_failed_count = 0
-    submit_failed_count = 0
-
-    # Process each opportunity file
-    for file_path in file_paths:
-        success, opp_id, create_err, submit_err = process_opportunity_file(
-            partner_central_client, 
-            file_path
-        )
-        
-        if success:
-            success_count += 1
-        elif create_err:
-            create_failed_count += 1
-        elif submit_err:
-            submit_failed_count += 1
-        
-        # Wait a second between requests
-        time.sleep(1)
-
-    # Print summary
     print("\n" + "=" * 88)
     print("SUMMARY")
     print("=" * 88)
@@ -188,8 +331,66 @@ def usage_demo():
     print(f"✓ Fully Successful:  {success_count}")
     print(f"✗ Create Failed:     {create_failed_count}")
     print(f"✗ Submit Failed:     {submit_failed_count}")
+    print(f"✗ Rejected Upfront:  {counts['rejected']}")
+    print(f"- Already Submitted: {counts['skipped']}")
+    print(f"Retries:             {retries} of {args.retry_budget}")
+    verification.print_report(verifier, verification_failures)
+    print(f"Elapsed:             {elapsed:.1f}s ({total / elapsed if elapsed > 0 else 0:.2f} records/s)")
+    if pipeline:
+        print("-" * 88)
+        pipeline.print_report()
+    if create_failed_count or submit_failed_count or counts["rejected"]:
+        print("-" * 88)
+        result_sink.print_summary(result_sink.summarize_results(args.results, run_id))
+    print("=" * 88)
+    print(f"\nRun {run_id}; per-file results in {args.results}")
+
+
+def run_processes(args):
+    """Run the input across --processes worker processes and merge their counts and results."""
+    run_id = new_run_id()
+    # Create the journal once before the workers open it concurrently
+    RunJournal(args.journal).close()
+    print(f"Running {args.processes} worker processes over {args.input or args.directory}\n")
+    start_time = time.perf_counter()
+    counts, verifier, verification_failures, results = bulk_runner.run_processes(
+        run_shard, new_counts, args.processes, args.verify, (args, run_id))
+    elapsed = time.perf_counter() - start_time
+    merge_segments(args.results, args.processes)
+    print_summary(args, counts, run_id, elapsed, sum(result["retries"] for result in results), verifier,
+                  verification_failures)
+
+
+def usage_demo():
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    print("=" * 88)
+    print("Bulk Create and Submit Opportunities")
+    print("=" * 88)
+    print(f"Results will be appended to: {args.results}")
     print("=" * 88)
-    print(f"\nCheck log files in {LOG_DIR} for details")
+
+    if args.processes > 1:
+        run_processes(args)
+        return
+
+    # Statistics
+    counts = new_counts()
+    journal = RunJournal(args.journal)
+    sink = ResultSink(args.results)
+
+    records, validator = collect_records(args, counts, sink, validation_workers=args.validation_workers)
+    if not records:
+        print(f"No JSON files found in {args.input or args.directory}")
+        journal.close()
+        sink.close()
+        return
+
+    start_time = time.perf_counter()
+    pipeline, verifier, verification_failures, retries = run_pipeline(args, records, counts, journal, sink, validator)
+    elapsed = time.perf_counter() - start_time
+    print_summary(args, counts, sink.run_id, elapsed, retries, verifier, verification_failures, pipeline)
 
 
 if __name__ == "__main__":
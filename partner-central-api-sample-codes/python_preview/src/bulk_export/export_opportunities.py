@@ -8,45 +8,236 @@ Purpose
 PC-API-30 Export opportunities to CSV file and opportunity json payload
 API requests: ListOpportunities; GetOpportunity; GetAwsOpportunitySummary
 """
+import argparse
 import json
 import csv
+import hashlib
 import sys
 import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
+from utils.partitioned_listing import list_opportunities_partitioned
 import logging
-import boto3
+import threading
+from botocore.client import ClientError
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
+from utils.raw_client import RawPartnerCentralClient
 
 SERVICE_NAME = "partnercentral-selling"
 REGION_NAME = 'us-east-1'
+# Number of opportunities whose details are fetched in parallel. The default stays
+# below botocore's pool of 10 connections per client.
+DEFAULT_CONCURRENCY = 8
+# Detail fetches submitted ahead of the one being written, per worker
+FETCH_WINDOW_PER_WORKER = 4
+# Lower bound of LastModifiedDate for a full export
+DEFAULT_AFTER_LAST_MODIFIED_DATE = "2024-11-02T21:35:39+00:00"
+# Local state file that keeps the incremental export watermark
+DEFAULT_STATE_FILE = "export_state.json"
+# Number of parallel S3 uploads, also used as the S3 client connection pool size
+DEFAULT_UPLOAD_CONCURRENCY = 16
+# Content hashes of the uploaded JSON files, kept locally and next to the files in S3
+DEFAULT_MANIFEST_FILE = "export_manifest.json"
+MANIFEST_S3_KEY = "opportunities/_manifest.json"
+# LifeCycleReviewStatus filter of the listing; every opportunity with one of these statuses has an AWS side
+DEFAULT_REVIEW_STATUSES = ["Approved"]
+# Review statuses of partner-originated opportunities that were submitted to AWS
+AWS_ENGAGED_REVIEW_STATUSES = {"Submitted", "In review", "Approved", "Rejected", "Action Required"}
+# Journal of listed pages and fetched details, used by --resume
+DEFAULT_CHECKPOINT_FILE = "export_checkpoint.jsonl"
+# Errors that are worth another attempt on resume
+TRANSIENT_ERROR_CODES = {
+    "ThrottlingException",
+    "InternalServerException",
+    "ServiceUnavailableException",
+    "ExpiredTokenException",
+    "RequestExpired",
+    "EndpointConnectionError",
+    "ConnectTimeoutError",
+    "ReadTimeoutError",
+    "ConnectionClosedError",
+}
+# Rows per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 50000
+# Low-cardinality enum columns that are dictionary-encoded in the Parquet output
+PARQUET_DICTIONARY_COLUMNS = [
+    "Catalog",
+    "Origin",
+    "OpportunityType",
+    "LifeCycle.Stage",
+    "LifeCycle.ReviewStatus",
+    "LifeCycle.ClosedLostReason",
+    "Customer.Account.Industry",
+    "Customer.Account.Address.CountryCode",
+    "Project.DeliveryModels[0]",
+    "Project.ExpectedCustomerSpend[0].CurrencyCode",
+    "Project.ExpectedCustomerSpend[0].Frequency",
+    "OpportunityTeam[0].BusinessTitle",
+    "Involvement",
+    "Visibility",
+]
+# Partition value of rows without a stage or modification date
+PARQUET_UNKNOWN_PARTITION = "unknown"
 
-partner_central_client = boto3.client(
-    service_name=SERVICE_NAME,
-    region_name=REGION_NAME
-)
+partner_central_client = get_boto3_client(SERVICE_NAME, REGION_NAME)
+# Client of the GetOpportunity and GetAwsOpportunitySummary calls: the boto3 client, or a
+# RawPartnerCentralClient with --raw
+details_client = partner_central_client
 
-def fetch_opportunity_list():
-    """Fetch the list of opportunities from the API with filters."""
-    opportunity_list = []
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+class ExportCheckpoint:
+    """
+    Append-only JSON Lines journal of an export run: the listed pages with their NextToken and the
+    details of every opportunity fetched so far. A resumed run replays it and continues from there.
+    The fetched details stay on disk: in memory the checkpoint only keeps the offset of the latest
+    details entry of each opportunity, and the outputs stream them back with iter_details().
+    """
+
+    def __init__(self, path, resume=False, after_last_modified_date=None):
+        self.path = path
+        self.after_last_modified_date = after_last_modified_date
+        self.summaries = []
+        self.next_token = None
+        self.listing_complete = False
+        # Id -> offset of the opportunity's latest details entry
+        self.offsets = {}
+        # Ids whose latest details are complete and are reused on resume
+        self.fetched = set()
+        self._lock = threading.Lock()
+        self._reader = None
+
+        resuming = resume and os.path.exists(path)
+        if resuming:
+            self._replay()
+            print(f"Resuming from {path}: {len(self.summaries)} opportunities listed, {len(self.fetched)} fetched")
+        self._file = open(path, 'ab' if resuming else 'wb')
+        if not resuming:
+            self._append({"type": "start", "AfterLastModifiedDate": after_last_modified_date})
+
+    def _replay(self):
+        offset = 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short if the previous run died while writing it
+                    break
+                if entry["type"] == "start":
+                    self.after_last_modified_date = entry["AfterLastModifiedDate"]
+                elif entry["type"] == "page":
+                    self.summaries.extend(entry["OpportunitySummaries"])
+                    self.next_token = entry["NextToken"]
+                    self.listing_complete = entry["NextToken"] is None
+                elif entry["type"] == "details":
+                    self._track(entry["Id"], offset, is_complete(entry["Details"], entry["AwsDetails"]))
+                offset += len(line)
+        # Drop a cut-short last line, so appended entries start on a line of their own
+        os.truncate(self.path, offset)
+
+    def _track(self, identifier, offset, complete):
+        self.offsets[identifier] = offset
+        if complete:
+            self.fetched.add(identifier)
+        else:
+            self.fetched.discard(identifier)
+
+    def _append(self, entry):
+        line = json.dumps(entry, cls=helper.DateTimeEncoder).encode('utf-8') + b"\n"
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+        return offset
+
+    def record_page(self, summaries, next_token):
+        self._append({"type": "page", "OpportunitySummaries": summaries, "NextToken": next_token})
+
+    def record_details(self, identifier, opportunity_details, opportunity_details_aws):
+        offset = self._append({"type": "details", "Id": identifier, "Details": opportunity_details,
+                               "AwsDetails": opportunity_details_aws})
+        with self._lock:
+            self._track(identifier, offset, is_complete(opportunity_details, opportunity_details_aws))
+
+    def read_details(self, identifier):
+        """Return the journaled (details, AWS summary) of an opportunity, as JSON-safe structures."""
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(self.offsets[identifier])
+        entry = json.loads(self._reader.readline())
+        return entry["Details"], entry["AwsDetails"]
+
+    def incomplete(self):
+        """Ids whose latest details are not complete, e.g. GetOpportunity was throttled."""
+        return self.offsets.keys() - self.fetched
+
+    def iter_details(self, identifiers):
+        """Generator over the journaled (details, AWS summary) of the given opportunities, in their order."""
+        for identifier in identifiers:
+            if identifier in self.offsets:
+                yield self.read_details(identifier)
+
+    def complete(self):
+        """Close the journal and remove it once the export has been written."""
+        if self._reader is not None:
+            self._reader.close()
+        self._file.close()
+        os.remove(self.path)
+
+def fetch_opportunity_list(after_last_modified_date=DEFAULT_AFTER_LAST_MODIFIED_DATE, checkpoint=None, partitions=1,
+                           review_statuses=DEFAULT_REVIEW_STATUSES):
+    """
+    Fetch the list of opportunities modified after the given date from the API with filters.
+    Only opportunities with one of the given review statuses are listed; an empty list lists every status.
+    With a checkpoint, every page is journaled and listing continues from the last journaled NextToken.
+    With partitions > 1, the date range is split into windows that are listed concurrently.
+    """
+    opportunity_list = list(checkpoint.summaries) if checkpoint else []
+    if checkpoint and checkpoint.listing_complete:
+        print(f"Total opportunities: {len(opportunity_list)}")
+        return opportunity_list
 
     request_params = {
         "Catalog": CATALOG_TO_USE,
         "MaxResults": 20,
         "LastModifiedDate": {
-            "AfterLastModifiedDate": "2024-11-02T21:35:39+00:00"
-        },
-        "LifeCycleReviewStatus": ["Approved"]
+            "AfterLastModifiedDate": after_last_modified_date
+        }
     }
+    if review_statuses:
+        request_params["LifeCycleReviewStatus"] = list(review_statuses)
+
+    if checkpoint and checkpoint.next_token:
+        request_params["NextToken"] = checkpoint.next_token
 
     try:
-        response = partner_central_client.list_opportunities(**request_params)
-        opportunity_list.extend(response["OpportunitySummaries"])
+        if partitions > 1 and not opportunity_list:
+            del request_params["MaxResults"], request_params["LastModifiedDate"]
+            opportunity_list = list_opportunities_partitioned(
+                partner_central_client, request_params, after_last_modified_date, partitions=partitions)
+            if checkpoint:
+                checkpoint.record_page(opportunity_list, None)
+            print(f"Total opportunities: {len(opportunity_list)} (listed in {partitions} date windows)")
+            return opportunity_list
 
-        while "NextToken" in response and response["NextToken"] is not None:
-            request_params["NextToken"] = response["NextToken"]
+        while True:
             response = partner_central_client.list_opportunities(**request_params)
             opportunity_list.extend(response["OpportunitySummaries"])
+            if checkpoint:
+                checkpoint.record_page(response["OpportunitySummaries"], response.get("NextToken"))
+            if response.get("NextToken") is None:
+                break
+            request_params["NextToken"] = response["NextToken"]
 
         print(f"Total opportunities: {len(opportunity_list)}")
         return opportunity_list
@@ -55,6 +246,44 @@ def fetch_opportunity_list():
         print(json.dumps(error.response))
 
 
+def load_watermark(state_file):
+    """Return the LastModifiedDate watermark stored by the previous incremental run, or None."""
+    if not os.path.exists(state_file):
+        return None
+    with open(state_file, 'r', encoding='utf-8') as file:
+        return json.load(file).get("LastModifiedDate")
+
+def save_watermark(state_file, watermark):
+    """Persist the LastModifiedDate watermark, replacing the state file atomically."""
+    temp_file = f"{state_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump({"LastModifiedDate": watermark}, file, indent=4)
+    os.replace(temp_file, state_file)
+
+def compute_watermark(opportunities, failed_ids, previous_watermark):
+    """
+    Return the highest LastModifiedDate that is safe to resume from.
+    Opportunities that were not fully fetched (failed_ids), because GetOpportunity failed or GetAwsOpportunitySummary
+    hit a transient error, cap the watermark, so they are fetched again next run.
+    """
+    modified_dates = {opportunity["Id"]: _as_datetime(opportunity["LastModifiedDate"]) for opportunity in opportunities}
+    failed_dates = [modified_dates[identifier] for identifier in failed_ids if identifier in modified_dates]
+
+    candidates = modified_dates.values()
+    if failed_dates:
+        cutoff = min(failed_dates)
+        candidates = [modified_date for modified_date in candidates if modified_date < cutoff]
+
+    latest = max(candidates, default=None)
+    if latest is None:
+        return previous_watermark
+    if previous_watermark is not None and latest <= _as_datetime(previous_watermark):
+        return previous_watermark
+    return latest.isoformat()
+
+def _as_datetime(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
 def fetch_opportunity_details(identifier):
     """Fetch details of a single opportunity by its identifier."""
     request_params = {
@@ -63,16 +292,21 @@ def fetch_opportunity_details(identifier):
     }
 
     try:
-        response = partner_central_client.get_opportunity(**request_params)
+        response = details_client.get_opportunity(**request_params)
         return response
 
-    except Exception as error:
+    except ClientError as error:
         print(error.response)
-        return {
-            "Catalog": CATALOG_TO_USE,
-            "Id": identifier,
-            "FAILED": error.response['Error']['Code']
-        }
+        error_code = error.response['Error']['Code']
+    except Exception as error:
+        # Connection, timeout and credential errors have no service response
+        print(repr(error))
+        error_code = type(error).__name__
+    return {
+        "Catalog": CATALOG_TO_USE,
+        "Id": identifier,
+        "FAILED": error_code
+    }
 
 def fetch_opportunity_details_aws(identifier):
     """Fetch high-level details about the opportunity sourced from AWS by its identifier."""
@@ -82,16 +316,99 @@ def fetch_opportunity_details_aws(identifier):
     }
 
     try:
-        response = partner_central_client.get_aws_opportunity_summary(**request_params)
+        response = details_client.get_aws_opportunity_summary(**request_params)
         return response
 
-    except Exception as error:
+    except ClientError as error:
         print(error.response)
-        return {
-            "Catalog": CATALOG_TO_USE,
-            "RelatedOpportunityId": identifier,
-            "FAILED": error.response['Error']['Code']
-        }
+        error_code = error.response['Error']['Code']
+    except Exception as error:
+        # Connection, timeout and credential errors have no service response
+        print(repr(error))
+        error_code = type(error).__name__
+    return {
+        "Catalog": CATALOG_TO_USE,
+        "RelatedOpportunityId": identifier,
+        "FAILED": error_code
+    }
+
+def needs_aws_summary(opportunity_details):
+    """
+    Plan the GetAwsOpportunitySummary call from the GetOpportunity response.
+    Only AWS referrals and opportunities that were submitted to AWS have an AWS side; related entities
+    (solutions, products, offers) are attached by the partner and say nothing about AWS engagement.
+    """
+    if "FAILED" in opportunity_details:
+        return False
+    if opportunity_details.get("Origin") == "AWS Referral":
+        return True
+    review_status = (opportunity_details.get("LifeCycle") or {}).get("ReviewStatus")
+    return review_status in AWS_ENGAGED_REVIEW_STATUSES
+
+def fetch_opportunity_with_summary(identifier, plan_aws_summary=True):
+    """
+    Fetch GetOpportunity and, when the opportunity has an AWS side, GetAwsOpportunitySummary.
+    The AWS summary is None when the call was planned out.
+    """
+    opportunity_details = fetch_opportunity_details(identifier)
+    opportunity_details_aws = None
+    if not plan_aws_summary or needs_aws_summary(opportunity_details):
+        opportunity_details_aws = fetch_opportunity_details_aws(identifier)
+    print(identifier)
+    return opportunity_details, opportunity_details_aws
+
+def is_complete(opportunity_details, opportunity_details_aws):
+    """
+    Whether both calls for an opportunity produced a final result that does not need to be fetched again.
+    A missing AWS summary is final; throttling or an expired session is not.
+    """
+    if "FAILED" in opportunity_details:
+        return False
+    return opportunity_details_aws is None or opportunity_details_aws.get("FAILED") not in TRANSIENT_ERROR_CODES
+
+def fetch_all_opportunity_details(opportunities, concurrency=DEFAULT_CONCURRENCY, checkpoint=None, plan_aws_summary=True):
+    """
+    Generator over the (details, AWS summary) of every opportunity summary, fetched across a bounded worker pool.
+    Results are yielded in the same order as the summaries, whatever the completion order, and only a window
+    of a few results per worker is in flight, so memory does not grow with the number of opportunities.
+    With a checkpoint, every result is journaled and opportunities fetched by an earlier run are read back from it.
+    """
+    reused = set(checkpoint.fetched) if checkpoint else set()
+    identifiers = [opportunity.get("Id") for opportunity in opportunities]
+    pending = iter([identifier for identifier in identifiers if identifier not in reused])
+    fetched_count = 0
+    aws_calls = 0
+
+    def fetch(identifier):
+        opportunity_details, opportunity_details_aws = fetch_opportunity_with_summary(identifier, plan_aws_summary)
+        if checkpoint:
+            checkpoint.record_details(identifier, opportunity_details, opportunity_details_aws)
+        return opportunity_details, opportunity_details_aws
+
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        window = FETCH_WINDOW_PER_WORKER * max(1, concurrency)
+        in_flight = deque(executor.submit(fetch, identifier) for identifier in islice(pending, window))
+        for identifier in identifiers:
+            if identifier in reused:
+                yield checkpoint.read_details(identifier)
+                continue
+            opportunity_details, opportunity_details_aws = in_flight.popleft().result()
+            next_identifier = next(pending, None)
+            if next_identifier is not None:
+                in_flight.append(executor.submit(fetch, next_identifier))
+            fetched_count += 1
+            aws_calls += opportunity_details_aws is not None
+            yield opportunity_details, opportunity_details_aws
+
+    elapsed = time.perf_counter() - start_time
+    rate = fetched_count / elapsed if elapsed > 0 else 0.0
+    print(f"Fetched details for {fetched_count} opportunities ({fetched_count + aws_calls} API calls, "
+          f"{fetched_count - aws_calls} AWS summaries planned out) "
+          f"in {elapsed:.1f}s with {concurrency} worker(s): {rate:.1f} opportunities/s")
+    if fetched_count < len(identifiers):
+        print(f"Reused {len(identifiers) - fetched_count} opportunities from the checkpoint")
 
 def flatten_json_object(nested_json, parent_key='', separator='.'):
     """Flatten a nested JSON object into a single level dictionary."""
@@ -108,90 +425,408 @@ def flatten_json_object(nested_json, parent_key='', separator='.'):
     return dict(items)
 
 def save_to_csv(data_records, file_path):
-    """Save a list of flattened dictionaries to a CSV file."""
-    if not data_records:
-        print("No data to write.")
+    """
+    Stream records (a list or a generator) into a CSV file.
+    Each record is flattened once and spilled as a CSV row, with the columns in first-seen order, while the
+    column set is collected; the spilled rows are then copied under the sorted header, so memory does not
+    grow with the number of records.
+    """
+    column_index = {}
+    record_count = 0
+
+    with tempfile.TemporaryFile(mode='w+', newline='', encoding='utf-8') as spill_file:
+        spill_writer = csv.writer(spill_file)
+        for record in data_records:
+            flattened_record = flatten_json_object(record)
+            for column in flattened_record:
+                if column not in column_index:
+                    column_index[column] = len(column_index)
+            row = [''] * len(column_index)
+            for column, value in flattened_record.items():
+                row[column_index[column]] = value.isoformat() if isinstance(value, datetime) else value
+            spill_writer.writerow(row)
+            record_count += 1
+
+        if record_count == 0:
+            print("No data to write.")
+            return
+
+        column_names = sorted(column_index)
+        positions = [column_index[column] for column in column_names]
+        spill_file.seek(0)
+        temp_file_path = f"{file_path}.tmp"
+        with open(temp_file_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(column_names)
+            for row in csv.reader(spill_file):
+                # Rows spilled before a column was first seen are shorter than the header
+                width = len(row)
+                writer.writerow([row[position] if position < width else '' for position in positions])
+        os.replace(temp_file_path, file_path)
+
+def merge_into_csv(data_records, file_path, key_column):
+    """
+    Replace or append the given records (a list or a generator) in an existing CSV file, matching rows on key_column.
+    The given records are streamed first while their keys are collected, then the existing rows that were not
+    replaced, so only the keys are kept in memory. A record whose fetch failed does not replace an existing row;
+    it is only added when the key has no row yet.
+    """
+    if not os.path.exists(file_path):
+        save_to_csv(data_records, file_path)
         return
 
-    # Consolidate column names from all records to handle varying structures
-    column_names = set()
-    for record in data_records:
-        column_names.update(flatten_json_object(record).keys())
-    column_names = sorted(column_names)
+    updated_keys = set()
+    failed_records = {}
 
-    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=column_names)
-        writer.writeheader()
+    def merged_records():
         for record in data_records:
-            flattened_record = flatten_json_object(record)
-            writer.writerow({col: flattened_record.get(col, '') for col in column_names})
+            if "FAILED" in record:
+                failed_records[record.get(key_column)] = record
+                continue
+            updated_keys.add(record.get(key_column))
+            yield record
+        with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                # Rows read back from the CSV are already flat, so flattening them again is a no-op
+                if row.get(key_column) not in updated_keys:
+                    failed_records.pop(row.get(key_column), None)
+                    yield row
+        yield from failed_records.values()
 
-def save_individual_files(data_records, directory, aws):
-    """Save each record to a separate JSON file locally and to S3 bucket."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    save_to_csv(merged_records(), file_path)
+
+def save_to_parquet(data_records, directory, row_group_size=DEFAULT_ROW_GROUP_SIZE, append=False):
+    """
+    Save records as a Parquet dataset partitioned Hive-style by stage and modification month,
+    e.g. directory/Stage=Qualified/LastModifiedMonth=2025-01/part-0.parquet.
+    data_records yields (record, last_modified_date) pairs; AWS summaries have no LastModifiedDate of their own
+    and are partitioned by the one of their opportunity. Records whose fetch failed are left out.
+    Columns use the same dotted names as the CSV export, every column is a string and enum columns are
+    dictionary-encoded, so the types do not depend on the values of a run. Rows are written in batches of
+    row_group_size and the union of the columns of every run is kept in directory/_common_metadata.
+    Without append the previous dataset is removed first, even when no row is written. With append=True
+    the existing dataset is kept and new files are added next to it; read it with read_parquet() and keep
+    the row with the latest LastModifiedDate per Id.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("pyarrow is required for the Parquet export: pip install pyarrow")
+        return
+
+    metadata_path = os.path.join(directory, "_common_metadata")
+    fields = {}
+    if append and os.path.exists(metadata_path):
+        fields = {field.name: field for field in pq.read_schema(metadata_path)}
+    partition_schema = pa.schema([("Stage", pa.string()), ("LastModifiedMonth", pa.string())])
+    partitioning = ds.partitioning(partition_schema, flavor="hive")
+    run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    record_count = 0
+
+    if not append and os.path.exists(directory):
+        shutil.rmtree(directory)
+
+    def write_batch(batch, batch_number):
+        for column in sorted(set().union(*batch) - fields.keys() - set(partition_schema.names)):
+            value_type = pa.dictionary(pa.int32(), pa.string()) if column in PARQUET_DICTIONARY_COLUMNS else pa.string()
+            fields[column] = pa.field(column, value_type)
+        schema = pa.schema([fields[column] for column in sorted(fields)] + list(partition_schema))
+        columns = {}
+        for field in schema:
+            array = pa.array([row.get(field.name) for row in batch], type=pa.string())
+            columns[field.name] = array.dictionary_encode() if pa.types.is_dictionary(field.type) else array
+        table = pa.table(columns, schema=schema)
+        ds.write_dataset(
+            table,
+            directory,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{run_id}-{batch_number}-{{i}}.parquet",
+            max_rows_per_group=row_group_size,
+            max_rows_per_file=row_group_size * 10,
+            min_rows_per_group=min(row_group_size, len(batch)),
+            existing_data_behavior="overwrite_or_ignore"
+        )
+
+    batch = []
+    for record, last_modified_date in data_records:
+        if "FAILED" in record:
+            continue
+        flattened_record = {column: _parquet_value(value) for column, value in flatten_json_object(record).items()}
+        flattened_record["Stage"] = (record.get("LifeCycle") or {}).get("Stage") or PARQUET_UNKNOWN_PARTITION
+        flattened_record["LastModifiedMonth"] = str(last_modified_date)[:7] if last_modified_date else PARQUET_UNKNOWN_PARTITION
+        batch.append(flattened_record)
+        record_count += 1
+        if len(batch) == row_group_size:
+            write_batch(batch, record_count // row_group_size)
+            batch = []
+    if batch:
+        write_batch(batch, record_count // row_group_size + 1)
 
-    # Initialize S3 client
-    s3_client = boto3.client('s3')
+    if record_count == 0:
+        print("No data to write.")
+        return
+    pq.write_metadata(pa.schema([fields[column] for column in sorted(fields)]), metadata_path)
+
+def _parquet_value(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def read_parquet(directory):
+    """Read a dataset written by save_to_parquet, with the columns of every run and its partition columns."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(os.path.join(directory, "_common_metadata"))
+    partition_schema = pa.schema([("Stage", pa.string()), ("LastModifiedMonth", pa.string())])
+    return pq.read_table(directory, schema=pa.schema(list(schema) + list(partition_schema)))
+
+def get_s3_client(max_pool_connections=DEFAULT_UPLOAD_CONCURRENCY):
+    """
+    Return the S3 client shared by all uploads, sized for the upload concurrency.
+    S3_ENDPOINT_URL points the client at a local S3 stand-in such as MinIO or moto_server.
+    """
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = get_boto3_client(
+                's3',
+                region_name=None,
+                endpoint_url=os.getenv('S3_ENDPOINT_URL'),
+                concurrency=max_pool_connections
+            )
+        return _s3_client
+
+def get_bucket_name():
     bucket_name = os.getenv('S3_BUCKET_NAME')  # Get bucket name from environment variable
-    
+
     if not bucket_name:
         raise ValueError("S3_BUCKET_NAME environment variable must be set")
+    return bucket_name
 
-    for record in data_records:
+def content_hash(record):
+    """Hash a record's content, ignoring the per-call ResponseMetadata."""
+    content = {key: value for key, value in record.items() if key != "ResponseMetadata"}
+    serialized = json.dumps(content, cls=helper.DateTimeEncoder, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+def load_manifest(manifest_path, s3_client=None):
+    """
+    Load the {S3 key: content hash} manifest of the previous export.
+    The local copy is preferred; the S3 manifest object is used when it is missing, e.g. on a new host.
+    """
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    s3_client = s3_client or get_s3_client()
+    try:
+        response = s3_client.get_object(Bucket=get_bucket_name(), Key=MANIFEST_S3_KEY)
+        return json.loads(response["Body"].read())
+    except ClientError as error:
+        if error.response['Error']['Code'] not in ("NoSuchKey", "404"):
+            print(f"Error reading manifest from S3: {error.response['Error']['Code']}")
+        return {}
+
+def save_manifest(manifest, manifest_path, s3_client=None):
+    """Save the manifest locally and as an S3 object."""
+    body = json.dumps(manifest, indent=4, sort_keys=True).encode('utf-8')
+    with open(manifest_path, 'wb') as file:
+        file.write(body)
+
+    s3_client = s3_client or get_s3_client()
+    s3_client.put_object(Bucket=get_bucket_name(), Key=MANIFEST_S3_KEY, Body=body, ContentType='application/json')
+
+def save_individual_files(data_records, directory, aws, concurrency=DEFAULT_UPLOAD_CONCURRENCY, write_local=True,
+                          s3_client=None, manifest=None):
+    """
+    Save each record to a separate JSON file locally and to S3 bucket.
+    Records (a list or a generator) are serialized once and uploaded from memory with put_object across
+    a pool of workers; with write_local=False the local copy is skipped.
+    When a manifest is given, records whose content hash is unchanged are skipped and the manifest
+    is updated with the hashes of the records that were uploaded. Records whose fetch failed are skipped,
+    so they never replace the file of an earlier export.
+    """
+    bucket_name = get_bucket_name()
+
+    if write_local and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    s3_client = s3_client or get_s3_client(concurrency)
+
+    def save_record(record):
         record_id = record.get("Id", "unknown_id") if aws == "" else record.get("RelatedOpportunityId", "unknown_id")
         file_name = f"{record_id}{aws}.json"
-        file_path = os.path.join(directory, file_name)
-        
+        s3_key = f"opportunities/{file_name}"  # You can customize the S3 key prefix
+        digest = content_hash(record) if manifest is not None else None
+        if digest is not None and manifest.get(s3_key) == digest:
+            return s3_key, digest, "skipped"
+
+        body = json.dumps(record, cls=helper.DateTimeEncoder, indent=4).encode('utf-8')
+
         # Save locally
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(record, file, cls=helper.DateTimeEncoder, indent=4)
-        
+        if write_local:
+            with open(os.path.join(directory, file_name), 'wb') as file:
+                file.write(body)
+
         # Upload to S3
         try:
-            s3_key = f"opportunities/{file_name}"  # You can customize the S3 key prefix
-            s3_client.upload_file(
-                file_path,
-                bucket_name,
-                s3_key
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=s3_key,
+                Body=body,
+                ContentType='application/json'
             )
-            print(f"Successfully uploaded {file_name} to S3 bucket {bucket_name}")
+            return s3_key, digest, "uploaded"
         except Exception as e:
             print(f"Error uploading {file_name} to S3: {str(e)}")
+            return s3_key, digest, "failed"
+
+    counts = {"uploaded": 0, "skipped": 0, "failed": 0}
+
+    def collect(future):
+        s3_key, digest, status = future.result()
+        counts[status] += 1
+        if manifest is not None and status == "uploaded":
+            manifest[s3_key] = digest
+
+    start_time = time.perf_counter()
+    records = (record for record in data_records if "FAILED" not in record)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        # Keep a bounded window of uploads in flight, so records are consumed as they are uploaded
+        in_flight = deque(executor.submit(save_record, record) for record in islice(records, 2 * max(1, concurrency)))
+        while in_flight:
+            collect(in_flight.popleft())
+            record = next(records, None)
+            if record is not None:
+                in_flight.append(executor.submit(save_record, record))
+
+    elapsed = time.perf_counter() - start_time
+    total = sum(counts.values())
+    print(f"Uploaded {counts['uploaded']} of {total} files to S3 bucket {bucket_name} in {elapsed:.1f}s "
+          f"({counts['skipped']} unchanged skipped)")
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Export opportunities to CSV and JSON files.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Number of opportunities fetched in parallel (default: {DEFAULT_CONCURRENCY}, 1 = sequential)")
+    parser.add_argument("--list-partitions", type=int, default=1,
+                        help="Split the LastModifiedDate range into this many windows listed concurrently (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Export only opportunities modified since the last run and merge them into existing outputs")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE,
+                        help=f"Watermark file used by --incremental (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Also write Parquet datasets partitioned by stage and modification month (requires pyarrow)")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help=f"Rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})")
+    parser.add_argument("--upload-concurrency", type=int, default=DEFAULT_UPLOAD_CONCURRENCY,
+                        help=f"Number of parallel S3 uploads (default: {DEFAULT_UPLOAD_CONCURRENCY})")
+    parser.add_argument("--no-local-copy", action="store_true",
+                        help="Upload the per-opportunity JSON files to S3 without writing them to disk")
+    parser.add_argument("--manifest-file", default=DEFAULT_MANIFEST_FILE,
+                        help=f"Local content-hash manifest used to skip unchanged files (default: {DEFAULT_MANIFEST_FILE})")
+    parser.add_argument("--force-upload", action="store_true",
+                        help="Write and upload every file even if its content is unchanged")
+    parser.add_argument("--review-status", nargs="*", default=DEFAULT_REVIEW_STATUSES, metavar="STATUS",
+                        help=f"List only opportunities with these review statuses (default: {' '.join(DEFAULT_REVIEW_STATUSES)}); "
+                             "with no status, every opportunity is listed and AWS summaries are fetched only where there is an AWS side")
+    parser.add_argument("--all-aws-summaries", action="store_true",
+                        help="Call GetAwsOpportunitySummary for every opportunity, including ones with no AWS side")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted export from its checkpoint instead of starting over")
+    parser.add_argument("--checkpoint-file", default=DEFAULT_CHECKPOINT_FILE,
+                        help=f"Checkpoint journal of the running export (default: {DEFAULT_CHECKPOINT_FILE})")
+    parser.add_argument("--raw", action="store_true",
+                        help="Fetch details as raw JSON without botocore response parsing; timestamps keep the API's format")
+    return parser.parse_args()
 
 def main():
+    global partner_central_client, details_client
+    args = parse_arguments()
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    # Size the connection pool for the detail fetch workers
+    partner_central_client = get_boto3_client(SERVICE_NAME, REGION_NAME, concurrency=args.concurrency)
+    details_client = RawPartnerCentralClient(REGION_NAME, concurrency=args.concurrency) if args.raw else partner_central_client
+    # Raw responses are already JSON-safe
+    json_safe = (lambda response: response) if args.raw else helper.to_json_safe
 
     print("-" * 88)
     print("Fetching list of Opportunities.")
     print("-" * 88)
 
-    opportunities = fetch_opportunity_list()
-    detailed_opportunities = []
-    detailed_opportunities_aws = []
+    previous_watermark = load_watermark(args.state_file) if args.incremental else None
+    if previous_watermark:
+        print(f"Incremental export of opportunities modified after {previous_watermark}")
+    checkpoint = ExportCheckpoint(args.checkpoint_file, args.resume, previous_watermark or DEFAULT_AFTER_LAST_MODIFIED_DATE)
+    opportunities = fetch_opportunity_list(checkpoint.after_last_modified_date, checkpoint, args.list_partitions,
+                                           args.review_status)
+    if opportunities is None:
+        print(f"Listing failed; rerun with --resume to continue from {args.checkpoint_file}")
+        return
+    if not opportunities:
+        print("No opportunities to export.")
+        checkpoint.complete()
+        return
+
+    def detailed_opportunities():
+        # Details are written to the CSV as they are fetched; the other outputs read them back from the checkpoint
+        for opportunity_details, _ in fetch_all_opportunity_details(
+                opportunities, args.concurrency, checkpoint, plan_aws_summary=not args.all_aws_summaries):
+            yield json_safe(opportunity_details)
 
-    for opportunity in opportunities:
-        opportunity_data = json.loads(json.dumps(opportunity, cls=helper.DateTimeEncoder, indent=4))
-        opportunity_details = fetch_opportunity_details(opportunity_data.get("Id"))
-        opportunity_details_aws = fetch_opportunity_details_aws(opportunity_data.get("Id"))
-        print(opportunity_data.get("Id"))
-        detailed_opportunity_data = json.loads(json.dumps(opportunity_details, cls=helper.DateTimeEncoder, indent=4))
-        detailed_opportunity_aws_data = json.loads(json.dumps(opportunity_details_aws, cls=helper.DateTimeEncoder, indent=4))
-        detailed_opportunities.append(detailed_opportunity_data)
-        detailed_opportunities_aws.append(detailed_opportunity_aws_data)
+    identifiers = [opportunity["Id"] for opportunity in opportunities]
+
+    def journaled_opportunities():
+        return (opportunity_details for opportunity_details, _ in checkpoint.iter_details(identifiers))
+
+    def journaled_opportunities_aws():
+        return (opportunity_details_aws for _, opportunity_details_aws in checkpoint.iter_details(identifiers)
+                if opportunity_details_aws is not None)
 
     # Save the detailed opportunities to a CSV file
     csv_file_path = os.path.join(os.getcwd(), "opportunities.csv")
     csv_file_path_aws = os.path.join(os.getcwd(), "opportunities_aws.csv")
-    save_to_csv(detailed_opportunities, csv_file_path)
-    save_to_csv(detailed_opportunities_aws, csv_file_path_aws)
+    if args.incremental:
+        merge_into_csv(detailed_opportunities(), csv_file_path, "Id")
+        merge_into_csv(journaled_opportunities_aws(), csv_file_path_aws, "RelatedOpportunityId")
+    else:
+        save_to_csv(detailed_opportunities(), csv_file_path)
+        save_to_csv(journaled_opportunities_aws(), csv_file_path_aws)
     print(f"Data saved to {csv_file_path} and {csv_file_path_aws}")
 
+    if args.parquet:
+        parquet_directory = os.path.join(os.getcwd(), "opportunities_parquet")
+        parquet_directory_aws = os.path.join(os.getcwd(), "opportunities_aws_parquet")
+        save_to_parquet(((opportunity_details, opportunity_details.get("LastModifiedDate"))
+                         for opportunity_details in journaled_opportunities()),
+                        parquet_directory, args.row_group_size, append=args.incremental)
+        save_to_parquet(((opportunity_details_aws, opportunity_details.get("LastModifiedDate"))
+                         for opportunity_details, opportunity_details_aws in checkpoint.iter_details(identifiers)
+                         if opportunity_details_aws is not None),
+                        parquet_directory_aws, args.row_group_size, append=args.incremental)
+        print(f"Parquet datasets saved to {parquet_directory} and {parquet_directory_aws}")
+
     # Save each opportunity to a separate file
     opportunities_directory = os.path.join(os.getcwd(), "opportunities")
-    save_individual_files(detailed_opportunities, opportunities_directory, "")
-    save_individual_files(detailed_opportunities_aws, opportunities_directory, "aws")
-    print(f"Individual opportunity files saved to {opportunities_directory}")
+    write_local = not args.no_local_copy
+    s3_client = get_s3_client(args.upload_concurrency)
+    manifest = {} if args.force_upload else load_manifest(args.manifest_file, s3_client)
+    save_individual_files(journaled_opportunities(), opportunities_directory, "", args.upload_concurrency, write_local, s3_client, manifest)
+    save_individual_files(journaled_opportunities_aws(), opportunities_directory, "aws", args.upload_concurrency, write_local, s3_client, manifest)
+    save_manifest(manifest, args.manifest_file, s3_client)
+    if write_local:
+        print(f"Individual opportunity files saved to {opportunities_directory}")
+
+    if args.incremental:
+        watermark = compute_watermark(opportunities, checkpoint.incomplete(), previous_watermark)
+        save_watermark(args.state_file, watermark)
+        print(f"Watermark saved to {args.state_file}: {watermark}")
+
+    checkpoint.complete()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
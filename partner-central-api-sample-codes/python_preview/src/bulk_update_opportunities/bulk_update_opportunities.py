@@ -8,8 +8,8 @@ Purpose
 PC-API -20 Bulk Updating Opportunities
 """
 
-import boto3
-import time
+import argparse
+import itertools
 import logging
 import sys
 import os
@@ -17,50 +17,139 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import utils.helpers as helper
 import utils.stringify_details as sd
 from botocore.client import ClientError
-from utils.constants import CATALOG_TO_USE
+from utils.verification import Verifier, VERIFICATION_POLICIES, DEFAULT_VERIFICATION
+import utils.verification as verification
+import utils.payload_validator as payload_validator
+import utils.bulk_input as bulk_input
+import utils.bulk_runner as bulk_runner
+import utils.update_diff as update_diff
+from utils.aws_client import get_boto3_client
+from utils.rate_limiter import parse_rates, worker_rate_limiter
 
 serviceName = "partnercentral-selling"
+# Requests per second allowed for each API operation unless overridden with --rate
+DEFAULT_REQUESTS_PER_SECOND = 2.0
 
-def update_opportunitiy(partner_central_client, file_path):
-    update_opportunity_request_orig = sd.stringify_json(file_path)
-    update_opportunity_request = helper.remove_nulls(update_opportunity_request_orig)
+def update_opportunitiy(partner_central_client, file_path, verifier=None, update_opportunity_request=None, rate_limiter=None):
+    if update_opportunity_request is None:
+        update_opportunity_request_orig = sd.stringify_json(file_path)
+        update_opportunity_request = helper.remove_nulls(update_opportunity_request_orig)
     try:
+        if rate_limiter:
+            rate_limiter.acquire("UpdateOpportunity")
         # Perform an API call
         response = partner_central_client.update_opportunity(**update_opportunity_request)
-        get_response = partner_central_client.get_opportunity(
-            Identifier=response["Id"],
-            Catalog=CATALOG_TO_USE
-        )
-        print(f"GetOpportunity: {get_response}")
+        if verifier:
+            verifier.written(response["Id"], update_opportunity_request, file_path)
         return response
 
     except ClientError as err:
         # Catch all client exceptions
         print(err.response)
 
+def load_valid_requests(records, validator=None):
+    """Yield (source, request) for each record that loads and passes validation."""
+    for record in records:
+        update_opportunity_request, load_error = bulk_input.load_request(record)
+        if load_error:
+            print(record.source)
+            print(load_error)
+            continue
+        errors = validator.validate(update_opportunity_request, payload_validator.OPERATION_UPDATE) if validator else []
+        if errors:
+            payload_validator.print_rejections({record.source: errors})
+            continue
+        yield record.source, update_opportunity_request
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Bulk update opportunities from JSON files.")
+    parser.add_argument("--input", default='src/bulk_update_opportunities/opportunities',
+                        help="Directory with one JSON file per opportunity, or an NDJSON (.ndjson/.jsonl) "
+                             "or flat CSV file with one opportunity per line/row")
+    parser.add_argument("--verify", choices=VERIFICATION_POLICIES, default=DEFAULT_VERIFICATION,
+                        help="Read written opportunities back: off, inline after each write, "
+                             f"or deferred to one concurrent batch at the end (default: {DEFAULT_VERIFICATION})")
+    parser.add_argument("--skip-validation", action="store_true",
+                        help="Do not validate the files against opportunity-samples/ before the run")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print a field-level diff against the current opportunities and do not update anything")
+    parser.add_argument("--skip-diff", action="store_true",
+                        help="Send every update without comparing it with the current opportunity first")
+    parser.add_argument("--fetch-workers", type=int, default=update_diff.DEFAULT_FETCH_CONCURRENCY,
+                        help=f"Concurrent GetOpportunity calls used to diff a batch (default: {update_diff.DEFAULT_FETCH_CONCURRENCY})")
+    parser.add_argument("--batch-size", type=int, default=update_diff.DEFAULT_BATCH_SIZE,
+                        help=f"Records fetched and diffed together (default: {update_diff.DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--default-rate", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"Requests per second for each API operation (default: {DEFAULT_REQUESTS_PER_SECOND})")
+    parser.add_argument("--rate", action="append", metavar="OPERATION=RPS",
+                        help="Requests per second for one operation, e.g. --rate UpdateOpportunity=5 (repeatable)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes, each updating a deterministic shard of the input with its own client; "
+                             "rates are split between them (default: 1)")
+    return parser.parse_args()
+
+def new_counts():
+    return {update_diff.CHANGED: 0, update_diff.UNCHANGED: 0, update_diff.UNKNOWN: 0}
+
+def update_records(partner_central_client, records, counts, args, verifier=None, validator=None, rate_limiter=None):
+    """
+    Diff and update the records batch by batch, tallying changed, unchanged and unreadable records in counts.
+    The GetOpportunity reads of the diff and the updates both take their turn from rate_limiter.
+    """
+    for batch in batched(load_valid_requests(records, validator), args.batch_size):
+        if args.skip_diff and not args.dry_run:
+            planned = ((source, request, update_diff.CHANGED, None, None) for source, request in batch)
+        else:
+            planned = update_diff.plan_updates(partner_central_client, batch, args.fetch_workers, rate_limiter)
+
+        for source, update_opportunity_request, status, changes, error in planned:
+            counts[status] += 1
+            if args.dry_run:
+                update_diff.print_diff(source, update_opportunity_request, status, changes, error)
+                continue
+            if status == update_diff.UNCHANGED:
+                print(f"- Skipping {source}: {update_opportunity_request['Identifier']} is unchanged")
+                continue
+            print(source)
+            response = update_opportunitiy(partner_central_client, source, verifier, update_opportunity_request, rate_limiter)
+            helper.pretty_print_datetime(response)
+
+def update_shard(shard, counts, args):
+    """Update the input, or one shard of it, with its own client. Returns (verifier, {}) for bulk_runner."""
+    rate_limiter = worker_rate_limiter(parse_rates(args.rate), args.default_rate, shard.count if shard else 1)
+    partner_central_client = get_boto3_client(serviceName, concurrency=args.fetch_workers)
+    verifier = Verifier(partner_central_client, args.verify, rate_limiter)
+    records, validator = bulk_runner.collect_records(
+        args.input, payload_validator.OPERATION_UPDATE, args.skip_validation, shard)
+    update_records(partner_central_client, records, counts, args, verifier, validator, rate_limiter)
+    return verifier, {}
+
 def usage_demo():
 
-    directory_path = 'src/bulk_update_opportunities/opportunities'
+    args = parse_arguments()
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     print("-" * 88)
     print("Create Opportunity.")
     print("-" * 88)
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
-
-    file_paths = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
+    if args.processes > 1:
+        counts, verifier, verification_failures, _ = bulk_runner.run_processes(
+            update_shard, new_counts, args.processes, args.verify, (args,))
+    else:
+        counts = new_counts()
+        verifier, _ = update_shard(None, counts, args)
+        verification_failures = verifier.finish()
 
-    # wait for a second if the update opportunity is not finished with response status code = 200
-    for file_path in file_paths:
-        print(file_path)
-        response = update_opportunitiy(partner_central_client, file_path)
-        helper.pretty_print_datetime(response)
-        time.sleep(1)
+    print("-" * 88)
+    print(f"{'Would update' if args.dry_run else 'Update requests sent'}: {counts[update_diff.CHANGED]}, "
+          f"unchanged: {counts[update_diff.UNCHANGED]}, not readable: {counts[update_diff.UNKNOWN]}")
+    verification.print_report(verifier, verification_failures)
 
 if __name__ == "__main__":
     usage_demo()
-
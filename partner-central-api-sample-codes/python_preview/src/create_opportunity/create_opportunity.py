@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 #!/usr/bin/env python
-import boto3
 import logging
 import sys
 import os
@@ -11,6 +10,7 @@ import utils.helpers as helper
 import utils.stringify_details as sd
 from botocore.client import ClientError
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
@@ -40,10 +40,7 @@ def usage_demo():
     print("Create Opportunity.")
     print("-" * 88)
 
-    partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-    )
+    partner_central_client = get_boto3_client(serviceName)
 
     create_opportunity(partner_central_client)
 
@@ -11,17 +11,14 @@ such as the customer, project, and lifecycle details.
 """
 import json
 import logging
-import boto3
 import utils.helpers as helper
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def get_opportunity_engagement_invitation(identifier):
     get_opportunity_engagement_invitation_request ={
@@ -0,0 +1,62 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+#!/usr/bin/env python
+
+"""
+Purpose
+List Opportunities and get the details of each one concurrently with the asyncio client.
+API requests: ListOpportunities; GetOpportunity
+Requires aiohttp: pip install aiohttp
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from botocore.client import ClientError
+
+from utils.async_client import AsyncPartnerCentralClient, DEFAULT_CONCURRENCY
+from utils.constants import CATALOG_TO_USE
+
+async def get_opportunities(concurrency=DEFAULT_CONCURRENCY, limit=None):
+    """Stream opportunity summaries and fetch details as they arrive, with up to `concurrency` calls in flight."""
+    opportunities = []
+    async with AsyncPartnerCentralClient(concurrency=concurrency) as client:
+        async def get_opportunity(identifier):
+            try:
+                opportunities.append(await client.get_opportunity(Catalog=CATALOG_TO_USE, Identifier=identifier))
+            except ClientError as err:
+                print(json.dumps(err.response))
+
+        tasks = []
+        async for summary in client.paginate("ListOpportunities", Catalog=CATALOG_TO_USE, MaxResults=100):
+            tasks.append(asyncio.create_task(get_opportunity(summary["Id"])))
+            if limit and len(tasks) >= limit:
+                break
+        await asyncio.gather(*tasks)
+    return opportunities
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Get opportunity details concurrently with the asyncio client.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Pooled connections, i.e. calls in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--limit", type=int, help="Only get the first LIMIT opportunities")
+    return parser.parse_args()
+
+def usage_demo():
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    print("-" * 88)
+    print("Getting Opportunities with the asyncio client.")
+    print("-" * 88)
+
+    started = time.perf_counter()
+    opportunities = asyncio.run(get_opportunities(args.concurrency, args.limit))
+    elapsed = time.perf_counter() - started
+    print(json.dumps(opportunities, indent=4))
+    print(f"Got {len(opportunities)} opportunities in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    usage_demo()
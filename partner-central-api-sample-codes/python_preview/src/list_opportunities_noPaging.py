@@ -9,17 +9,14 @@ PC-API -18 Getting list of Opportunities
 """
 import json
 import logging
-import boto3
 import utils.helpers as helper
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def get_list_of_opportunities():
     list_opportunities_request ={
@@ -9,17 +9,15 @@ PC-API -18 Getting list of Opportunities
 """
 import json
 import logging
-import boto3
 import utils.helpers as helper
+from utils.partitioned_listing import list_opportunities_partitioned
 
 from utils.constants import CATALOG_TO_USE
+from utils.aws_client import get_boto3_client
 
 serviceName = "partnercentral-selling"
 
-partner_central_client = boto3.client(
-        service_name=serviceName,
-        region_name='us-east-1'
-)
+partner_central_client = get_boto3_client(serviceName)
 
 def get_list_of_opportunities():
 
@@ -45,6 +43,20 @@ def get_list_of_opportunities():
         # Catch all client exceptions
         print(json.dumps(err.response))
 
+def get_list_of_opportunities_partitioned(after_last_modified_date, partitions=8):
+    """List opportunities modified after the given date with concurrent date windows of 100 results per page."""
+    try:
+        return list_opportunities_partitioned(
+            partner_central_client,
+            {"Catalog": CATALOG_TO_USE},
+            after_last_modified_date,
+            partitions=partitions
+        )
+
+    except Exception as err:
+        # Catch all client exceptions
+        print(json.dumps(err.response))
+
 def usage_demo():
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
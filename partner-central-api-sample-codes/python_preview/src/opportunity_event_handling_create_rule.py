@@ -8,10 +8,10 @@ Purpose
 Create eventbridge rule to listen to Opportunity Created event.
 """
 
-import boto3
 import json
+from utils.aws_client import get_boto3_client
 
-client = boto3.client('events')
+client = get_boto3_client('events', region_name=None)
 event_pattern = {
     "source": ["aws.partnercentral-selling"],
     "detail-type": ["Opportunity Created"], 
@@ -7,10 +7,10 @@
 Purpose
 Create eventbridge rule to listen to Opportunity Created event and send to lambda function.
 """
-import boto3
 import json
+from utils.aws_client import get_boto3_client
 
-eventbridge = boto3.client('events')
+eventbridge = get_boto3_client('events', region_name=None)
 
 # Opportunity Updated; Opportunity Created; Opportunity Accepted; Opportunity Rejected
 event_type = "Opportunity Created"
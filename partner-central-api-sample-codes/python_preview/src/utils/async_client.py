@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+asyncio client for the hot Partner Central Selling API operations. Each call is a JSON POST with an
+X-Amz-Target header, signed with SigV4 and sent over one pooled aiohttp session, so a single event
+loop can keep hundreds of calls in flight without threads. Credentials come from the default chain
+and are refreshed off the event loop before they expire; throttling and transient errors are retried
+with the policy of utils.retry. Errors are raised as botocore ClientError with the same response shape
+as boto3. Responses are the raw JSON: timestamps stay ISO 8601 strings. The wire protocol
+helpers are those of utils.raw_client.
+
+Requires aiohttp: pip install aiohttp
+"""
+
+import asyncio
+import logging
+
+import botocore.session
+from botocore.client import ClientError
+
+from utils.client_config import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+from utils.raw_client import (DEFAULT_REGION, PAGINATED_OPERATIONS, dumps, endpoint_for, loads, parse_error,
+                              sign_request)
+from utils.retry import RetryPolicy, is_idempotent, is_retryable, is_throttling
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 200
+
+
+class AsyncPartnerCentralClient:
+    """
+    Use as an async context manager:
+
+        async with AsyncPartnerCentralClient() as client:
+            opportunity = await client.get_opportunity(Catalog="AWS", Identifier="O1234567")
+            async for summary in client.paginate("ListOpportunities", Catalog="AWS"):
+                ...
+
+    `concurrency` caps the pooled connections; calls beyond it wait for a free connection.
+    """
+
+    def __init__(self, region_name=DEFAULT_REGION, endpoint_url=None, concurrency=DEFAULT_CONCURRENCY,
+                 retry_policy=None, credentials=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT):
+        self.region_name = region_name
+        self.endpoint_url = (endpoint_url or endpoint_for(region_name)).rstrip("/") + "/"
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._credentials = credentials
+        self._refresh_lock = None
+        self._session = None
+
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is required for the asyncio client: pip install aiohttp") from None
+        self._aiohttp = aiohttp
+        if self._credentials is None:
+            # Resolving the default chain can call STS or the instance metadata service
+            self._credentials = await asyncio.to_thread(botocore.session.get_session().get_credentials)
+        if self._credentials is None:
+            raise RuntimeError("No AWS credentials found")
+        self._refresh_lock = asyncio.Lock()
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _frozen_credentials(self):
+        """Current credentials; a refresh that needs network I/O runs in a thread, once for all callers."""
+        refresh_needed = getattr(self._credentials, "refresh_needed", None)
+        if refresh_needed and refresh_needed():
+            async with self._refresh_lock:
+                if refresh_needed():
+                    return await asyncio.to_thread(self._credentials.get_frozen_credentials)
+        return self._credentials.get_frozen_credentials()
+
+    async def _send(self, operation_name, body):
+        request = sign_request(await self._frozen_credentials(), self.region_name, self.endpoint_url,
+                               operation_name, body)
+        async with self._session.post(self.endpoint_url, data=body, headers=dict(request.headers)) as response:
+            content = await response.read()
+            if response.status == 200:
+                return loads(content)
+            raise ClientError(parse_error(response.status, response.headers, content), operation_name)
+
+    async def call(self, operation_name, **params):
+        """
+        Call an operation by its API name, retrying throttling, transient and connection errors;
+        writes without a ClientToken are only retried after throttling.
+        """
+        if self._session is None:
+            raise RuntimeError("Use the client as 'async with AsyncPartnerCentralClient() as client'")
+        body = dumps(params)
+        policy = self.retry_policy
+        idempotent = is_idempotent(operation_name, "ClientToken" in params)
+        attempt = 0
+        while True:
+            try:
+                return await self._send(operation_name, body)
+            except (ClientError, self._aiohttp.ClientError, asyncio.TimeoutError) as err:
+                attempt += 1
+                if not idempotent:
+                    retryable = is_throttling(err)
+                else:
+                    retryable = is_retryable(err) if isinstance(err, ClientError) else True
+                if not retryable or attempt >= policy.max_attempts or not policy.budget.try_spend():
+                    raise
+                delay = policy.backoff(attempt - 1)
+                code = err.response["Error"]["Code"] if isinstance(err, ClientError) else type(err).__name__
+                logger.warning("Retrying %s after %s (attempt %d of %d) in %.2fs",
+                               operation_name, code, attempt + 1, policy.max_attempts, delay)
+                await asyncio.sleep(delay)
+
+    async def paginate(self, operation_name, **params):
+        """Async generator over the items of every page of a paginated operation."""
+        result_key = PAGINATED_OPERATIONS[operation_name]
+        while True:
+            page = await self.call(operation_name, **params)
+            for item in page.get(result_key, []):
+                yield item
+            if not page.get("NextToken"):
+                return
+            params = dict(params, NextToken=page["NextToken"])
+
+    async def list_opportunities(self, **params):
+        return await self.call("ListOpportunities", **params)
+
+    async def get_opportunity(self, **params):
+        return await self.call("GetOpportunity", **params)
+
+    async def get_aws_opportunity_summary(self, **params):
+        return await self.call("GetAwsOpportunitySummary", **params)
+
+    async def create_opportunity(self, **params):
+        return await self.call("CreateOpportunity", **params)
+
+    async def update_opportunity(self, **params):
+        return await self.call("UpdateOpportunity", **params)
+
+    async def start_engagement_from_opportunity_task(self, **params):
+        return await self.call("StartEngagementFromOpportunityTask", **params)
+
+    async def start_engagement_by_accepting_invitation_task(self, **params):
+        return await self.call("StartEngagementByAcceptingInvitationTask", **params)
+
+    async def list_engagement_from_opportunity_tasks(self, **params):
+        return await self.call("ListEngagementFromOpportunityTasks", **params)
+
+    async def list_engagement_by_accepting_invitation_tasks(self, **params):
+        return await self.call("ListEngagementByAcceptingInvitationTasks", **params)
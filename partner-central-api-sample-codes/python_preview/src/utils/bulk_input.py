@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Bulk input for the bulk tools: a directory with one JSON file per opportunity, a single NDJSON
+file with one opportunity per line, or a flat CSV file whose columns use the dotted keys written
+by flatten_json_object (e.g. "Project.ExpectedCustomerSpend[0].Amount"). Files are read lazily,
+one record at a time, so memory does not grow with the size of the input. A Shard selects a
+deterministic slice of the input for one worker process before any record is parsed.
+"""
+
+import csv
+import json
+import os
+import re
+import zlib
+from collections import namedtuple
+
+import utils.helpers as helper
+import utils.stringify_details as sd
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+CSV_EXTENSIONS = (".csv",)
+
+# A record to process. For directory input only `source` (the file path) is set and the file is
+# read by load_request(); stream input carries the parsed request, or the error that stopped parsing.
+InputRecord = namedtuple("InputRecord", ["source", "request", "error"], defaults=[None, None])
+
+
+
+class Shard(namedtuple("Shard", ["index", "count"])):
+    """
+    Slice `index` of `count`. A record belongs to the shard its key hashes to: the file name for directory
+    input, the line number for NDJSON and CSV input. The same input and count always give the same shards.
+    """
+
+    def owns(self, key):
+        return zlib.crc32(str(key).encode("utf-8")) % self.count == self.index
+
+
+_KEY_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def parse_flat_key(key):
+    """Split "Project.ExpectedCustomerSpend[0].Amount" into ["Project", "ExpectedCustomerSpend", 0, "Amount"]."""
+    return [name if name else int(index) for name, index in _KEY_TOKEN.findall(key)]
+
+
+def unflatten_record(flat_record):
+    """Rebuild a nested payload from flattened keys. Empty cells are treated as missing values."""
+    root = {}
+    for key, value in flat_record.items():
+        if key is None or value is None or value == "":
+            continue
+        parts = parse_flat_key(key)
+        node = root
+        for part, next_part in zip(parts, parts[1:]):
+            child = {} if isinstance(next_part, str) else []
+            if isinstance(part, int):
+                while len(node) <= part:
+                    node.append(None)
+                if node[part] is None:
+                    node[part] = child
+                node = node[part]
+            else:
+                node = node.setdefault(part, child)
+        last = parts[-1]
+        if isinstance(last, int):
+            while len(node) <= last:
+                node.append(None)
+            node[last] = value
+        else:
+            node[last] = value
+    return root
+
+
+def iter_directory(directory_path, shard=None):
+    for entry in sorted(os.scandir(directory_path), key=lambda entry: entry.name):
+        if entry.is_file() and entry.name.endswith('.json') and (shard is None or shard.owns(entry.name)):
+            yield InputRecord(entry.path)
+
+
+def iter_ndjson(file_path, shard=None):
+    with open(file_path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip() or (shard is not None and not shard.owns(line_number)):
+                continue
+            source = f"{file_path}:{line_number}"
+            try:
+                yield InputRecord(source, json.loads(line))
+            except ValueError as err:
+                yield InputRecord(source, error=str(err))
+
+
+def iter_csv(file_path, shard=None):
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if shard is not None and not shard.owns(reader.line_num):
+                continue
+            yield InputRecord(f"{file_path}:{reader.line_num}", unflatten_record(row))
+
+
+def iter_records(path, shard=None):
+    """Yield an InputRecord per opportunity in a directory, NDJSON file or CSV file, or in one shard of it."""
+    if os.path.isdir(path):
+        return iter_directory(path, shard)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in NDJSON_EXTENSIONS:
+        return iter_ndjson(path, shard)
+    if extension in CSV_EXTENSIONS:
+        return iter_csv(path, shard)
+    raise ValueError(f"Unsupported bulk input {path}: expected a directory, {', '.join(NDJSON_EXTENSIONS + CSV_EXTENSIONS)}")
+
+
+def load_request(record):
+    """Return (request, error) for a record, reading the JSON file of directory input."""
+    if record.error:
+        return None, {"Error": {"Code": "InvalidInputFile", "Message": record.error}}
+    request = record.request
+    if request is None:
+        try:
+            request = sd.stringify_json(record.source)
+        except (OSError, ValueError) as err:
+            return None, {"Error": {"Code": "InvalidInputFile", "Message": str(err)}}
+    if not isinstance(request, dict):
+        return None, {"Error": {"Code": "InvalidInputFile", "Message": "Expected a JSON object"}}
+    return helper.remove_nulls(request), None
@@ -0,0 +1,85 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Input collection and the --processes worker shared by the bulk create, create/submit and update tools.
+A directory is validated upfront, an NDJSON or CSV file is streamed with a validator for its records.
+Each tool has a module-level function that processes its input, or one shard of it; the worker here
+runs it in every process and the parent merges the counts and verification outcomes they return.
+"""
+
+import os
+
+import utils.bulk_input as bulk_input
+import utils.payload_validator as payload_validator
+from utils.process_runner import ProgressReporter, merge_counts, run_sharded
+from utils.verification import Verifier
+
+
+def collect_records(input_path, operation, skip_validation=False, shard=None, validation_workers=None, on_rejected=None):
+    """
+    Return (records, validator) for the input, or for one shard of it.
+    A directory of JSON files is validated upfront and `records` is the list of its valid files; rejected
+    files are printed and passed to on_rejected(file_path, errors). An NDJSON or CSV file is read lazily
+    instead and the returned validator is applied by the caller as each record is loaded.
+    """
+    validator = None
+    if not os.path.isdir(input_path):
+        if shard is None:
+            print(f"Streaming opportunities from {input_path}\n")
+        records = bulk_input.iter_records(input_path, shard)
+        if not skip_validation:
+            try:
+                validator = payload_validator.PayloadValidator.from_samples()
+            except OSError as err:
+                print(f"Skipping pre-flight validation: {err}")
+        return records, validator
+
+    file_paths = [record.source for record in bulk_input.iter_directory(input_path, shard)]
+    if shard is None:
+        print(f"Found {len(file_paths)} opportunity file(s) to process\n")
+    # Reject invalid payloads before they cost an API call and a rate-limit slot
+    if file_paths and not skip_validation:
+        # A worker is already one of several processes, so it validates its files in-process
+        workers = 1 if shard is not None else validation_workers
+        try:
+            rejected = payload_validator.validate_files(file_paths, operation, workers)
+        except OSError as err:
+            print(f"Skipping pre-flight validation: {err}")
+            rejected = {}
+        payload_validator.print_rejections(rejected)
+        if on_rejected:
+            for file_path, errors in rejected.items():
+                on_rejected(file_path, errors)
+        file_paths = [file_path for file_path in file_paths if file_path not in rejected]
+    return [bulk_input.InputRecord(file_path) for file_path in file_paths], validator
+
+
+def process_shard(shard, progress_queue, run, new_counts, *run_args):
+    """
+    Worker process of a --processes run. run(shard, counts, *run_args) processes one shard of the input,
+    tallying its records in counts, and returns (verifier, extra); its counts are reported as progress
+    meanwhile. Returns the counts, the verification outcome and the entries of `extra` for the parent.
+    """
+    counts = new_counts()
+    with ProgressReporter(progress_queue, shard, counts):
+        verifier, extra = run(shard, counts, *run_args)
+    # Deferred verification runs in finish(), so the verified count is read after it
+    verification_failures = verifier.finish()
+    return dict(extra, counts=counts, verified=verifier.verified, verification_failures=verification_failures)
+
+
+def run_processes(run, new_counts, processes, verification_policy, run_args=()):
+    """
+    Run run() on `processes` shards of the input in as many worker processes (see process_shard).
+    Returns (counts, verifier, verification failures, worker results); the verifier is a stand-in that
+    carries the policy and the merged verified count for verification.print_report().
+    """
+    results = run_sharded(process_shard, processes, (run, new_counts) + tuple(run_args))
+    counts = merge_counts(result["counts"] for result in results)
+    verifier = Verifier(None, verification_policy)
+    verifier.verified = sum(result["verified"] for result in results)
+    verification_failures = [failure for result in results for failure in result["verification_failures"]]
+    return counts, verifier, verification_failures, results
@@ -0,0 +1,55 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Shared botocore client configuration: a connection pool sized from the job's concurrency, timeouts,
+TCP keep-alive and retry mode, each of which can be overridden with an environment variable.
+"""
+
+# Copied to sampleUI/utils and leadToOpportunity/utils; see test/test_shared_modules.py
+
+import os
+
+from botocore.config import Config
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_TCP_KEEPALIVE = True
+DEFAULT_RETRY_MODE = "standard"
+# Connections kept beyond the job's worker count, for paginators and verification reads
+POOL_HEADROOM = 2
+
+ENV_MAX_POOL_CONNECTIONS = "PC_MAX_POOL_CONNECTIONS"
+ENV_CONNECT_TIMEOUT = "PC_CONNECT_TIMEOUT"
+ENV_READ_TIMEOUT = "PC_READ_TIMEOUT"
+ENV_TCP_KEEPALIVE = "PC_TCP_KEEPALIVE"
+ENV_RETRY_MODE = "PC_RETRY_MODE"
+
+
+def pool_size(concurrency=None):
+    """Connections needed for `concurrency` threads sharing one client; never below botocore's default."""
+    if os.getenv(ENV_MAX_POOL_CONNECTIONS):
+        return int(os.getenv(ENV_MAX_POOL_CONNECTIONS))
+    if not concurrency:
+        return DEFAULT_MAX_POOL_CONNECTIONS
+    return max(DEFAULT_MAX_POOL_CONNECTIONS, concurrency + POOL_HEADROOM)
+
+
+def build_config(concurrency=None, config=None):
+    """
+    botocore Config for a client shared by `concurrency` threads, merged with the caller's `config`
+    (whose values win). botocore's own retries are limited to one attempt because utils.retry
+    retries every call; the retry mode still selects botocore's retry handler, e.g. "adaptive"
+    for client-side rate limiting after throttling.
+    """
+    base = Config(
+        max_pool_connections=pool_size(concurrency),
+        connect_timeout=float(os.getenv(ENV_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)),
+        read_timeout=float(os.getenv(ENV_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)),
+        tcp_keepalive=os.getenv(ENV_TCP_KEEPALIVE, str(DEFAULT_TCP_KEEPALIVE)).lower() in ("1", "true", "yes"),
+        retries={"mode": os.getenv(ENV_RETRY_MODE, DEFAULT_RETRY_MODE), "total_max_attempts": 1},
+    )
+    return base.merge(config) if config else base
@@ -0,0 +1,82 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+List opportunities by splitting the LastModifiedDate range into windows that are paged concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# Largest page size accepted by ListOpportunities
+MAX_PAGE_SIZE = 100
+
+# Neighbouring windows overlap so that opportunities modified exactly on a boundary are not missed;
+# the overlap is removed when the windows are merged.
+WINDOW_OVERLAP = timedelta(seconds=1)
+
+
+def split_date_range(start, end, partitions):
+    """Split [start, end] into equal (after, before) windows that overlap by WINDOW_OVERLAP."""
+    start, end = to_datetime(start), to_datetime(end)
+    partitions = max(1, partitions)
+    width = (end - start) / partitions
+    windows = []
+    for index in range(partitions):
+        window_start = start + width * index
+        window_end = end if index == partitions - 1 else start + width * (index + 1) + WINDOW_OVERLAP
+        windows.append((window_start, window_end))
+    return windows
+
+
+def list_window(partner_central_client, request_params, window):
+    """Page through a single LastModifiedDate window."""
+    after, before = window
+    params = dict(request_params)
+    params["MaxResults"] = MAX_PAGE_SIZE
+    params["LastModifiedDate"] = {
+        "AfterLastModifiedDate": after,
+        "BeforeLastModifiedDate": before
+    }
+
+    summaries = []
+    while True:
+        response = partner_central_client.list_opportunities(**params)
+        summaries.extend(response["OpportunitySummaries"])
+        if response.get("NextToken") is None:
+            return summaries
+        params["NextToken"] = response["NextToken"]
+
+
+def merge_summaries(window_results):
+    """Merge the summaries of all windows, keeping the most recently modified copy of each opportunity."""
+    merged = {}
+    for summaries in window_results:
+        for summary in summaries:
+            current = merged.get(summary["Id"])
+            if current is None or to_datetime(summary["LastModifiedDate"]) > to_datetime(current["LastModifiedDate"]):
+                merged[summary["Id"]] = summary
+    return list(merged.values())
+
+
+def list_opportunities_partitioned(partner_central_client, request_params, start, end=None, partitions=8, concurrency=None):
+    """
+    List opportunities modified between start and end (default: now) with `partitions` date windows
+    paged concurrently at the largest page size. request_params holds the other filters, e.g. Catalog.
+    API errors are raised to the caller.
+    """
+    end = end or datetime.now(timezone.utc)
+    windows = split_date_range(start, end, partitions)
+
+    with ThreadPoolExecutor(max_workers=concurrency or len(windows)) as executor:
+        window_results = list(executor.map(lambda window: list_window(partner_central_client, request_params, window), windows))
+
+    return merge_summaries(window_results)
+
+
+def to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
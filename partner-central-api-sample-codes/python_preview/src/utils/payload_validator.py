@@ -0,0 +1,368 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Offline pre-flight validation of CreateOpportunity and UpdateOpportunity payloads.
+The rules are compiled once from the CSV files in opportunity-samples/ into lookup tables:
+standard values per field, a postal code regex per country, and mandatory fields per operation.
+A directory of payloads is validated across worker processes before any API call is made.
+"""
+
+import csv
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from utils.bulk_input import InputRecord, load_request
+
+SAMPLES_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "opportunity-samples"))
+STANDARD_VALUES_CSV = "Opportunity_-_StandardValues.csv"
+FIELDS_CSV = "Opportunity-Fields.csv"
+POSTAL_CODE_CSV = "PostalCodeValidations.csv"
+NO_POSTAL_CODE_CSV = "CountriesWithoutPostalCode.csv"
+
+OPERATION_CREATE = "create"
+OPERATION_UPDATE = "update"
+
+# Below this many files, validating in the calling process beats starting a process pool
+PARALLEL_THRESHOLD = 500
+
+# The CSVs use the APN CRM field names; these are the matching paths in the current API payload.
+# "[]" marks a list whose items are all checked.
+FIELD_PATHS = {
+    "doesOppBelongToNatSec": "NationalSecurity",
+    "city": "Customer.Account.Address.City",
+    "country": "Customer.Account.Address.CountryCode",
+    "customerWebsite": "Customer.Account.WebsiteUrl",
+    "customerDuns": "Customer.Account.Duns",
+    "industry": "Customer.Account.Industry",
+    "industryOther": "Customer.Account.OtherIndustry",
+    "customerCompanyName": "Customer.Account.CompanyName",
+    "postalCode": "Customer.Account.Address.PostalCode",
+    "state": "Customer.Account.Address.StateOrRegion",
+    "streetAddress": "Customer.Account.Address.StreetAddress",
+    "awsSFCampaignName": "Marketing.CampaignName",
+    "targetCloseDate": "LifeCycle.TargetCloseDate",
+    "deliveryModel": "Project.DeliveryModels[]",
+    "IsOppFromMarketingActivity": "Marketing.Source",
+    "marketingActivityChannel": "Marketing.Channels[]",
+    "marketingActivityUsecase": "Marketing.UseCases[]",
+    "isMarketingDevelopmentFunded": "Marketing.AwsFundingUsed",
+    "nextStep": "LifeCycle.NextSteps",
+    "opportunityType": "OpportunityType",
+    "otherSolutionOffered": "Project.OtherSolutionDescription",
+    "parentOppId": "Project.RelatedOpportunityIdentifier",
+    "partnerPrimaryNeedFromAws": "PrimaryNeedsFromAws[]",
+    "partnerProjectTitle": "Project.Title",
+    "salesActivities": "Project.SalesActivities[]",
+    "expectedMonthlyAwsRevenue": "Project.ExpectedCustomerSpend[].Amount",
+    "projectDescription": "Project.CustomerBusinessProblem",
+    "useCase": "Project.CustomerUseCase",
+    "additionalComments": "Project.AdditionalComments",
+    "awsAccountId": "Customer.Account.AwsAccountId",
+    "campaignName": "Project.ApnPrograms[]",
+    "competitiveTracking": "Project.CompetitorName",
+    "competitiveTrackingOther": "Project.OtherCompetitorNames",
+    "partnerCrmUniqueIdentifier": "PartnerOpportunityIdentifier",
+    "apnCrmUniqueIdentifier": "Identifier",
+    "stage": "LifeCycle.Stage",
+    "closedLostReason": "LifeCycle.ClosedLostReason",
+    "procurementType": "SoftwareRevenue.DeliveryModel",
+    "customerSoftwareValueCurrency": "SoftwareRevenue.Value.CurrencyCode",
+    "customerSoftwareValue": "SoftwareRevenue.Value.Amount",
+    "contractStartDate": "SoftwareRevenue.EffectiveDate",
+    "contractEndDate": "SoftwareRevenue.ExpirationDate",
+    "opportunityOwnership": "Origin",
+}
+# Standard value columns that also apply to other payload paths
+EXTRA_ENUM_PATHS = {
+    "customerSoftwareValueCurrency": ["Project.ExpectedCustomerSpend[].CurrencyCode"],
+}
+# Standard value columns that do not match the API values: Marketing.Source takes
+# "Marketing Activity"/"None", countries are sent as ISO codes, and states only apply to the US
+NON_API_ENUM_COLUMNS = {"IsOppFromMarketingActivity", "country", "state"}
+# Always required on top of the mandatory fields from Opportunity-Fields.csv
+OPERATION_REQUIRED_PATHS = {
+    OPERATION_CREATE: [],
+    OPERATION_UPDATE: ["Identifier", "LastModifiedDate"],
+}
+
+# Country names used in PostalCodeValidations.csv and CountriesWithoutPostalCode.csv -> ISO 3166 codes
+COUNTRY_CODES = {
+    "Afghanistan": "AF", "Aland Islands": "AX", "Albania": "AL", "Algeria": "DZ", "Angola": "AO",
+    "Antigua And Barbuda": "AG", "Armenia": "AM", "Aruba": "AW", "Australia": "AU", "Austria": "AT",
+    "Bahamas": "BS", "Bahrain": "BH", "Bangladesh": "BD", "Belgium": "BE", "Belize": "BZ", "Benin": "BJ",
+    "Bermuda": "BM", "Bhutan": "BT", "Bolivia": "BO", "Bonaire,Sint Eustatius and Saba": "BQ",
+    "Bosnia and Herzegovina": "BA", "Botswana": "BW", "Brazil": "BR", "Brunei Darussalam": "BN",
+    "Bulgaria": "BG", "Burkina Faso": "BF", "Burundi": "BI", "Cambodia": "KH", "Cameroon": "CM",
+    "Canada": "CA", "Cape Verde": "CV", "Central African Republic": "CF", "Chad": "TD", "China": "CN",
+    "Christmas Island": "CX", "Cocos (Keeling) Islands": "CC", "Colombia": "CO", "Comoros": "KM",
+    "Congo": "CG", "Cook Islands": "CK", "Costa Rica": "CR", "Cote d'Ivoire": "CI", "Croatia": "HR",
+    "Cuba": "CU", "Curacao": "CW", "Cyprus": "CY", "Czech Republic": "CZ", "Denmark": "DK",
+    "Djibouti": "DJ", "Dominica": "DM", "Dominican Republic": "DO", "Ecuador": "EC", "Egypt": "EG",
+    "El Salvador": "SV", "Equatorial Guinea": "GQ", "Eritrea": "ER", "Estonia": "EE", "Ethiopia": "ET",
+    "Faroe Islands": "FO", "Fiji": "FJ", "Finland": "FI", "France": "FR", "French Guiana": "GF",
+    "French Polynesia": "PF", "French Southern Territories": "TF", "Gambia": "GM", "Georgia": "GE",
+    "Germany": "DE", "Ghana": "GH", "Great Britain": "GB", "Greece": "GR", "Greenland": "GL",
+    "Grenada": "GD", "Guadeloupe": "GP", "Guam": "GU", "Guatemala": "GT", "Guinea-Bissau": "GW",
+    "Guyana": "GY", "Haiti": "HT", "Heard Island and McDonald Islands": "HM",
+    "Holy See (Vatican City State)": "VA", "Honduras": "HN", "Hong Kong": "HK", "Hungary": "HU",
+    "Iceland": "IS", "India": "IN", "Indonesia": "ID", "Iraq": "IQ", "Ireland": "IE", "Israel": "IL",
+    "Italy": "IT", "Jamaica": "JM", "Japan": "JP", "Jordan": "JO", "Kazakhstan": "KZ", "Kenya": "KE",
+    "Kiribati": "KI", "Korea": "KR", "Kuwait": "KW", "Kyrgyzstan": "KG",
+    "Lao People's Democratic Republic": "LA", "Lesotho": "LS", "Liberia": "LR",
+    "Libyan Arab Jamahiriya": "LY", "Liechtenstein": "LI", "Lithuania": "LT", "Luxembourg": "LU",
+    "MACAO": "MO", "Macedonia, The former Yugoslav Republic Of": "MK", "Madagascar": "MG",
+    "Malawi": "MW", "Malaysia": "MY", "Maldives": "MV", "Mali": "ML", "Malta": "MT",
+    "Marshall Islands": "MH", "Martinique": "MQ", "Mauritania": "MR", "Mayotte": "YT", "Mexico": "MX",
+    "Monaco": "MC", "Mongolia": "MN", "Montenegro": "ME", "Morocco": "MA", "Mozambique": "MZ",
+    "Myanmar": "MM", "Namibia": "NA", "Nauru": "NR", "Nepal": "NP", "Netherlands": "NL",
+    "Netherlands Antilles": "AN", "New Caledonia": "NC", "New Zealand": "NZ", "Nicaragua": "NI",
+    "Niger": "NE", "Nigeria": "NG", "Niue": "NU", "Norfolk Island": "NF",
+    "Northern Mariana Islands": "MP", "Norway": "NO", "Oman": "OM", "Pakistan": "PK", "Palau": "PW",
+    "Panama": "PA", "Papua New Guinea": "PG", "Paraguay": "PY", "Peru": "PE", "Philippines": "PH",
+    "Poland": "PL", "Portugal": "PT", "Puerto Rico": "PR", "Qatar": "QA", "Reunion": "RE",
+    "Romania": "RO", "Rwanda": "RW", "Saint Barthelemy": "BL",
+    "Saint Helena, Ascension and  Tristan Da Cunha": "SH", "Saint Kitts and Nevis": "KN",
+    "Saint Martin (French Part)": "MF", "Saint Pierre and Miquelon": "PM",
+    "Saint Vincent and the Grenadines": "VC", "San Marino": "SM", "Sao Tome and Principe": "ST",
+    "Saudi Arabia": "SA", "Senegal": "SN", "Serbia": "RS", "Seychelles": "SC", "Sierra Leone": "SL",
+    "Singapore": "SG", "Slovakia": "SK", "Solomon Islands": "SB", "South Africa": "ZA",
+    "South Sudan": "SS", "Spain": "ES", "Sri Lanka": "LK", "Sudan": "SD", "Suriname": "SR",
+    "Svalbard and Jan Mayen": "SJ", "Swaziland": "SZ", "Sweden": "SE", "Switzerland": "CH",
+    "Syrian Arab Republic": "SY", "Taiwan": "TW", "Tajikistan": "TJ", "Thailand": "TH",
+    "Timor-Leste": "TL", "Togo": "TG", "Tokelau": "TK", "Tonga": "TO", "Trinidad and Tobago": "TT",
+    "Tunisia": "TN", "Turkey": "TR", "Turkmenistan": "TM", "Tuvalu": "TV", "Uganda": "UG",
+    "Ukraine": "UA", "United Arab Emirates": "AE", "United Kingdom": "GB", "United States": "US",
+    "Uruguay": "UY", "VIRGIN ISLANDS, U.S.": "VI", "Vanuatu": "VU", "Viet Nam": "VN",
+    "Wallis and Futuna": "WF", "Yemen": "YE", "Zambia": "ZM", "Zimbabwe": "ZW",
+}
+# Postal code messages that give examples instead of a format
+POSTAL_FORMAT_OVERRIDES = {
+    "Great Britain": "A(A)N(A/N)NAA OR A(A)N(A/N) NAA",
+    "Netherlands": "9999 AA or 9999AA",
+}
+# Placeholders in the postal code formats; any other character is literal
+POSTAL_PLACEHOLDERS = {"9": "0-9", "N": "0-9", "A": "A-Z"}
+
+
+def normalize_value(value):
+    """Fold spelling differences between the CSVs and the API ("&"/"and", dashes, spacing, case)."""
+    value = str(value).replace("&", " and ").replace("–", "-").replace("—", "-")
+    value = re.sub(r"\s*/\s*", "/", value)
+    return " ".join(value.split()).casefold()
+
+
+def postal_format_to_regex(postal_format):
+    """
+    Compile a format such as "A9A 9A9 or A9A9A9" into a regex.
+    9 and N are digits, A is a letter, "(A/N)" is an optional letter or digit.
+    """
+    alternatives = []
+    for alternative in re.split(r"\s+or\s+", postal_format.strip(), flags=re.IGNORECASE):
+        pattern = ""
+        index = 0
+        while index < len(alternative):
+            char = alternative[index]
+            if char == "(":
+                end = alternative.index(")", index)
+                options = alternative[index + 1:end].split("/")
+                pattern += "[" + "".join(POSTAL_PLACEHOLDERS[option] for option in options) + "]?"
+                index = end + 1
+                continue
+            if char in POSTAL_PLACEHOLDERS:
+                pattern += "[" + POSTAL_PLACEHOLDERS[char] + "]"
+            else:
+                pattern += re.escape(char)
+            index += 1
+        alternatives.append(pattern)
+    return re.compile("(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
+def _parse_path(path):
+    return [(part[:-2], True) if part.endswith("[]") else (part, False) for part in path.split(".")]
+
+
+def values_at(payload, path):
+    """All values at a dotted path; "[]" segments fan out over list items. Missing values are skipped."""
+    values = [payload]
+    for key, is_list in _parse_path(path):
+        next_values = []
+        for value in values:
+            if not isinstance(value, dict) or value.get(key) is None:
+                continue
+            child = value[key]
+            if is_list:
+                if isinstance(child, list):
+                    next_values.extend(item for item in child if item is not None)
+            else:
+                next_values.append(child)
+        values = next_values
+    return values
+
+
+class PayloadValidator:
+    """Lookup tables compiled from the opportunity-samples CSVs."""
+
+    def __init__(self, enums, postal_rules, no_postal_codes, us_states, required, min_lengths, positive, not_past):
+        self.enums = enums                      # path -> (column, frozenset of normalized values)
+        self.postal_rules = postal_rules        # country code -> (regex, error message)
+        self.no_postal_codes = no_postal_codes  # country codes without postal codes
+        self.us_states = us_states              # normalized US states and territories
+        self.required = required                # operation -> [paths]
+        self.min_lengths = min_lengths          # path -> minimum length
+        self.positive = positive                # paths that must be numbers greater than 0
+        self.not_past = not_past                # date paths that cannot be in the past
+
+    @classmethod
+    def from_samples(cls, samples_dir=SAMPLES_DIR):
+        """Compile the validator from the CSV files in samples_dir."""
+        standard_values = _read_csv(os.path.join(samples_dir, STANDARD_VALUES_CSV))
+        columns = {}
+        for index, column in enumerate(header.strip() for header in standard_values[0]):
+            columns[column] = frozenset(
+                normalize_value(row[index]) for row in standard_values[1:] if index < len(row) and row[index].strip())
+
+        enums = {}
+        for column, values in columns.items():
+            if column in NON_API_ENUM_COLUMNS or column not in FIELD_PATHS:
+                continue
+            for path in [FIELD_PATHS[column]] + EXTRA_ENUM_PATHS.get(column, []):
+                enums[path] = (column, values)
+
+        postal_rules = {}
+        for row in _read_csv(os.path.join(samples_dir, POSTAL_CODE_CSV))[1:]:
+            name, message = row[0].strip(), row[1].strip()
+            found = re.search(r"must be in (.+?) format", message)
+            postal_format = POSTAL_FORMAT_OVERRIDES.get(name) or (found and found.group(1))
+            if name in COUNTRY_CODES and postal_format:
+                postal_rules[COUNTRY_CODES[name]] = (postal_format_to_regex(postal_format), message)
+        no_postal_codes = frozenset(
+            COUNTRY_CODES[row[0].strip()] for row in _read_csv(os.path.join(samples_dir, NO_POSTAL_CODE_CSV))[1:]
+            if row and row[0].strip() in COUNTRY_CODES)
+
+        required = {operation: list(paths) for operation, paths in OPERATION_REQUIRED_PATHS.items()}
+        min_lengths, positive, not_past = {}, set(), set()
+        with open(os.path.join(samples_dir, FIELDS_CSV), newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                path = FIELD_PATHS.get(row["Field Name - APN CRM JSON Name"].strip())
+                if not path:
+                    continue
+                if row["Inbound - Mandatory / Conditionally Mandatory / Optional"].strip() == "Mandatory":
+                    if row["Create"].strip() == "Yes":
+                        required[OPERATION_CREATE].append(path)
+                    required[OPERATION_UPDATE].append(path)
+                rule = row["Field Validation"]
+                found = re.search(r"minimum (\d+) characters", rule, re.IGNORECASE)
+                if found:
+                    min_lengths[path] = int(found.group(1))
+                if re.search(r"greater than 0", rule, re.IGNORECASE):
+                    positive.add(path)
+                if re.search(r"cannot be in the past", rule, re.IGNORECASE):
+                    not_past.add(path)
+
+        return cls(enums, postal_rules, no_postal_codes, columns.get("state", frozenset()),
+                   required, min_lengths, frozenset(positive), frozenset(not_past))
+
+    def validate(self, payload, operation=OPERATION_CREATE):
+        """Return a list of "path: problem" strings; an empty list means the payload passed."""
+        if not isinstance(payload, dict):
+            return ["payload: expected a JSON object"]
+        errors = []
+        country_code = payload.get("Customer", {}).get("Account", {}).get("Address", {}).get("CountryCode")
+
+        for path in self.required.get(operation, []):
+            if path == FIELD_PATHS["postalCode"] and country_code in self.no_postal_codes:
+                continue
+            if not [value for value in values_at(payload, path) if value not in ("", [])]:
+                errors.append(f"{path}: is mandatory for {operation}")
+
+        for path, (column, allowed) in self.enums.items():
+            for value in values_at(payload, path):
+                if normalize_value(value) not in allowed:
+                    errors.append(f"{path}: {value!r} is not a standard value of {column}")
+
+        if country_code == "US":
+            for state in values_at(payload, FIELD_PATHS["state"]):
+                if normalize_value(state) not in self.us_states:
+                    errors.append(f"{FIELD_PATHS['state']}: {state!r} is not a US state or territory")
+        if country_code in self.postal_rules:
+            regex, message = self.postal_rules[country_code]
+            for postal_code in values_at(payload, FIELD_PATHS["postalCode"]):
+                if not regex.fullmatch(str(postal_code).strip()):
+                    errors.append(f"{FIELD_PATHS['postalCode']}: {message}")
+
+        for path, min_length in self.min_lengths.items():
+            for value in values_at(payload, path):
+                if len(str(value)) < min_length:
+                    errors.append(f"{path}: must be at least {min_length} characters")
+        for path in self.positive:
+            for value in values_at(payload, path):
+                try:
+                    valid = float(value) > 0
+                except (TypeError, ValueError):
+                    valid = False
+                if not valid:
+                    errors.append(f"{path}: {value!r} must be a number greater than 0")
+        for path in self.not_past:
+            for value in values_at(payload, path):
+                try:
+                    valid = date.fromisoformat(str(value)[:10]) >= date.today()
+                except ValueError:
+                    valid = False
+                if not valid:
+                    errors.append(f"{path}: {value!r} must be a date that is not in the past")
+        return errors
+
+
+_worker_validator = None
+
+
+def _init_worker(samples_dir):
+    global _worker_validator
+    _worker_validator = PayloadValidator.from_samples(samples_dir)
+
+
+def _validate_file(file_path, operation):
+    payload, error = load_request(InputRecord(file_path))
+    if error:
+        return file_path, [f"file: {error['Error']['Message']}"]
+    return file_path, _worker_validator.validate(payload, operation)
+
+
+def validate_files(file_paths, operation=OPERATION_CREATE, workers=None, samples_dir=SAMPLES_DIR):
+    """
+    Validate payload files, across worker processes for large batches.
+    Each process compiles the rules once. Returns {file_path: errors} for the files that failed.
+    """
+    file_paths = list(file_paths)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(file_paths) < PARALLEL_THRESHOLD:
+        _init_worker(samples_dir)
+        results = [_validate_file(file_path, operation) for file_path in file_paths]
+    else:
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(samples_dir,)) as executor:
+            results = list(executor.map(_validate_file, file_paths, [operation] * len(file_paths), chunksize=chunksize))
+    return {file_path: errors for file_path, errors in results if errors}
+
+
+def rejection_error(errors):
+    """Error response, in the shape of a botocore error, for a payload that failed validation."""
+    return {"Error": {"Code": "PreflightValidation", "Message": "; ".join(errors)}}
+
+
+def print_rejections(rejected):
+    for file_path, errors in rejected.items():
+        print(f"✗ Rejected {file_path}:")
+        for error in errors:
+            print(f"    {error}")
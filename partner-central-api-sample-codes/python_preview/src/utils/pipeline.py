@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+A staged pipeline of worker threads connected by bounded queues. Each stage handles one item at a
+time and passes what it returns to the next stage, so later items can be in an earlier stage while
+earlier items are still in a later one. Full queues block the stage before them (back-pressure).
+"""
+
+import queue
+import threading
+import time
+import traceback
+
+_DONE = object()
+
+
+class Stage:
+    """
+    A pipeline stage. handler(item) returns the item for the next stage, or None when the item
+    finished at this stage (e.g. because it failed and was already reported).
+    If the handler raises, on_error(item, error) is called so that the item can still be reported;
+    the item finishes at this stage.
+    """
+
+    def __init__(self, name, handler, workers=1, on_error=None):
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def throughput(self):
+        """Items per second over the time the stage was active."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        elapsed = self.finished_at - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class Pipeline:
+    """Runs items through the stages; the last stage's non-None results are returned by run()."""
+
+    def __init__(self, stages, queue_size=100):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, items):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = []
+        results_lock = threading.Lock()
+        remaining_workers = [stage.workers for stage in self.stages]
+        remaining_lock = threading.Lock()
+
+        def put(index, item):
+            queues[index].put(item)
+            stage = self.stages[index]
+            depth = queues[index].qsize()
+            with stage._lock:
+                stage.max_queue_depth = max(stage.max_queue_depth, depth)
+
+        def worker(index):
+            stage = self.stages[index]
+            while True:
+                item = queues[index].get()
+                if item is _DONE:
+                    break
+                with stage._lock:
+                    if stage.started_at is None:
+                        stage.started_at = time.perf_counter()
+                try:
+                    output = stage.handler(item)
+                except Exception as error:
+                    output = None
+                    with stage._lock:
+                        stage.errors += 1
+                    print(f"Unhandled error in stage {stage.name}:\n{traceback.format_exc()}")
+                    if stage.on_error:
+                        try:
+                            stage.on_error(item, error)
+                        except Exception:
+                            print(f"Error handler of stage {stage.name} failed:\n{traceback.format_exc()}")
+                with stage._lock:
+                    stage.processed += 1
+                    stage.finished_at = time.perf_counter()
+                if output is None:
+                    continue
+                if index + 1 < len(self.stages):
+                    put(index + 1, output)
+                else:
+                    with results_lock:
+                        results.append(output)
+
+            # The last worker of a stage to finish closes the next stage
+            with remaining_lock:
+                remaining_workers[index] -= 1
+                last = remaining_workers[index] == 0
+            if last and index + 1 < len(self.stages):
+                for _ in range(self.stages[index + 1].workers):
+                    queues[index + 1].put(_DONE)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,), name=f"{stage.name}-{number}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for number in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for item in items:
+            put(0, item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+        return results
+
+    def print_report(self):
+        print(f"{'Stage':<12}{'Workers':>8}{'Processed':>11}{'Errors':>8}{'Items/s':>10}{'Max queue':>11}")
+        for stage in self.stages:
+            print(f"{stage.name:<12}{stage.workers:>8}{stage.processed:>11}{stage.errors:>8}"
+                  f"{stage.throughput():>10.2f}{stage.max_queue_depth:>11}")
@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Multi-process runner for the bulk tools. The input is split into deterministic shards
+(see bulk_input.Shard) and every worker process runs the tool's normal loop on one shard with
+its own boto3 client, rate limiter and results segment, so JSON parsing and payload preparation
+scale with cores. The workers share the tool's run journal, which SQLite serializes between
+processes. Workers report their counts to the parent, which prints merged progress and merges
+the results segments when the run is over.
+"""
+
+import io
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.bulk_input import Shard
+
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+
+def segment_path(path, shard):
+    """Per-worker file next to `path`, e.g. results.jsonl -> results.shard-0-of-4.jsonl."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.shard-{shard.index}-of-{shard.count}{extension}"
+
+
+def merge_counts(counts):
+    merged = Counter()
+    for worker_counts in counts:
+        merged.update(worker_counts)
+    return dict(merged)
+
+
+def merge_segments(path, shard_count):
+    """Append the workers' results segments to `path` in shard order and delete them."""
+    with open(path, 'a', encoding='utf-8') as merged:
+        for index in range(shard_count):
+            segment = segment_path(path, Shard(index, shard_count))
+            if not os.path.exists(segment):
+                continue
+            with open(segment, encoding='utf-8') as f:
+                for line in f:
+                    merged.write(line)
+            os.remove(segment)
+
+
+class ProgressReporter:
+    """
+    Used in a worker: sends a snapshot of its `counts` dict to the parent every `interval`
+    seconds while the block runs, and a final one when it exits.
+    """
+
+    def __init__(self, progress_queue, shard, counts, interval=DEFAULT_PROGRESS_INTERVAL):
+        self.progress_queue = progress_queue
+        self.shard = shard
+        self.counts = counts
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._report, name=f"progress-{shard.index}", daemon=True)
+
+    def _send(self):
+        if self.progress_queue is not None:
+            self.progress_queue.put((self.shard.index, dict(self.counts)))
+
+    def _report(self):
+        while not self._stopped.wait(self.interval):
+            self._send()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+        self._send()
+
+
+def _init_worker():
+    # Buffered and flushed per line (even under PYTHONUNBUFFERED), so every line reaches the
+    # shared stdout in one write and lines printed by different workers do not interleave
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        # stdout was replaced by an object without a file descriptor, e.g. a captured stream
+        return
+    sys.stdout = io.TextIOWrapper(open(fileno, 'wb', closefd=False), encoding=sys.stdout.encoding,
+                                  errors=sys.stdout.errors, line_buffering=True)
+
+
+def print_progress(latest, processes):
+    counts = merge_counts(latest.values())
+    details = ", ".join(f"{outcome}={count}" for outcome, count in sorted(counts.items()))
+    print(f"Progress: {sum(counts.values())} records ({details}) from {len(latest)}/{processes} worker(s)", flush=True)
+
+
+def run_sharded(worker, processes, worker_args=(), progress_interval=DEFAULT_PROGRESS_INTERVAL):
+    """
+    Run worker(shard, progress_queue, *worker_args) in `processes` processes, one shard each.
+    The worker must be a module-level function that returns a dict with a "counts" entry.
+    Prints merged progress while the workers run and returns their results in shard order;
+    an exception in a worker is raised here once all workers have finished.
+    """
+    with multiprocessing.Manager() as manager:
+        progress_queue = manager.Queue()
+        latest = {}
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+            futures = [executor.submit(worker, Shard(index, processes), progress_queue, *worker_args)
+                       for index in range(processes)]
+            last_printed = time.monotonic()
+            while not all(future.done() for future in futures):
+                try:
+                    shard_index, counts = progress_queue.get(timeout=0.2)
+                    latest[shard_index] = counts
+                except queue.Empty:
+                    pass
+                if time.monotonic() - last_printed >= progress_interval:
+                    print_progress(latest, processes)
+                    last_printed = time.monotonic()
+            results = [future.result() for future in futures]
+    return results
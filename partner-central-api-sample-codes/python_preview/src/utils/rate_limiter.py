@@ -0,0 +1,74 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Thread-safe token bucket rate limiting, with one bucket per API operation.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    A token bucket per API operation, e.g. {"CreateOpportunity": 5, "StartEngagementFromOpportunityTask": 2}.
+    Operations without an explicit rate use default_rate; with no default_rate they are not limited.
+    """
+
+    def __init__(self, rates=None, default_rate=None):
+        self.default_rate = default_rate
+        self._buckets = {operation: TokenBucket(rate) for operation, rate in (rates or {}).items()}
+        self._lock = threading.Lock()
+
+    def acquire(self, operation):
+        with self._lock:
+            bucket = self._buckets.get(operation)
+            if bucket is None and self.default_rate:
+                bucket = self._buckets[operation] = TokenBucket(self.default_rate)
+        if bucket is not None:
+            bucket.acquire()
+
+
+def worker_rate_limiter(rates, default_rate, processes=1):
+    """RateLimiter for one of `processes` worker processes, which together stay within the given rates."""
+    return RateLimiter({operation: rate / processes for operation, rate in rates.items()},
+                       default_rate=default_rate / processes if default_rate else None)
+
+
+def parse_rates(values):
+    """Parse OPERATION=RPS command line values into a {operation: rate} dict."""
+    rates = {}
+    for value in values or []:
+        operation, _, rate = value.partition("=")
+        if not operation or not rate:
+            raise ValueError(f"Expected OPERATION=RPS, got '{value}'")
+        rates[operation] = float(rate)
+    return rates
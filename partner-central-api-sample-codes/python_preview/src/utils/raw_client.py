@@ -0,0 +1,174 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Raw mode for read-heavy jobs such as exports and mirrors. Each call is a JSON POST with an
+X-Amz-Target header, signed with SigV4 like get_engagement_details_raw_json and sent over a pooled
+keep-alive connection, without botocore's response parsing: responses are returned as the bytes
+the service sent, or decoded with orjson when it is installed (the standard json module otherwise).
+Timestamps stay the ISO 8601 strings of the response, so no datetime objects are built and turned
+back into strings. Throttling and transient errors are retried with the policy of utils.retry, and
+errors are raised as botocore ClientError with the same response shape as boto3.
+
+The wire protocol helpers are shared with utils.async_client.
+"""
+
+import json
+import socket
+from datetime import date, datetime
+
+import botocore.session
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.client import ClientError
+from botocore.httpsession import URLLib3Session
+from urllib3.connection import HTTPConnection
+
+from utils.client_config import build_config
+from utils.constants import API_ENDPOINT
+from utils.retry import RetryPolicy, is_idempotent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SERVICE_NAME = "partnercentral-selling"
+TARGET_PREFIX = "AWSPartnerCentralSelling."
+CONTENT_TYPE = "application/x-amz-json-1.0"
+DEFAULT_REGION = "us-east-1"
+
+# Paginated operations and the list each page carries
+PAGINATED_OPERATIONS = {
+    "ListOpportunities": "OpportunitySummaries",
+    "ListEngagementFromOpportunityTasks": "TaskSummaries",
+    "ListEngagementByAcceptingInvitationTasks": "TaskSummaries",
+}
+
+
+def endpoint_for(region_name):
+    """Endpoint URL of the API in a region, following utils.constants.API_ENDPOINT (the us-east-1 endpoint)."""
+    return API_ENDPOINT.replace(f".{DEFAULT_REGION}.", f".{region_name}.")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(params):
+    """Request body for the operation parameters; datetimes are sent as ISO 8601 strings."""
+    return json.dumps(params, default=_json_default).encode("utf-8")
+
+
+def loads(content):
+    """Decode a response body, with orjson when it is installed."""
+    if not content:
+        return {}
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def sign_request(credentials, region_name, endpoint_url, operation_name, body):
+    """SigV4-signed AWSRequest for an operation; `credentials` are frozen credentials."""
+    request = AWSRequest(method="POST", url=endpoint_url, data=body, headers={
+        "Content-Type": CONTENT_TYPE,
+        "X-Amz-Target": TARGET_PREFIX + operation_name,
+    })
+    SigV4Auth(credentials, SERVICE_NAME, region_name).add_auth(request)
+    return request
+
+
+def parse_error(status, headers, body):
+    """Build a boto3-style error response from an awsJson 1.0 error body."""
+    try:
+        details = json.loads(body) if body else {}
+    except ValueError:
+        details = {}
+    code = details.get("__type") or headers.get("x-amzn-ErrorType") or f"HTTP{status}"
+    code = code.split("#")[-1].split(":")[0]
+    message = details.get("message") or details.get("Message") or (body.decode("utf-8", "replace") if body else "")
+    return {
+        "Error": {"Code": code, "Message": message},
+        "ResponseMetadata": {"HTTPStatusCode": status, "RequestId": headers.get("x-amzn-RequestId")},
+    }
+
+
+class RawPartnerCentralClient:
+    """
+    Drop-in for the read calls of a boto3 partnercentral-selling client that skips response parsing:
+
+        client = RawPartnerCentralClient(concurrency=8)
+        opportunity = client.get_opportunity(Catalog="AWS", Identifier="O1234567")
+        body = client.get_opportunity(Catalog="AWS", Identifier="O1234567", raw=True)
+
+    Responses have no ResponseMetadata. The client is safe to share across threads; the
+    connection pool and timeouts follow utils.client_config, sized for `concurrency` threads.
+    """
+
+    def __init__(self, region_name=DEFAULT_REGION, endpoint_url=None, concurrency=None, retry_policy=None,
+                 credentials=None):
+        self.region_name = region_name
+        self.endpoint_url = (endpoint_url or endpoint_for(region_name)).rstrip("/") + "/"
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._credentials = credentials or botocore.session.get_session().get_credentials()
+        if self._credentials is None:
+            raise RuntimeError("No AWS credentials found")
+        config = build_config(concurrency)
+        socket_options = list(HTTPConnection.default_socket_options)
+        if config.tcp_keepalive:
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        self._http = URLLib3Session(max_pool_connections=config.max_pool_connections,
+                                    timeout=(config.connect_timeout, config.read_timeout),
+                                    socket_options=socket_options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._http.close()
+
+    def _send(self, operation_name, body):
+        request = sign_request(self._credentials.get_frozen_credentials(), self.region_name,
+                               self.endpoint_url, operation_name, body)
+        response = self._http.send(request.prepare())
+        if response.status_code == 200:
+            return response.content
+        raise ClientError(parse_error(response.status_code, response.headers, response.content), operation_name)
+
+    def call(self, operation_name, raw=False, **params):
+        """
+        Call an operation by its API name, retrying throttling, transient and connection errors;
+        writes without a ClientToken are only retried after throttling.
+        Returns the response bytes with raw=True, the decoded response otherwise.
+        """
+        content = self.retry_policy.call(operation_name, self._send, operation_name, dumps(params),
+                                         idempotent=is_idempotent(operation_name, "ClientToken" in params))
+        return content if raw else loads(content)
+
+    def paginate(self, operation_name, **params):
+        """Generator over the items of every page of a paginated operation."""
+        result_key = PAGINATED_OPERATIONS[operation_name]
+        while True:
+            page = self.call(operation_name, **params)
+            yield from page.get(result_key, [])
+            if not page.get("NextToken"):
+                return
+            params = dict(params, NextToken=page["NextToken"])
+
+    def list_opportunities(self, raw=False, **params):
+        return self.call("ListOpportunities", raw, **params)
+
+    def get_opportunity(self, raw=False, **params):
+        return self.call("GetOpportunity", raw, **params)
+
+    def get_aws_opportunity_summary(self, raw=False, **params):
+        return self.call("GetAwsOpportunitySummary", raw, **params)
+
+    def get_engagement(self, raw=False, **params):
+        return self.call("GetEngagement", raw, **params)
@@ -0,0 +1,145 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Buffered, thread-safe JSONL result sink for the bulk tools: one record per input file with
+its opportunity ID, outcome, per-stage timings and error code. Run this module with a results
+file to print failures grouped by error code.
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_FLUSH_RECORDS = 100
+DEFAULT_FLUSH_SECONDS = 1.0
+MAX_EXAMPLES = 5
+
+
+def new_run_id():
+    return datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+
+class ResultSink:
+    """
+    Appends result records to a JSONL file through one open handle.
+    Records are buffered and written in batches of `flush_records`, or when the oldest
+    buffered record is older than `flush_seconds`; close() writes whatever is left.
+    Every record carries the sink's run ID so several runs can share one file; worker processes
+    of one run pass the parent's run ID.
+    """
+
+    def __init__(self, path, flush_records=DEFAULT_FLUSH_RECORDS, flush_seconds=DEFAULT_FLUSH_SECONDS, run_id=None):
+        self.path = path
+        self.run_id = run_id or new_run_id()
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self._file = open(path, 'a', encoding='utf-8')
+        self._buffer = []
+        self._buffered_since = None
+        self._lock = threading.Lock()
+
+    def record(self, source, status, opportunity_id=None, error=None, timings=None):
+        """
+        Record the outcome of one input. `error` is a botocore error response
+        ({"Error": {"Code", "Message"}}); `timings` maps stage names to seconds.
+        """
+        error_details = (error or {}).get("Error", {})
+        entry = {
+            "run_id": self.run_id,
+            "timestamp": datetime.now().isoformat(),
+            "file": source,
+            "opportunity_id": opportunity_id,
+            "status": status,
+            "error_code": error_details.get("Code"),
+            "error_message": error_details.get("Message"),
+            "timings": {stage: round(seconds, 4) for stage, seconds in (timings or {}).items()},
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if not self._buffer:
+                self._buffered_since = time.monotonic()
+            self._buffer.append(line)
+            if (len(self._buffer) >= self.flush_records
+                    or time.monotonic() - self._buffered_since >= self.flush_seconds):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_results(path):
+    """Yield the records of a results file one at a time."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def summarize_results(path, run_id=None):
+    """
+    Aggregate a results file, or only the records of one run.
+    Returns {"total", "by_status", "failures_by_error_code"} where each error code maps to
+    {"count", "statuses", "examples"} with up to MAX_EXAMPLES failing files.
+    """
+    by_status = Counter()
+    failures = {}
+    total = 0
+    for entry in read_results(path):
+        if run_id and entry.get("run_id") != run_id:
+            continue
+        total += 1
+        by_status[entry["status"]] += 1
+        if not entry.get("error_code"):
+            continue
+        failure = failures.setdefault(entry["error_code"], {"count": 0, "statuses": Counter(), "examples": []})
+        failure["count"] += 1
+        failure["statuses"][entry["status"]] += 1
+        if len(failure["examples"]) < MAX_EXAMPLES:
+            failure["examples"].append({"file": entry["file"], "error_message": entry.get("error_message")})
+    ordered = dict(sorted(failures.items(), key=lambda item: item[1]["count"], reverse=True))
+    return {"total": total, "by_status": dict(by_status), "failures_by_error_code": ordered}
+
+
+def print_summary(summary):
+    print(f"Total records: {summary['total']}")
+    for status, count in sorted(summary["by_status"].items()):
+        print(f"  {status:<15} {count}")
+    if summary["failures_by_error_code"]:
+        print("Failures by error code:")
+    for code, failure in summary["failures_by_error_code"].items():
+        statuses = ", ".join(f"{status}={count}" for status, count in failure["statuses"].items())
+        print(f"  {code}: {failure['count']} ({statuses})")
+        for example in failure["examples"]:
+            print(f"    - {example['file']}: {example['error_message']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a bulk results JSONL file by error code.")
+    parser.add_argument("path", help="Results file written by a bulk tool")
+    parser.add_argument("--run-id", help="Only summarize the records of this run")
+    args = parser.parse_args()
+    print_summary(summarize_results(args.path, args.run_id))
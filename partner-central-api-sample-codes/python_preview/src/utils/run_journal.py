@@ -0,0 +1,105 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+SQLite run journal for bulk tools. It maps the content hash of every input payload to the
+opportunity created from it and its submit status, so reruns skip finished work. ClientTokens
+derived from the same hash make retried API calls idempotent. The journal is in WAL mode, so the
+worker processes of a --processes run share one journal file.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+CREATED = "CREATED"
+SUBMITTED = "SUBMITTED"
+# Seconds a write waits for another process that holds the journal's write lock
+BUSY_TIMEOUT = 30
+
+
+def content_hash(request):
+    """Hash a request payload; the ClientToken is left out because it is derived from this hash."""
+    content = {key: value for key, value in request.items() if key != "ClientToken"}
+    serialized = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def derive_client_token(operation, key):
+    """Deterministic ClientToken (64 characters) for an operation on a content hash or opportunity ID."""
+    return hashlib.sha256(f"{operation}:{key}".encode('utf-8')).hexdigest()
+
+
+class RunJournal:
+    """Thread-safe journal backed by a single SQLite connection; several processes may open the same file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " content_hash TEXT PRIMARY KEY,"
+                " source TEXT,"
+                " opportunity_id TEXT,"
+                " status TEXT,"
+                " error_code TEXT,"
+                " updated_at TEXT)"
+            )
+
+    def get(self, content_hash):
+        """Return {"source", "opportunity_id", "status", "error_code"} for a content hash, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT source, opportunity_id, status, error_code FROM entries WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"source": row[0], "opportunity_id": row[1], "status": row[2], "error_code": row[3]}
+
+    def record_created(self, content_hash, source, opportunity_id):
+        self._upsert(content_hash, source, opportunity_id, CREATED, None)
+
+    def record_submitted(self, content_hash, source, opportunity_id):
+        self._upsert(content_hash, source, opportunity_id, SUBMITTED, None)
+
+    def record_error(self, content_hash, source, error_code):
+        """Keep the error of the last attempt without losing an opportunity ID that was already created."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO entries (content_hash, source, error_code, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(content_hash) DO UPDATE SET source = excluded.source,"
+                " error_code = excluded.error_code, updated_at = excluded.updated_at",
+                (content_hash, source, error_code, _now())
+            )
+
+    def _upsert(self, content_hash, source, opportunity_id, status, error_code):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO entries (content_hash, source, opportunity_id, status, error_code, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(content_hash) DO UPDATE SET source = excluded.source,"
+                " opportunity_id = excluded.opportunity_id, status = excluded.status,"
+                " error_code = excluded.error_code, updated_at = excluded.updated_at",
+                (content_hash, source, opportunity_id, status, error_code, _now())
+            )
+
+    def counts(self):
+        """Number of journal entries per status (None for entries that only have an error)."""
+        with self._lock:
+            return dict(self._connection.execute("SELECT status, COUNT(*) FROM entries GROUP BY status").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
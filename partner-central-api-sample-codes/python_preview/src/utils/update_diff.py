@@ -0,0 +1,125 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+No-op detection for bulk updates. The current opportunities of a batch are fetched concurrently
+with GetOpportunity and compared field by field with the desired update payloads, so unchanged
+records can be skipped and a dry run can report exactly what an update would change. UpdateOpportunity
+replaces the whole opportunity, so a field the payload leaves out counts as a change too.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from botocore.client import ClientError
+import utils.helpers as helper
+from utils.constants import CATALOG_TO_USE
+from utils.verification import diff_fields
+
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 100
+
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+UNKNOWN = "unknown"
+
+# Request fields that GetOpportunity does not echo back
+REQUEST_ONLY_FIELDS = {"ClientToken", "Catalog", "Identifier"}
+# GetOpportunity fields that an UpdateOpportunity payload does not carry, as dotted paths
+RESPONSE_ONLY_FIELDS = {"ResponseMetadata", "Id", "Arn", "CreatedDate", "LastModifiedDate", "OpportunityTeam",
+                        "RelatedEntityIdentifiers", "LifeCycle.ReviewStatus", "LifeCycle.ReviewStatusReason",
+                        "LifeCycle.ReviewComments"}
+
+
+def fetch_opportunities(partner_central_client, identifiers, concurrency=DEFAULT_FETCH_CONCURRENCY, rate_limiter=None):
+    """Fetch opportunities concurrently. Returns {identifier: (opportunity, error)}."""
+    def fetch(identifier):
+        try:
+            if rate_limiter:
+                rate_limiter.acquire("GetOpportunity")
+            return identifier, (partner_central_client.get_opportunity(Identifier=identifier, Catalog=CATALOG_TO_USE), None)
+        except ClientError as err:
+            return identifier, (None, err.response)
+
+    unique = list(dict.fromkeys(identifiers))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique))) as executor:
+        return dict(executor.map(fetch, unique))
+
+
+def _timestamp(value):
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return value
+
+
+def missing_fields(desired, current, path=""):
+    """Fields of `current` that `desired` leaves out, as (path, current value) pairs, skipping response-only fields."""
+    if isinstance(current, list) and isinstance(desired, list) and len(current) == len(desired):
+        return [missing for index, (desired_item, current_item) in enumerate(zip(desired, current))
+                for missing in missing_fields(desired_item, current_item, f"{path}[{index}]")]
+    if not isinstance(current, dict) or not isinstance(desired, dict):
+        return []
+    missing = []
+    for key, value in current.items():
+        child_path = f"{path}.{key}" if path else key
+        if child_path in RESPONSE_ONLY_FIELDS or (not path and key in REQUEST_ONLY_FIELDS):
+            continue
+        if key in desired:
+            missing.extend(missing_fields(desired[key], value, child_path))
+        else:
+            missing.append((child_path, value))
+    return missing
+
+
+def diff_update(desired, current):
+    """
+    Return the changes an update would make as (path, current, desired) tuples.
+    Both sides are normalized with remove_nulls and the request-only fields (ClientToken, Catalog, Identifier)
+    are ignored. Fields of the current opportunity that the payload leaves out are reported with a desired
+    value of None, since the update clears them. A LastModifiedDate that differs from the current one is
+    reported as well: the update is then stale, and sending it lets the API reject the conflict.
+    """
+    desired, current = helper.remove_nulls(desired), helper.remove_nulls(current)
+    changes = [(path, actual, expected) for path, expected, actual
+               in diff_fields(desired, current, ignored=REQUEST_ONLY_FIELDS | {"LastModifiedDate"})]
+    if "LastModifiedDate" in desired and _timestamp(desired["LastModifiedDate"]) != _timestamp(current.get("LastModifiedDate")):
+        changes.append(("LastModifiedDate", current.get("LastModifiedDate"), desired["LastModifiedDate"]))
+    changes.extend((path, value, None) for path, value in missing_fields(desired, current))
+    return changes
+
+
+def plan_updates(partner_central_client, batch, concurrency=DEFAULT_FETCH_CONCURRENCY, rate_limiter=None):
+    """
+    Diff a batch of (source, request) pairs against the current opportunities.
+    Yields (source, request, status, changes, error) in input order. The status is UNKNOWN when the
+    opportunity could not be read; the update should then be sent so the API reports the real error.
+    """
+    current = fetch_opportunities(partner_central_client, [request.get("Identifier") for _, request in batch
+                                                           if request.get("Identifier")], concurrency, rate_limiter)
+    for source, request in batch:
+        opportunity, error = current.get(request.get("Identifier"), (None, None))
+        if opportunity is None:
+            yield source, request, UNKNOWN, None, error
+            continue
+        changes = diff_update(request, opportunity)
+        yield source, request, CHANGED if changes else UNCHANGED, changes, None
+
+
+def print_diff(source, request, status, changes, error):
+    identifier = request.get("Identifier")
+    if status == UNCHANGED:
+        print(f"= {identifier} ({source}): no changes")
+    elif status == UNKNOWN:
+        code = (error or {}).get("Error", {}).get("Code", "missing Identifier")
+        print(f"? {identifier} ({source}): could not read current opportunity ({code})")
+    else:
+        print(f"~ {identifier} ({source}): {len(changes)} field(s) changed")
+        for path, current, desired in changes:
+            print(f"    {path}: {current!r} -> {desired!r}")
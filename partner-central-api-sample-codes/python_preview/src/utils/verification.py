@@ -0,0 +1,142 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Purpose:
+
+Read-after-write verification for the bulk tools. Every write can be checked with a GetOpportunity
+call right away (inline), all at once at the end of the run (deferred), or not at all (off).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+import threading
+
+from botocore.client import ClientError
+from utils.constants import CATALOG_TO_USE
+
+VERIFY_OFF = "off"
+VERIFY_INLINE = "inline"
+VERIFY_DEFERRED = "deferred"
+VERIFICATION_POLICIES = (VERIFY_OFF, VERIFY_INLINE, VERIFY_DEFERRED)
+DEFAULT_VERIFICATION = VERIFY_OFF
+DEFAULT_VERIFY_CONCURRENCY = 8
+
+# Request fields that are not echoed back by GetOpportunity
+IGNORED_FIELDS = {"ClientToken", "Catalog", "Identifier", "LastModifiedDate"}
+
+
+def _normalize(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def diff_fields(expected, actual, path="", ignored=IGNORED_FIELDS):
+    """
+    Compare the fields of `expected` with the same fields of `actual`, skipping the top-level `ignored` fields.
+    Fields only present in `actual` are ignored. Returns a list of (path, expected, actual) tuples.
+    """
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return [(path, expected, actual)]
+        mismatches = []
+        for key, value in expected.items():
+            if not path and key in ignored:
+                continue
+            child_path = f"{path}.{key}" if path else key
+            mismatches.extend(diff_fields(value, actual.get(key), child_path, ignored))
+        return mismatches
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(expected) != len(actual):
+            return [(path, expected, actual)]
+        mismatches = []
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            mismatches.extend(diff_fields(expected_item, actual_item, f"{path}[{index}]", ignored))
+        return mismatches
+    if _normalize(expected) != _normalize(actual):
+        return [(path, expected, actual)]
+    return []
+
+
+def verify_opportunity(partner_central_client, opportunity_id, expected, rate_limiter=None):
+    """Read an opportunity back and diff it against what was written. Returns (mismatches, error)."""
+    try:
+        if rate_limiter:
+            rate_limiter.acquire("GetOpportunity")
+        response = partner_central_client.get_opportunity(Identifier=opportunity_id, Catalog=CATALOG_TO_USE)
+    except ClientError as err:
+        return None, err.response
+    return diff_fields(expected, response), None
+
+
+class Verifier:
+    """
+    Applies a verification policy to the writes of a run.
+    Call written() after each successful write and finish() once at the end; failures are returned by finish().
+    """
+
+    def __init__(self, partner_central_client, policy=DEFAULT_VERIFICATION, rate_limiter=None,
+                 concurrency=DEFAULT_VERIFY_CONCURRENCY):
+        if policy not in VERIFICATION_POLICIES:
+            raise ValueError(f"Unknown verification policy: {policy}")
+        self.partner_central_client = partner_central_client
+        self.policy = policy
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.verified = 0
+        self._pending = []
+        self._failures = []
+        self._lock = threading.Lock()
+
+    def written(self, opportunity_id, expected, source=None):
+        if self.policy == VERIFY_OFF:
+            return
+        if self.policy == VERIFY_DEFERRED:
+            with self._lock:
+                self._pending.append((opportunity_id, expected, source))
+            return
+        failure = self._verify(opportunity_id, expected, source)
+        if failure:
+            print_failure(failure)
+
+    def finish(self):
+        """Verify all deferred writes concurrently and return every failure of the run."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            print(f"Verifying {len(pending)} written opportunities...")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                list(executor.map(lambda entry: self._verify(*entry), pending))
+        return list(self._failures)
+
+    def _verify(self, opportunity_id, expected, source):
+        mismatches, error = verify_opportunity(self.partner_central_client, opportunity_id, expected, self.rate_limiter)
+        failure = None
+        if error or mismatches:
+            failure = {"source": source, "opportunity_id": opportunity_id, "mismatches": mismatches, "error": error}
+        with self._lock:
+            self.verified += 1
+            if failure:
+                self._failures.append(failure)
+        return failure
+
+
+def print_failure(failure):
+    print(f"✗ Verification failed for {failure['opportunity_id']} ({failure['source']})")
+    if failure["error"]:
+        print(f"    GetOpportunity error: {failure['error'].get('Error', {}).get('Code')}")
+    for path, expected, actual in failure["mismatches"] or []:
+        print(f"    {path}: expected {expected!r}, got {actual!r}")
+
+
+def print_report(verifier, failures):
+    """Print the outcome of a run's verification."""
+    if verifier.policy == VERIFY_OFF:
+        return
+    print(f"Verified:            {verifier.verified} ({len(failures)} mismatched or unreadable)")
+    if verifier.policy == VERIFY_DEFERRED:
+        for failure in failures:
+            print_failure(failure)
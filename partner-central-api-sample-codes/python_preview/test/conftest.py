@@ -0,0 +1,72 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+# The bulk tools import their helpers as the top-level `utils` package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+class FakePartnerCentralClient:
+    """
+    Stands in for a boto3 partnercentral-selling client: opportunities are kept in memory, a repeated
+    CreateOpportunity ClientToken returns the same opportunity, and `fail` maps an operation name to
+    a function of the request that returns the exception to raise, or None.
+    """
+
+    def __init__(self, fail=None):
+        self.fail = fail or {}
+        self.calls = Counter()
+        self.opportunities = {}
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def _call(self, operation, request):
+        with self._lock:
+            self.calls[operation] += 1
+        error = self.fail[operation](request) if operation in self.fail else None
+        if error:
+            raise error
+
+    def create_opportunity(self, **request):
+        self._call("CreateOpportunity", request)
+        with self._lock:
+            identifier = self._tokens.get(request.get("ClientToken"))
+            if identifier is None:
+                identifier = f"O{len(self.opportunities) + 1:07d}"
+                self._tokens[request.get("ClientToken")] = identifier
+                self.opportunities[identifier] = request
+        return {"Id": identifier}
+
+    def update_opportunity(self, **request):
+        self._call("UpdateOpportunity", request)
+        with self._lock:
+            self.opportunities[request["Identifier"]] = request
+        return {"Id": request["Identifier"]}
+
+    def get_opportunity(self, Catalog, Identifier):
+        self._call("GetOpportunity", {"Catalog": Catalog, "Identifier": Identifier})
+        return dict(self.opportunities[Identifier], Id=Identifier)
+
+    def start_engagement_from_opportunity_task(self, **request):
+        self._call("StartEngagementFromOpportunityTask", request)
+        return {"TaskId": f"task-{request['Identifier']}", "OpportunityId": request["Identifier"]}
+
+@pytest.fixture
+def fake_client():
+    return FakePartnerCentralClient()
+
+@pytest.fixture
+def write_ndjson():
+    """Write records to an NDJSON bulk input file and return its path."""
+    def write(path, records):
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+        return str(path)
+    return write
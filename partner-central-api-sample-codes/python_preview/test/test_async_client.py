@@ -0,0 +1,70 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+
+import pytest
+from botocore.client import ClientError
+from botocore.credentials import Credentials
+
+from utils.async_client import AsyncPartnerCentralClient
+from utils.retry import RetryBudget, RetryPolicy
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+def run_against(responses, scenario):
+    """Serve the (status, body) `responses` in order, run scenario(client) and return (result, requests)."""
+    requests = []
+
+    async def handle(request):
+        requests.append((request.headers["X-Amz-Target"], json.loads(await request.read())))
+        status, body = responses.pop(0)
+        return web.json_response(body, status=status)
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/", handle)
+        async with test_utils.TestServer(app) as server:
+            async with AsyncPartnerCentralClient(endpoint_url=str(server.make_url("/")), concurrency=4,
+                                                 retry_policy=RetryPolicy(base_delay=0, budget=RetryBudget(None)),
+                                                 credentials=Credentials("testing", "testing")) as client:
+                return await scenario(client)
+
+    return asyncio.run(main()), requests
+
+def test_concurrent_calls_decode_responses():
+    async def scenario(client):
+        return await asyncio.gather(*(client.get_opportunity(Catalog="Sandbox", Identifier=f"O{i}") for i in range(3)))
+
+    results, requests = run_against([(200, {"Id": "O"})] * 3, scenario)
+
+    assert results == [{"Id": "O"}] * 3
+    assert sorted(body["Identifier"] for _, body in requests) == ["O0", "O1", "O2"]
+
+def test_reads_are_retried_and_writes_without_client_token_are_not():
+    async def scenario(client):
+        opportunity = await client.get_opportunity(Catalog="Sandbox", Identifier="O1")
+        with pytest.raises(ClientError) as error:
+            await client.call("AssociateOpportunity", Catalog="Sandbox", OpportunityIdentifier="O1")
+        return opportunity, error.value.response["Error"]["Code"]
+
+    responses = [(503, {"__type": "ServiceUnavailableException"}), (200, {"Id": "O1"}),
+                 (500, {"__type": "InternalServerException"})]
+    (opportunity, code), requests = run_against(responses, scenario)
+
+    assert opportunity == {"Id": "O1"} and code == "InternalServerException"
+    assert [target for target, _ in requests] == ["AWSPartnerCentralSelling.GetOpportunity"] * 2 + \
+        ["AWSPartnerCentralSelling.AssociateOpportunity"]
+
+def test_paginate_follows_next_token():
+    async def scenario(client):
+        return [summary["Id"] async for summary in client.paginate("ListOpportunities", Catalog="Sandbox")]
+
+    responses = [(200, {"OpportunitySummaries": [{"Id": "O1"}], "NextToken": "t1"}),
+                 (200, {"OpportunitySummaries": [{"Id": "O2"}]})]
+    identifiers, requests = run_against(responses, scenario)
+
+    assert identifiers == ["O1", "O2"]
+    assert requests[1][1]["NextToken"] == "t1"
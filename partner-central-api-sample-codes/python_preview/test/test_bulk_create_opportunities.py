@@ -0,0 +1,49 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+
+import pytest
+
+import src.bulk_create_opportunities.bulk_create_opportunities as bulk_create
+from utils.bulk_input import Shard
+from utils.bulk_runner import collect_records, process_shard
+from utils.payload_validator import OPERATION_CREATE
+from utils.run_journal import RunJournal
+
+def opportunity(i):
+    return {"Catalog": "Sandbox", "Origin": "Partner Referral", "Project": {"Title": f"Project {i}"}}
+
+@pytest.fixture
+def args(tmp_path, write_ndjson):
+    return argparse.Namespace(input=write_ndjson(tmp_path / "in.ndjson", [opportunity(i) for i in range(4)]),
+                              verify="deferred", skip_validation=True, journal=str(tmp_path / "journal.db"))
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(bulk_create.time, "sleep", lambda seconds: None)
+
+def test_process_shard_reports_deferred_verifications(args, fake_client, monkeypatch):
+    monkeypatch.setattr(bulk_create, "get_boto3_client", lambda *args, **kwargs: fake_client)
+
+    results = [process_shard(Shard(index, 2), None, bulk_create.create_shard, bulk_create.new_counts, args) for index in range(2)]
+
+    assert sum(result["counts"]["created"] for result in results) == 4
+    assert sum(result["verified"] for result in results) == 4
+    assert fake_client.calls["GetOpportunity"] == 4
+    assert all(result["verification_failures"] == [] for result in results)
+
+def test_reruns_skip_records_in_the_journal(args, fake_client, monkeypatch):
+    monkeypatch.setattr(bulk_create, "get_boto3_client", lambda *args, **kwargs: fake_client)
+    args.verify = "off"
+    for index in range(2):
+        process_shard(Shard(index, 2), None, bulk_create.create_shard, bulk_create.new_counts, args)
+
+    counts = bulk_create.new_counts()
+    records, validator = collect_records(args.input, OPERATION_CREATE, skip_validation=True)
+    journal = RunJournal(args.journal)
+    bulk_create.create_records(fake_client, records, counts, journal)
+    journal.close()
+
+    assert counts == {"created": 0, "failed": 0, "skipped": 4}
+    assert fake_client.calls["CreateOpportunity"] == 4
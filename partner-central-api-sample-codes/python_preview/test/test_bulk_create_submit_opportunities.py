@@ -0,0 +1,84 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import multiprocessing
+import sys
+
+import pytest
+from botocore.exceptions import EndpointConnectionError, ReadTimeoutError
+
+import src.bulk_create_opportunities.bulk_create_submit_opportunities as bulk_submit
+import utils.bulk_runner as bulk_runner
+from utils.bulk_input import Shard
+from utils.result_sink import ResultSink
+from utils.run_journal import RunJournal, SUBMITTED
+
+RECORDS = 6
+
+def opportunity(i):
+    return {"Catalog": "Sandbox", "Origin": "Partner Referral", "Project": {"Title": f"Project {i}"}}
+
+@pytest.fixture
+def args(tmp_path, write_ndjson, monkeypatch):
+    input_path = write_ndjson(tmp_path / "in.ndjson", [opportunity(i) for i in range(RECORDS)])
+    monkeypatch.setattr(sys, "argv", ["bulk_create_submit_opportunities.py", "--input", input_path,
+                                      "--journal", str(tmp_path / "journal.db"), "--results", str(tmp_path / "results.jsonl"),
+                                      "--default-rate", "1000", "--skip-validation", "--workers", "2"])
+    return bulk_submit.parse_arguments()
+
+@pytest.fixture
+def client(fake_client, monkeypatch):
+    monkeypatch.setattr(bulk_submit, "get_boto3_client", lambda *args, **kwargs: fake_client)
+    return fake_client
+
+def run_single_process(args):
+    counts = bulk_submit.new_counts()
+    sink = ResultSink(args.results)
+    records, validator = bulk_submit.collect_records(args, counts, sink)
+    bulk_submit.run_pipeline(args, records, counts, RunJournal(args.journal), sink, validator)
+    return counts
+
+def run_shard(shard, args, run_id):
+    return bulk_runner.process_shard(shard, None, bulk_submit.run_shard, bulk_submit.new_counts, args, run_id)
+
+def read_results(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+def test_shards_share_the_journal_across_process_counts(args, client):
+    first_run = [run_shard(Shard(index, 2), args, "run-1") for index in range(2)]
+    assert sum(result["counts"]["success"] for result in first_run) == RECORDS
+
+    rerun = [run_shard(Shard(index, 3), args, "run-2") for index in range(3)]
+    assert sum(result["counts"]["skipped"] for result in rerun) == RECORDS
+
+    assert run_single_process(args)["skipped"] == RECORDS
+    assert client.calls["CreateOpportunity"] == RECORDS
+    assert client.calls["StartEngagementFromOpportunityTask"] == RECORDS
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers inherit the fake client by forking")
+def test_worker_processes_write_one_journal(args, client, capsys):
+    args.processes = 3
+    bulk_submit.run_processes(args)
+
+    journal = RunJournal(args.journal)
+    assert journal.counts() == {SUBMITTED: RECORDS}
+    journal.close()
+    assert len(read_results(args.results)) == RECORDS
+    assert run_single_process(args)["skipped"] == RECORDS
+
+def test_unexpected_errors_still_give_every_record_one_result(args, client):
+    client.fail["CreateOpportunity"] = lambda request: (
+        EndpointConnectionError(endpoint_url="https://partnercentral-selling.us-east-1.api.aws")
+        if request["Project"]["Title"] == "Project 0" else None)
+    client.fail["StartEngagementFromOpportunityTask"] = lambda request: (
+        ReadTimeoutError(endpoint_url="https://partnercentral-selling.us-east-1.api.aws")
+        if request["Identifier"] == "O0000001" else None)
+
+    counts = run_single_process(args)
+
+    assert counts["create_failed"] == 1 and counts["submit_failed"] == 1 and counts["success"] == RECORDS - 2
+    results = read_results(args.results)
+    assert len(results) == RECORDS
+    assert {result["error_code"] for result in results} == {None, "EndpointConnectionError", "ReadTimeoutError"}
@@ -0,0 +1,46 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import pytest
+
+from utils.bulk_input import InputRecord, Shard, iter_records, load_request, parse_flat_key, unflatten_record
+
+def test_unflatten_record_rebuilds_nested_payloads():
+    assert parse_flat_key("Project.ExpectedCustomerSpend[0].Amount") == ["Project", "ExpectedCustomerSpend", 0, "Amount"]
+    flat = {"Catalog": "Sandbox", "Project.ExpectedCustomerSpend[0].Amount": "10", "Project.DeliveryModels[1]": "SaaS",
+            "Project.DeliveryModels[0]": "BYOL", "Project.Title": ""}
+    assert unflatten_record(flat) == {"Catalog": "Sandbox", "Project": {"ExpectedCustomerSpend": [{"Amount": "10"}],
+                                                                       "DeliveryModels": ["BYOL", "SaaS"]}}
+
+def test_shards_split_the_input_without_overlap(tmp_path, write_ndjson):
+    path = write_ndjson(tmp_path / "input.ndjson", [{"Project": {"Title": str(i)}} for i in range(20)])
+
+    shards = [[record.source for record in iter_records(path, Shard(index, 3))] for index in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(record.source for record in iter_records(path))
+    assert len(set(sum(shards, []))) == 20
+    assert shards == [[record.source for record in iter_records(path, Shard(index, 3))] for index in range(3)]
+
+def test_iter_records_reads_directories_ndjson_and_csv(tmp_path):
+    directory = tmp_path / "payloads"
+    directory.mkdir()
+    (directory / "b.json").write_text(json.dumps({"Catalog": "Sandbox", "Project": {"Title": "b", "Other": None}}))
+    (directory / "a.json").write_text("not json")
+    (directory / "notes.txt").write_text("ignored")
+    ndjson = tmp_path / "input.jsonl"
+    ndjson.write_text('{"Catalog": "Sandbox"}\n\n{broken\n')
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_text("Catalog,Project.Title\nSandbox,c\n")
+
+    directory_requests = [load_request(record) for record in iter_records(str(directory))]
+    assert directory_requests[0][1]["Error"]["Code"] == "InvalidInputFile"
+    assert directory_requests[1] == ({"Catalog": "Sandbox", "Project": {"Title": "b"}}, None)
+    ndjson_records = list(iter_records(str(ndjson)))
+    assert [record.source for record in ndjson_records] == [f"{ndjson}:1", f"{ndjson}:3"]
+    assert load_request(ndjson_records[1])[1]["Error"]["Code"] == "InvalidInputFile"
+    assert [record.request for record in iter_records(str(csv_file))] == [{"Catalog": "Sandbox", "Project": {"Title": "c"}}]
+    assert load_request(InputRecord("x", ["not", "an", "object"]))[1]["Error"]["Message"] == "Expected a JSON object"
+    with pytest.raises(ValueError):
+        iter_records(str(tmp_path / "input.xml"))
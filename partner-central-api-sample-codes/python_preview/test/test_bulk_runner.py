@@ -0,0 +1,66 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import queue
+
+import utils.bulk_runner as bulk_runner
+from utils.bulk_input import Shard
+from utils.payload_validator import OPERATION_CREATE, PayloadValidator
+from utils.verification import Verifier
+
+def test_directory_input_is_validated_upfront(tmp_path, monkeypatch):
+    for name in ("a.json", "b.json", "c.json"):
+        (tmp_path / name).write_text(json.dumps({"Project": {"Title": name}}))
+    (tmp_path / "notes.txt").write_text("ignored")
+    validated = []
+
+    def validate_files(file_paths, operation, workers):
+        validated.append((sorted(file_paths), operation, workers))
+        return {str(tmp_path / "b.json"): ["Project.Title: bad"]}
+
+    monkeypatch.setattr(bulk_runner.payload_validator, "validate_files", validate_files)
+    rejected = []
+
+    records, validator = bulk_runner.collect_records(str(tmp_path), OPERATION_CREATE, validation_workers=4,
+                                                     on_rejected=lambda path, errors: rejected.append(path))
+
+    assert [record.source for record in records] == [str(tmp_path / "a.json"), str(tmp_path / "c.json")]
+    assert validator is None and rejected == [str(tmp_path / "b.json")]
+    assert validated[0][0] == [str(tmp_path / name) for name in ("a.json", "b.json", "c.json")]
+    assert validated[0][1:] == (OPERATION_CREATE, 4)
+
+    bulk_runner.collect_records(str(tmp_path), OPERATION_CREATE, shard=Shard(0, 1), validation_workers=4)
+    assert validated[1][2] == 1
+
+def test_stream_input_is_read_lazily_with_a_validator(tmp_path, write_ndjson):
+    path = write_ndjson(tmp_path / "in.ndjson", [{"Project": {"Title": str(i)}} for i in range(3)])
+
+    records, validator = bulk_runner.collect_records(path, OPERATION_CREATE)
+
+    assert not isinstance(records, list)
+    assert isinstance(validator, PayloadValidator)
+    assert [record.request["Project"]["Title"] for record in records] == ["0", "1", "2"]
+    assert bulk_runner.collect_records(path, OPERATION_CREATE, skip_validation=True)[1] is None
+
+class DeferredVerifier(Verifier):
+    """Counts its deferred writes as verified in finish(), as a real deferred run would."""
+
+    def finish(self):
+        self.verified += len(self._pending)
+        self._pending = []
+        return []
+
+def count_shard(shard, counts, label):
+    counts["seen"] += shard.index + 1
+    verifier = DeferredVerifier(None, "deferred")
+    verifier.written("O1", {}, label)
+    return verifier, {"label": label}
+
+def test_process_shard_reports_counts_and_reads_verified_after_finish():
+    progress = queue.Queue()
+
+    result = bulk_runner.process_shard(Shard(1, 2), progress, count_shard, lambda: {"seen": 0}, "shard-1")
+
+    assert result == {"label": "shard-1", "counts": {"seen": 2}, "verified": 1, "verification_failures": []}
+    assert progress.get_nowait() == (1, {"seen": 2})
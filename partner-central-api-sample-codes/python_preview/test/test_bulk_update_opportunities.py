@@ -0,0 +1,54 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import threading
+from collections import Counter
+
+import src.bulk_update_opportunities.bulk_update_opportunities as bulk_update
+from utils.bulk_input import Shard
+from utils.bulk_runner import collect_records, process_shard
+from utils.payload_validator import OPERATION_UPDATE
+
+def update(i, title):
+    return {"Catalog": "Sandbox", "Identifier": f"O{i:07d}", "Project": {"Title": title}}
+
+def update_args(input_path, **overrides):
+    values = dict(input=input_path, verify="deferred", skip_validation=True, dry_run=False, skip_diff=False,
+                  fetch_workers=2, batch_size=10, default_rate=1000, rate=None)
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+def test_process_shard_reports_deferred_verifications(tmp_path, write_ndjson, fake_client, monkeypatch):
+    args = update_args(write_ndjson(tmp_path / "in.ndjson", [update(i, f"Project {i}") for i in range(4)]), skip_diff=True)
+    monkeypatch.setattr(bulk_update, "get_boto3_client", lambda *args, **kwargs: fake_client)
+
+    results = [process_shard(Shard(index, 2), None, bulk_update.update_shard, bulk_update.new_counts, args) for index in range(2)]
+
+    assert fake_client.calls["UpdateOpportunity"] == 4
+    assert sum(result["verified"] for result in results) == 4
+    assert all(result["verification_failures"] == [] for result in results)
+
+class RecordingRateLimiter:
+    def __init__(self):
+        self.acquired = Counter()
+        self._lock = threading.Lock()
+
+    def acquire(self, operation):
+        with self._lock:
+            self.acquired[operation] += 1
+
+def test_diff_reads_and_updates_take_tokens_from_the_rate_limiter(tmp_path, write_ndjson, fake_client):
+    for i in range(3):
+        fake_client.opportunities[f"O{i:07d}"] = update(i, "Old title")
+    args = update_args(write_ndjson(tmp_path / "in.ndjson", [update(0, "Old title"), update(1, "New"), update(2, "New")]))
+    rate_limiter = RecordingRateLimiter()
+    counts = bulk_update.new_counts()
+
+    records, _ = collect_records(args.input, OPERATION_UPDATE, skip_validation=True)
+
+    bulk_update.update_records(fake_client, records, counts, args, rate_limiter=rate_limiter)
+
+    assert counts == {"changed": 2, "unchanged": 1, "unknown": 0}
+    assert rate_limiter.acquired == {"GetOpportunity": 3, "UpdateOpportunity": 2}
+    assert fake_client.calls["UpdateOpportunity"] == 2
@@ -0,0 +1,286 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import json
+
+import boto3
+from botocore.client import ClientError
+from botocore.exceptions import EndpointConnectionError, ReadTimeoutError
+import pytest
+
+import src.bulk_export.export_opportunities as export
+
+def read_rows(file_path):
+    with open(file_path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def test_save_to_csv_streams_generator_with_union_of_columns(tmp_path):
+    file_path = tmp_path / "opportunities.csv"
+    records = ({"Id": f"O{i}", "LifeCycle": {"Stage": "Prospect"}, "Extra": [i] if i % 2 else []} for i in range(4))
+
+    export.save_to_csv(records, str(file_path))
+
+    rows = read_rows(file_path)
+    assert [row["Id"] for row in rows] == ["O0", "O1", "O2", "O3"]
+    assert list(rows[0].keys()) == ["Extra[0]", "Id", "LifeCycle.Stage"]
+    assert rows[0]["Extra[0]"] == "" and rows[1]["Extra[0]"] == "1"
+
+def test_save_to_csv_without_records_writes_nothing(tmp_path):
+    file_path = tmp_path / "opportunities.csv"
+    export.save_to_csv(iter([]), str(file_path))
+    assert not file_path.exists()
+
+def test_merge_into_csv_replaces_rows_by_key(tmp_path):
+    file_path = tmp_path / "opportunities.csv"
+    export.save_to_csv([{"Id": "O1", "Name": "old"}, {"Id": "O2", "Name": "kept"}], str(file_path))
+
+    export.merge_into_csv([{"Id": "O1", "Name": "new", "Stage": "Qualified"}, {"Id": "O3", "Name": "added"}], str(file_path), "Id")
+
+    rows = {row["Id"]: row for row in read_rows(file_path)}
+    assert set(rows) == {"O1", "O2", "O3"}
+    assert rows["O1"]["Name"] == "new" and rows["O1"]["Stage"] == "Qualified"
+    assert rows["O2"]["Name"] == "kept" and rows["O2"]["Stage"] == ""
+
+def test_save_individual_files_uploads_from_memory(tmp_path, monkeypatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("S3_BUCKET_NAME", "export-bucket")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    records = [{"Id": f"O{i}", "Catalog": "Sandbox"} for i in range(25)]
+
+    with moto.mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="export-bucket")
+
+        export.save_individual_files(records, str(tmp_path / "opportunities"), "", concurrency=4, write_local=False, s3_client=s3_client)
+
+        keys = {item["Key"] for item in s3_client.list_objects_v2(Bucket="export-bucket")["Contents"]}
+        body = s3_client.get_object(Bucket="export-bucket", Key="opportunities/O7.json")["Body"].read()
+
+    assert keys == {f"opportunities/O{i}.json" for i in range(25)}
+    assert json.loads(body) == {"Id": "O7", "Catalog": "Sandbox"}
+    assert not (tmp_path / "opportunities").exists()
+
+def test_save_individual_files_skips_unchanged_records(tmp_path, monkeypatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("S3_BUCKET_NAME", "export-bucket")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    manifest_path = str(tmp_path / "manifest.json")
+    records = [{"Id": "O1", "Title": "a", "ResponseMetadata": {"RequestId": "1"}}, {"Id": "O2", "Title": "b"}]
+
+    with moto.mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="export-bucket")
+        manifest = export.load_manifest(manifest_path, s3_client)
+        export.save_individual_files(records, str(tmp_path), "", write_local=False, s3_client=s3_client, manifest=manifest)
+        export.save_manifest(manifest, manifest_path, s3_client)
+
+        calls = []
+        s3_client.meta.events.register("before-call.s3.PutObject", lambda **kwargs: calls.append(kwargs))
+        (tmp_path / "manifest.json").unlink()
+        manifest = export.load_manifest(manifest_path, s3_client)
+        changed = [{"Id": "O1", "Title": "a", "ResponseMetadata": {"RequestId": "2"}}, {"Id": "O2", "Title": "changed"}]
+        export.save_individual_files(changed, str(tmp_path), "", write_local=False, s3_client=s3_client, manifest=manifest)
+
+    assert len(calls) == 1
+    assert manifest["opportunities/O2.json"] == export.content_hash(changed[1])
+
+def test_needs_aws_summary_plans_only_opportunities_with_an_aws_side():
+    assert export.needs_aws_summary({"Origin": "AWS Referral", "LifeCycle": {"ReviewStatus": "Pending Submission"}})
+    assert export.needs_aws_summary({"Origin": "Partner Referral", "LifeCycle": {"ReviewStatus": "Approved"}})
+    assert not export.needs_aws_summary({"Origin": "Partner Referral", "LifeCycle": {"ReviewStatus": "Pending Submission"}})
+    assert not export.needs_aws_summary({"Id": "O1", "FAILED": "ThrottlingException"})
+
+class FakeDetailsClient:
+    """GetOpportunity and GetAwsOpportunitySummary of AWS referrals; identifiers in `throttled` are throttled."""
+
+    def __init__(self, throttled=()):
+        self.throttled = set(throttled)
+        self.calls = []
+
+    def get_opportunity(self, Catalog, Identifier):
+        self.calls.append(("GetOpportunity", Identifier))
+        if Identifier in self.throttled:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "GetOpportunity")
+        return {"Id": Identifier, "Origin": "AWS Referral", "LastModifiedDate": "2025-01-02T00:00:00+00:00",
+                "LifeCycle": {"Stage": "Prospect"}}
+
+    def get_aws_opportunity_summary(self, Catalog, RelatedOpportunityIdentifier):
+        self.calls.append(("GetAwsOpportunitySummary", RelatedOpportunityIdentifier))
+        return {"RelatedOpportunityId": RelatedOpportunityIdentifier, "Origin": "AWS Referral"}
+
+def summaries(count):
+    return [{"Id": f"O{i}", "LastModifiedDate": f"2025-01-{i + 1:02d}T00:00:00+00:00"} for i in range(count)]
+
+def test_fetch_all_opportunity_details_yields_in_listing_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "details_client", FakeDetailsClient())
+    checkpoint = export.ExportCheckpoint(str(tmp_path / "checkpoint.jsonl"))
+
+    results = export.fetch_all_opportunity_details(summaries(30), concurrency=3, checkpoint=checkpoint)
+
+    assert not isinstance(results, list)
+    assert [details["Id"] for details, _ in results] == [f"O{i}" for i in range(30)]
+    assert [aws["RelatedOpportunityId"] for _, aws in checkpoint.iter_details(["O4", "O2"])] == ["O4", "O2"]
+
+def test_checkpoint_keeps_offsets_and_resume_fetches_only_failed_opportunities(tmp_path, monkeypatch):
+    checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    monkeypatch.setattr(export, "details_client", FakeDetailsClient(throttled={"O1"}))
+    checkpoint = export.ExportCheckpoint(checkpoint_path)
+    checkpoint.record_page(summaries(3), None)
+    first_run = list(export.fetch_all_opportunity_details(summaries(3), concurrency=2, checkpoint=checkpoint))
+    assert first_run[1][0]["FAILED"] == "ThrottlingException"
+    assert checkpoint.fetched == {"O0", "O2"} and set(checkpoint.offsets) == {"O0", "O1", "O2"}
+    # A run that died while writing leaves a cut-short last line
+    with open(checkpoint_path, "ab") as file:
+        file.write(b'{"type": "details", "Id": "O')
+
+    details_client = FakeDetailsClient()
+    monkeypatch.setattr(export, "details_client", details_client)
+    resumed = export.ExportCheckpoint(checkpoint_path, resume=True)
+    second_run = list(export.fetch_all_opportunity_details(resumed.summaries, concurrency=2, checkpoint=resumed))
+
+    assert details_client.calls == [("GetOpportunity", "O1"), ("GetAwsOpportunitySummary", "O1")]
+    assert [details["Id"] for details, _ in second_run] == ["O0", "O1", "O2"]
+    assert "FAILED" not in second_run[1][0]
+    assert resumed.fetched == {"O0", "O1", "O2"}
+    assert [details["Id"] for details, _ in export.ExportCheckpoint(checkpoint_path, resume=True).iter_details(["O1"])] == ["O1"]
+
+class UnreachableDetailsClient(FakeDetailsClient):
+    """Fails the calls for O1 before any service response: GetOpportunity times out, the summary call cannot connect."""
+
+    def get_opportunity(self, Catalog, Identifier):
+        if Identifier == "O1":
+            raise ReadTimeoutError(endpoint_url="https://partnercentral-selling.us-east-1.api.aws")
+        return super().get_opportunity(Catalog, Identifier)
+
+    def get_aws_opportunity_summary(self, Catalog, RelatedOpportunityIdentifier):
+        if RelatedOpportunityIdentifier == "O2":
+            raise EndpointConnectionError(endpoint_url="https://partnercentral-selling.us-east-1.api.aws")
+        return super().get_aws_opportunity_summary(Catalog, RelatedOpportunityIdentifier)
+
+def test_connection_errors_are_recorded_as_failed_and_retried_on_resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "details_client", UnreachableDetailsClient())
+    checkpoint = export.ExportCheckpoint(str(tmp_path / "checkpoint.jsonl"))
+
+    results = list(export.fetch_all_opportunity_details(summaries(3), concurrency=2, checkpoint=checkpoint))
+
+    assert [details["Id"] for details, _ in results] == ["O0", "O1", "O2"]
+    assert results[1][0]["FAILED"] == "ReadTimeoutError"
+    assert results[2][1]["FAILED"] == "EndpointConnectionError"
+    assert checkpoint.incomplete() == {"O1", "O2"}
+
+def test_merge_into_csv_keeps_existing_row_when_the_fetch_failed(tmp_path):
+    file_path = tmp_path / "opportunities.csv"
+    export.save_to_csv([{"Id": "O1", "Name": "good"}], str(file_path))
+
+    export.merge_into_csv(iter([{"Id": "O1", "FAILED": "ThrottlingException"},
+                                {"Id": "O2", "FAILED": "ThrottlingException"}]), str(file_path), "Id")
+
+    rows = {row["Id"]: row for row in read_rows(file_path)}
+    assert rows["O1"]["Name"] == "good" and rows["O1"]["FAILED"] == ""
+    assert rows["O2"]["FAILED"] == "ThrottlingException"
+
+def test_compute_watermark_stops_before_the_first_incomplete_opportunity():
+    opportunities = summaries(4)
+
+    assert export.compute_watermark(opportunities, {"O2"}, None) == "2025-01-02T00:00:00+00:00"
+    assert export.compute_watermark(opportunities, set(), None) == "2025-01-04T00:00:00+00:00"
+    assert export.compute_watermark(opportunities, {"O0"}, "2024-12-01T00:00:00+00:00") == "2024-12-01T00:00:00+00:00"
+
+def test_checkpoint_reports_transient_aws_summary_failures_as_incomplete(tmp_path):
+    checkpoint = export.ExportCheckpoint(str(tmp_path / "checkpoint.jsonl"))
+    checkpoint.record_details("O1", {"Id": "O1"}, {"RelatedOpportunityId": "O1", "FAILED": "ThrottlingException"})
+    checkpoint.record_details("O2", {"Id": "O2"}, {"RelatedOpportunityId": "O2", "FAILED": "ResourceNotFoundException"})
+
+    assert checkpoint.incomplete() == {"O1"}
+
+def test_save_individual_files_does_not_overwrite_with_failed_records(tmp_path, monkeypatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("S3_BUCKET_NAME", "export-bucket")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with moto.mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="export-bucket")
+        export.save_individual_files([{"Id": "O1", "Title": "good"}], str(tmp_path), "", write_local=False, s3_client=s3_client)
+        export.save_individual_files([{"Id": "O1", "FAILED": "ThrottlingException"}], str(tmp_path), "", write_local=False,
+                                     s3_client=s3_client, manifest={})
+        body = s3_client.get_object(Bucket="export-bucket", Key="opportunities/O1.json")["Body"].read()
+
+    assert json.loads(body) == {"Id": "O1", "Title": "good"}
+
+def test_save_to_parquet_appends_with_a_unified_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    directory = str(tmp_path / "opportunities_aws_parquet")
+    first_run = [({"RelatedOpportunityId": "O1", "Origin": "AWS Referral", "Project": {"Spend": 10}}, "2025-01-02T00:00:00+00:00")]
+    second_run = [({"RelatedOpportunityId": "O2", "Project": {"Spend": "n/a"}, "Insights": {"Score": 0.5}}, "2025-02-03T00:00:00+00:00"),
+                  ({"RelatedOpportunityId": "O3", "FAILED": "ThrottlingException"}, None),
+                  ({"RelatedOpportunityId": "O4"}, None)]
+
+    export.save_to_parquet(iter(first_run), directory, row_group_size=1)
+    export.save_to_parquet(iter(second_run), directory, row_group_size=1, append=True)
+
+    rows = {row["RelatedOpportunityId"]: row for row in export.read_parquet(directory).to_pylist()}
+    assert set(rows) == {"O1", "O2", "O4"}
+    assert rows["O1"]["Project.Spend"] == "10" and rows["O1"]["Insights.Score"] is None
+    assert rows["O2"]["Project.Spend"] == "n/a" and rows["O2"]["Insights.Score"] == "0.5"
+    assert rows["O1"]["LastModifiedMonth"] == "2025-01" and rows["O2"]["LastModifiedMonth"] == "2025-02"
+    assert rows["O4"]["Stage"] == rows["O4"]["LastModifiedMonth"] == "unknown"
+
+def test_save_to_parquet_without_rows_removes_the_previous_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    directory = tmp_path / "opportunities_parquet"
+    export.save_to_parquet(iter([({"Id": "O1", "LifeCycle": {"Stage": "Prospect"}}, "2025-01-02T00:00:00+00:00")]), str(directory))
+    assert directory.exists()
+
+    export.save_to_parquet(iter([({"Id": "O2", "FAILED": "ThrottlingException"}, None)]), str(directory))
+
+    assert not directory.exists()
+
+class FakeListingClient(FakeDetailsClient):
+    """Lists a partner referral that is not submitted yet and an AWS referral."""
+
+    def __init__(self):
+        super().__init__()
+        self.list_requests = []
+        self.opportunities = {
+            "O1": {"Id": "O1", "Origin": "Partner Referral", "LifeCycle": {"Stage": "Prospect", "ReviewStatus": "Pending Submission"},
+                   "LastModifiedDate": "2025-01-02T00:00:00+00:00"},
+            "O2": {"Id": "O2", "Origin": "AWS Referral", "LifeCycle": {"Stage": "Qualified", "ReviewStatus": "Pending Submission"},
+                   "LastModifiedDate": "2025-01-03T00:00:00+00:00"},
+        }
+
+    def list_opportunities(self, **request):
+        self.list_requests.append(request)
+        return {"OpportunitySummaries": [{"Id": identifier, "LastModifiedDate": details["LastModifiedDate"]}
+                                         for identifier, details in self.opportunities.items()]}
+
+    def get_opportunity(self, Catalog, Identifier):
+        self.calls.append(("GetOpportunity", Identifier))
+        return self.opportunities[Identifier]
+
+def test_main_lists_by_review_status_and_plans_out_aws_summaries(tmp_path, monkeypatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("S3_BUCKET_NAME", "export-bucket")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.chdir(tmp_path)
+    client = FakeListingClient()
+    monkeypatch.setattr(export, "get_boto3_client", lambda service_name, region_name, **kwargs:
+                        client if service_name == export.SERVICE_NAME else boto3.client(service_name, region_name="us-east-1"))
+    monkeypatch.setattr(export, "_s3_client", None)
+    monkeypatch.setattr("sys.argv", ["export_opportunities.py", "--review-status", "Pending Submission", "--concurrency", "1"])
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="export-bucket")
+        export.main()
+
+    assert client.list_requests[0]["LifeCycleReviewStatus"] == ["Pending Submission"]
+    assert [call for call in client.calls if call[0] == "GetAwsOpportunitySummary"] == [("GetAwsOpportunitySummary", "O2")]
+    assert [row["Id"] for row in read_rows(tmp_path / "opportunities.csv")] == ["O1", "O2"]
+    assert [row["RelatedOpportunityId"] for row in read_rows(tmp_path / "opportunities_aws.csv")] == ["O2"]
+    assert not (tmp_path / export.DEFAULT_CHECKPOINT_FILE).exists()
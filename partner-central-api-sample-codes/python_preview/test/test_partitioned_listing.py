@@ -0,0 +1,50 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from datetime import datetime, timezone
+
+from utils.partitioned_listing import WINDOW_OVERLAP, list_opportunities_partitioned, split_date_range, to_datetime
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+END = datetime(2025, 1, 5, tzinfo=timezone.utc)
+
+class WindowedListingClient:
+    """Pages summaries whose LastModifiedDate falls in the requested window, two per page."""
+
+    def __init__(self, summaries):
+        self.summaries = summaries
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def list_opportunities(self, **request):
+        with self._lock:
+            self.requests.append(request)
+        window = request["LastModifiedDate"]
+        matching = [summary for summary in self.summaries
+                    if window["AfterLastModifiedDate"] <= to_datetime(summary["LastModifiedDate"]) <= window["BeforeLastModifiedDate"]]
+        offset = int(request.get("NextToken", 0))
+        response = {"OpportunitySummaries": matching[offset:offset + 2]}
+        if offset + 2 < len(matching):
+            response["NextToken"] = str(offset + 2)
+        return response
+
+def test_split_date_range_covers_the_range_with_overlap():
+    windows = split_date_range(START, END, 4)
+
+    assert windows[0][0] == START and windows[-1][1] == END
+    assert [window[1] for window in windows[:-1]] == [datetime(2025, 1, day, tzinfo=timezone.utc) + WINDOW_OVERLAP
+                                                      for day in (2, 3, 4)]
+
+def test_partitioned_listing_returns_each_opportunity_once():
+    summaries = [{"Id": f"O{hour}", "LastModifiedDate": f"2025-01-0{1 + hour // 24}T{hour % 24:02d}:00:00+00:00"}
+                 for hour in range(0, 96, 5)]
+    # On a window boundary, so it is listed by two windows
+    summaries.append({"Id": "O-boundary", "LastModifiedDate": "2025-01-03T00:00:00+00:00"})
+    client = WindowedListingClient(summaries)
+
+    listed = list_opportunities_partitioned(client, {"Catalog": "Sandbox"}, START, END, partitions=4)
+
+    assert sorted(summary["Id"] for summary in listed) == sorted(summary["Id"] for summary in summaries)
+    assert all(request["Catalog"] == "Sandbox" and request["MaxResults"] == 100 for request in client.requests)
+    assert any("NextToken" in request for request in client.requests)
@@ -0,0 +1,81 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from utils.payload_validator import OPERATION_CREATE, OPERATION_UPDATE, PayloadValidator, postal_format_to_regex, validate_files
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+SAMPLE_PAYLOAD = os.path.join(SRC_DIR, "bulk_create_opportunities", "opportunities", "opportunity_1.json")
+# The payloads shipped with the scripts and the operation each one is sent with
+SHIPPED_SAMPLES = [
+    ("bulk_create_opportunities/opportunities/opportunity_1.json", OPERATION_CREATE),
+    ("bulk_create_opportunities/opportunities/opportunity_2.json", OPERATION_CREATE),
+    ("bulk_update_opportunities/opportunities/opportunity_1.json", OPERATION_UPDATE),
+    ("bulk_update_opportunities/opportunities/opportunity_2.json", OPERATION_UPDATE),
+    ("create_opportunity/createOpportunity.json", OPERATION_CREATE),
+    ("create_opportunity/createOpportunity_aws.json", OPERATION_CREATE),
+    ("update_opportunity/update_opportunity.json", OPERATION_UPDATE),
+    ("update_opportunity/update_opportunity_approved.json", OPERATION_UPDATE),
+    ("update_opportunity/update_opportunity_technical_validation.json", OPERATION_UPDATE),
+]
+
+@pytest.fixture(scope="module")
+def validator():
+    return PayloadValidator.from_samples()
+
+@pytest.fixture
+def payload():
+    with open(SAMPLE_PAYLOAD, encoding="utf-8") as file:
+        payload = json.load(file)
+    payload["LifeCycle"]["TargetCloseDate"] = (date.today() + timedelta(days=30)).isoformat()
+    return payload
+
+def test_sample_payload_passes(validator, payload):
+    assert validator.validate(payload) == []
+
+@pytest.mark.parametrize("sample, operation", SHIPPED_SAMPLES)
+def test_shipped_samples_pass(validator, sample, operation):
+    with open(os.path.join(SRC_DIR, sample), encoding="utf-8") as file:
+        payload = json.load(file)
+    # Sample close dates are fixed and eventually fall in the past
+    if payload.get("LifeCycle", {}).get("TargetCloseDate"):
+        payload["LifeCycle"]["TargetCloseDate"] = (date.today() + timedelta(days=30)).isoformat()
+    assert validator.validate(payload, operation) == []
+
+def test_rules_compiled_from_the_sample_csvs(validator, payload):
+    invalid = copy.deepcopy(payload)
+    invalid["Customer"]["Account"]["Industry"] = "Knitting"
+    invalid["Customer"]["Account"]["Address"]["PostalCode"] = "ABCDE"
+    invalid["Customer"]["Account"]["Address"]["StateOrRegion"] = "Atlantis"
+    invalid["LifeCycle"]["TargetCloseDate"] = "2020-01-01"
+    del invalid["Project"]["Title"]
+
+    errors = validator.validate(invalid)
+
+    assert any(error.startswith("Customer.Account.Industry: 'Knitting'") for error in errors)
+    assert any(error.startswith("Customer.Account.Address.PostalCode:") for error in errors)
+    assert any(error.startswith("Customer.Account.Address.StateOrRegion: 'Atlantis'") for error in errors)
+    assert "LifeCycle.TargetCloseDate: '2020-01-01' must be a date that is not in the past" in errors
+    assert "Project.Title: is mandatory for create" in errors
+    assert "Identifier: is mandatory for update" in validator.validate(payload, OPERATION_UPDATE)
+
+def test_postal_format_to_regex():
+    regex = postal_format_to_regex("99999 or 99999-9999")
+    assert regex.fullmatch("10001") and regex.fullmatch("10001-1234") and not regex.fullmatch("1000")
+
+def test_validate_files_returns_only_rejected_files(tmp_path, payload):
+    valid, invalid, broken = tmp_path / "valid.json", tmp_path / "invalid.json", tmp_path / "broken.json"
+    valid.write_text(json.dumps(payload))
+    invalid.write_text(json.dumps(dict(payload, OpportunityType="Unknown")))
+    broken.write_text("{")
+
+    rejected = validate_files([str(valid), str(invalid), str(broken)], workers=1)
+
+    assert set(rejected) == {str(invalid), str(broken)}
+    assert rejected[str(broken)][0].startswith("file: ")
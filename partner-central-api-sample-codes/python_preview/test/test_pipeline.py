@@ -0,0 +1,38 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from utils.pipeline import Pipeline, Stage
+
+def test_items_flow_through_every_stage():
+    pipeline = Pipeline([Stage("double", lambda x: x * 2, workers=3), Stage("add", lambda x: x + 1, workers=2)], queue_size=2)
+
+    assert sorted(pipeline.run(range(50))) == [x * 2 + 1 for x in range(50)]
+    assert [stage.processed for stage in pipeline.stages] == [50, 50]
+
+def test_items_returning_none_finish_at_their_stage():
+    pipeline = Pipeline([Stage("even", lambda x: x if x % 2 == 0 else None), Stage("keep", lambda x: x)])
+
+    assert sorted(pipeline.run(range(10))) == [0, 2, 4, 6, 8]
+
+def test_unhandled_errors_are_passed_to_on_error():
+    failed = []
+
+    def handler(x):
+        if x == 3:
+            raise ConnectionError("connection reset")
+        return x
+
+    stage = Stage("flaky", handler, workers=2, on_error=lambda item, error: failed.append((item, type(error).__name__)))
+    results = Pipeline([stage]).run(range(5))
+
+    assert sorted(results) == [0, 1, 2, 4]
+    assert failed == [(3, "ConnectionError")]
+    assert stage.errors == 1 and stage.processed == 5
+
+def test_a_failing_on_error_does_not_stop_the_stage():
+    def on_error(item, error):
+        raise RuntimeError("reporting failed")
+
+    stage = Stage("flaky", lambda x: 1 / x, on_error=on_error)
+
+    assert len(Pipeline([stage]).run(range(4))) == 3
@@ -0,0 +1,42 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import multiprocessing
+
+import pytest
+
+from utils.bulk_input import Shard
+from utils.process_runner import ProgressReporter, merge_counts, merge_segments, run_sharded, segment_path
+
+def count_shard(shard, progress_queue, total):
+    """Worker: counts the numbers of range(total) that belong to its shard."""
+    counts = {"owned": 0}
+    with ProgressReporter(progress_queue, shard, counts, interval=0.01):
+        for number in range(total):
+            counts["owned"] += shard.owns(number)
+    return {"counts": counts, "shard": shard.index}
+
+def test_segment_path_and_merge_counts():
+    assert segment_path("out/results.jsonl", Shard(1, 4)) == "out/results.shard-1-of-4.jsonl"
+    assert merge_counts([{"created": 2, "failed": 1}, {"created": 3}]) == {"created": 5, "failed": 1}
+
+def test_merge_segments_appends_in_shard_order(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("earlier\n")
+    for index in (1, 0):
+        with open(segment_path(path, Shard(index, 3)), "w", encoding="utf-8") as file:
+            file.write(f"shard {index}\n")
+
+    merge_segments(path, 3)
+
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "earlier\nshard 0\nshard 1\n"
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["results.jsonl"]
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers are defined in the test module")
+def test_run_sharded_returns_worker_results_in_shard_order():
+    results = run_sharded(count_shard, 3, worker_args=(300,), progress_interval=0.01)
+
+    assert [result["shard"] for result in results] == [0, 1, 2]
+    assert merge_counts(result["counts"] for result in results) == {"owned": 300}
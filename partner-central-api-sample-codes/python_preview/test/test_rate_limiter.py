@@ -0,0 +1,67 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+import utils.rate_limiter as rate_limiter
+from utils.rate_limiter import RateLimiter, TokenBucket, parse_rates, worker_rate_limiter
+
+class FakeClock:
+    """Replaces time.monotonic and time.sleep: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake.sleep)
+    return fake
+
+def test_token_bucket_allows_a_burst_then_the_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.slept == 0
+
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.slept == pytest.approx(2.0)
+
+def test_rate_limiter_keeps_a_bucket_per_operation(clock):
+    limiter = RateLimiter({"CreateOpportunity": 1}, default_rate=10)
+    limiter.acquire("CreateOpportunity")
+    limiter.acquire("GetOpportunity")
+    limiter.acquire("CreateOpportunity")
+
+    assert clock.slept == pytest.approx(1.0)
+
+def test_operations_without_a_rate_are_not_limited(clock):
+    limiter = RateLimiter({"CreateOpportunity": 1})
+    for _ in range(100):
+        limiter.acquire("GetOpportunity")
+    assert clock.slept == 0
+
+def test_worker_rate_limiter_takes_its_share_of_the_rates(clock):
+    limiter = worker_rate_limiter({"UpdateOpportunity": 4}, default_rate=8, processes=4)
+    for _ in range(3):
+        limiter.acquire("UpdateOpportunity")
+        limiter.acquire("GetOpportunity")
+
+    assert clock.slept == pytest.approx(2.0)
+
+def test_parse_rates():
+    assert parse_rates(["CreateOpportunity=5", "GetOpportunity=0.5"]) == {"CreateOpportunity": 5.0, "GetOpportunity": 0.5}
+    with pytest.raises(ValueError):
+        parse_rates(["CreateOpportunity"])
+    with pytest.raises(ValueError):
+        TokenBucket(0)
@@ -0,0 +1,75 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.client import ClientError
+from botocore.credentials import Credentials
+
+from utils.constants import API_ENDPOINT
+from utils.raw_client import RawPartnerCentralClient, endpoint_for
+from utils.retry import RetryBudget, RetryPolicy
+
+class CannedBody:
+    def __init__(self, content):
+        self.content = content
+
+    def stream(self, **kwargs):
+        yield self.content
+
+class CannedHttpSession:
+    """Stands in for the raw client's connection pool: answers with the next (status, body) of `responses`."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request):
+        self.requests.append(request)
+        status, body = self.responses.pop(0)
+        headers = {"Content-Type": "application/x-amz-json-1.0", "x-amzn-RequestId": "request-id"}
+        return AWSResponse(request.url, status, headers, CannedBody(json.dumps(body).encode("utf-8")))
+
+    def close(self):
+        pass
+
+def raw_client(responses):
+    client = RawPartnerCentralClient(credentials=Credentials("testing", "testing"),
+                                     retry_policy=RetryPolicy(base_delay=0, budget=RetryBudget(None)))
+    client._http = CannedHttpSession(responses)
+    return client
+
+def test_endpoint_follows_the_configured_api_endpoint():
+    assert endpoint_for("us-east-1") == API_ENDPOINT
+    assert raw_client([]).endpoint_url == API_ENDPOINT + "/"
+
+def test_call_signs_the_operation_and_decodes_the_response():
+    client = raw_client([(200, {"Id": "O1", "LastModifiedDate": "2025-01-02T03:04:05.678Z"})])
+
+    opportunity = client.get_opportunity(Catalog="Sandbox", Identifier="O1")
+
+    request = client._http.requests[0]
+    assert opportunity == {"Id": "O1", "LastModifiedDate": "2025-01-02T03:04:05.678Z"}
+    assert request.headers["X-Amz-Target"] == "AWSPartnerCentralSelling.GetOpportunity"
+    assert request.headers["Authorization"].startswith("AWS4-HMAC-SHA256 Credential=testing/")
+
+def test_call_retries_throttling_and_raises_terminal_errors_as_client_error():
+    client = raw_client([(429, {"__type": "ThrottlingException", "message": "Rate exceeded"}),
+                         (200, {"Id": "O1"}),
+                         (400, {"__type": "com.amazonaws#ValidationException", "message": "Bad identifier"})])
+
+    assert client.get_opportunity(raw=True, Catalog="Sandbox", Identifier="O1") == b'{"Id": "O1"}'
+    with pytest.raises(ClientError) as error:
+        client.get_opportunity(Catalog="Sandbox", Identifier="bad")
+
+    assert error.value.response["Error"] == {"Code": "ValidationException", "Message": "Bad identifier"}
+    assert len(client._http.requests) == 3
+
+def test_paginate_follows_next_token():
+    client = raw_client([(200, {"OpportunitySummaries": [{"Id": "O1"}], "NextToken": "t1"}),
+                         (200, {"OpportunitySummaries": [{"Id": "O2"}]})])
+
+    assert [summary["Id"] for summary in client.paginate("ListOpportunities", Catalog="Sandbox")] == ["O1", "O2"]
+    assert json.loads(client._http.requests[1].body)["NextToken"] == "t1"
@@ -0,0 +1,39 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from utils.result_sink import ResultSink, read_results, summarize_results
+
+def test_records_are_buffered_until_flush_or_close(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    sink = ResultSink(path, flush_records=3, flush_seconds=3600)
+    sink.record("a.json", "created", "O1", timings={"create": 0.123456})
+    sink.record("b.json", "create_failed", error={"Error": {"Code": "ValidationException", "Message": "bad"}})
+    assert list(read_results(path)) == []
+
+    sink.record("c.json", "created", "O3")
+    assert len(list(read_results(path))) == 3
+    sink.record("d.json", "created", "O4")
+    sink.close()
+
+    results = list(read_results(path))
+    assert [result["file"] for result in results] == ["a.json", "b.json", "c.json", "d.json"]
+    assert results[0]["timings"] == {"create": 0.1235}
+    assert results[1]["error_code"] == "ValidationException" and results[1]["opportunity_id"] is None
+
+def test_summarize_results_groups_failures_of_one_run(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultSink(path, run_id="old") as sink:
+        sink.record("old.json", "create_failed", error={"Error": {"Code": "ThrottlingException"}})
+    with ResultSink(path, run_id="new") as sink:
+        sink.record("a.json", "created", "O1")
+        sink.record("b.json", "create_failed", error={"Error": {"Code": "ValidationException", "Message": "bad"}})
+        sink.record("c.json", "submit_failed", "O3", error={"Error": {"Code": "ValidationException", "Message": "worse"}})
+
+    summary = summarize_results(path, run_id="new")
+
+    assert summary["total"] == 3
+    assert summary["by_status"] == {"created": 1, "create_failed": 1, "submit_failed": 1}
+    failure = summary["failures_by_error_code"]["ValidationException"]
+    assert failure["count"] == 2 and failure["statuses"] == {"create_failed": 1, "submit_failed": 1}
+    assert [example["file"] for example in failure["examples"]] == ["b.json", "c.json"]
+    assert summarize_results(path)["total"] == 4
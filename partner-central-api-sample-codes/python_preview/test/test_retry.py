@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.client import ClientError
+from botocore.config import Config
+
+from utils.retry import RetryBudget, RetryPolicy, install_retry
+
+class CannedBody:
+    def __init__(self, content):
+        self.content = content
+
+    def stream(self, **kwargs):
+        yield self.content
+
+def error_response(status, code):
+    return status, {"__type": code, "message": code}
+
+class CannedEndpoint:
+    """Answers each request with the next (status, body) of `responses` and records the request bodies."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request, **kwargs):
+        self.requests.append(json.loads(request.body))
+        status, body = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        headers = {"Content-Type": "application/x-amz-json-1.0", "x-amzn-RequestId": "request-id"}
+        return AWSResponse(request.url, status, headers, CannedBody(json.dumps(body).encode("utf-8")))
+
+def partner_central_client(responses, policy):
+    client = boto3.client("partnercentral-selling", region_name="us-east-1", aws_access_key_id="testing",
+                          aws_secret_access_key="testing", config=Config(retries={"mode": "standard", "total_max_attempts": 1}))
+    endpoint = CannedEndpoint(responses)
+    client.meta.events.register("before-send.partnercentral-selling", endpoint)
+    return install_retry(client, policy), endpoint
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_attempts=3, base_delay=0, budget=RetryBudget(None))
+
+ASSOCIATE_REQUEST = {"Catalog": "Sandbox", "OpportunityIdentifier": "O1", "RelatedEntityType": "Solutions",
+                     "RelatedEntityIdentifier": "S-1"}
+
+def test_write_without_client_token_is_not_retried_after_server_error(policy):
+    client, endpoint = partner_central_client([error_response(500, "InternalServerException")], policy)
+
+    with pytest.raises(ClientError):
+        client.associate_opportunity(**ASSOCIATE_REQUEST)
+
+    assert len(endpoint.requests) == 1
+
+def test_write_without_client_token_is_retried_after_throttling(policy):
+    client, endpoint = partner_central_client([error_response(429, "ThrottlingException"), (200, {})], policy)
+
+    client.associate_opportunity(**ASSOCIATE_REQUEST)
+
+    assert len(endpoint.requests) == 2
+
+def test_write_with_client_token_is_retried_with_the_same_token(policy):
+    client, endpoint = partner_central_client([error_response(500, "InternalServerException"), (200, {"Id": "O1"})], policy)
+
+    assert client.create_opportunity(Catalog="Sandbox")["Id"] == "O1"
+
+    assert len(endpoint.requests) == 2
+    assert endpoint.requests[0]["ClientToken"] == endpoint.requests[1]["ClientToken"]
+
+def test_read_is_retried_after_server_error(policy):
+    client, endpoint = partner_central_client([error_response(503, "ServiceUnavailableException"), (200, {"Id": "O1"})], policy)
+
+    assert client.get_opportunity(Catalog="Sandbox", Identifier="O1")["Id"] == "O1"
+    assert len(endpoint.requests) == 2
+
+def test_each_retry_takes_a_rate_limiter_token():
+    class RecordingRateLimiter:
+        def __init__(self):
+            self.acquired = []
+
+        def acquire(self, operation):
+            self.acquired.append(operation)
+
+    rate_limiter = RecordingRateLimiter()
+    policy = RetryPolicy(max_attempts=5, base_delay=0, budget=RetryBudget(None), rate_limiter=rate_limiter)
+    client, endpoint = partner_central_client([error_response(429, "ThrottlingException")] * 2 + [(200, {"Id": "O1"})], policy)
+
+    client.get_opportunity(Catalog="Sandbox", Identifier="O1")
+
+    assert len(endpoint.requests) == 3
+    assert rate_limiter.acquired == ["GetOpportunity", "GetOpportunity"]
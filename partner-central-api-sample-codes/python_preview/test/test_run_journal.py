@@ -0,0 +1,36 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from utils.run_journal import CREATED, SUBMITTED, RunJournal, content_hash, derive_client_token
+
+def test_content_hash_ignores_client_token_and_key_order():
+    assert content_hash({"Catalog": "Sandbox", "Project": {"Title": "a"}, "ClientToken": "1"}) == \
+        content_hash({"Project": {"Title": "a"}, "Catalog": "Sandbox", "ClientToken": "2"})
+    assert content_hash({"Project": {"Title": "a"}}) != content_hash({"Project": {"Title": "b"}})
+
+def test_derive_client_token_is_deterministic_per_operation():
+    token = derive_client_token("CreateOpportunity", "hash")
+    assert token == derive_client_token("CreateOpportunity", "hash") and len(token) == 64
+    assert token != derive_client_token("StartEngagementFromOpportunityTask", "hash")
+
+def test_error_keeps_the_created_opportunity(tmp_path):
+    journal = RunJournal(str(tmp_path / "journal.db"))
+    journal.record_created("h1", "a.json", "O1")
+    journal.record_error("h1", "a.json", "ThrottlingException")
+    journal.record_error("h2", "b.json", "ValidationException")
+
+    assert journal.get("h1") == {"source": "a.json", "opportunity_id": "O1", "status": CREATED,
+                                 "error_code": "ThrottlingException"}
+    assert journal.get("h2")["status"] is None
+    assert journal.get("missing") is None
+
+def test_journal_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "journal.db")
+    first, second = RunJournal(path), RunJournal(path)
+    first.record_submitted("h1", "a.json", "O1")
+    second.record_created("h2", "b.json", "O2")
+
+    assert second.get("h1")["status"] == SUBMITTED
+    assert first.counts() == {CREATED: 1, SUBMITTED: 1}
+    first.close()
+    second.close()
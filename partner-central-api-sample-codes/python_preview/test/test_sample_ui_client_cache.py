@@ -0,0 +1,52 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+import os
+
+import pytest
+
+# sampleUI has its own top-level utils package; its retry and client_config copies match src/utils
+AWS_CLIENT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "sampleUI", "utils", "aws_client.py")
+
+@pytest.fixture
+def aws_client(monkeypatch):
+    spec = importlib.util.spec_from_file_location("sample_ui_aws_client", AWS_CLIENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    created = []
+
+    def create_client(service_name, region_name, identity, retry_policy):
+        created.append((service_name, region_name, identity))
+        return object()
+
+    monkeypatch.setattr(module, "_create_client", create_client)
+    module.created = created
+    return module
+
+def test_clients_are_cached_per_service_and_region(aws_client, monkeypatch):
+    monkeypatch.setattr(aws_client, "_use_login", False)
+
+    client = aws_client.get_boto3_client("partnercentral-selling")
+
+    assert aws_client.get_boto3_client("partnercentral-selling") is client
+    assert aws_client.get_boto3_client("partnercentral-selling", "eu-west-1") is not client
+    assert aws_client.created == [("partnercentral-selling", "us-east-1", ("default",)),
+                                  ("partnercentral-selling", "eu-west-1", ("default",))]
+
+def test_a_new_login_gets_new_clients_and_drops_the_old_ones(aws_client, monkeypatch):
+    monkeypatch.setattr(aws_client, "_use_login", True)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "first")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    first = aws_client.get_boto3_client("partnercentral-selling")
+    assert aws_client.get_boto3_client("partnercentral-selling") is first
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "second")
+    second = aws_client.get_boto3_client("partnercentral-selling")
+
+    assert second is not first
+    assert len(aws_client._clients) == 1
+    identities = [identity for _, _, identity in aws_client.created]
+    assert identities[0][0] == "env" and identities[0] != identities[1]
+    assert "second" not in identities[1][1] and "secret" not in identities[1][1]
@@ -0,0 +1,23 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules copied into the utils package of each standalone sample. Each sample runs on its own with its
+# own top-level `utils` package, and only one `utils` package can be imported per process, so the samples
+# cannot import src/utils; the copies are kept identical instead.
+SHARED_MODULES = ["retry.py", "client_config.py"]
+SAMPLE_PACKAGES = ["sampleUI", "leadToOpportunity"]
+
+def read(*path):
+    with open(os.path.join(ROOT, *path), encoding="utf-8") as file:
+        return file.read()
+
+@pytest.mark.parametrize("package", SAMPLE_PACKAGES)
+@pytest.mark.parametrize("module", SHARED_MODULES)
+def test_sample_copies_match_src_utils(package, module):
+    assert read(package, "utils", module) == read("src", "utils", module)
@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+import json
+import os
+
+import pytest
+import requests
+from botocore.credentials import Credentials
+
+from utils.retry import RetryBudget, RetryPolicy
+
+# leadToOpportunity has its own top-level utils package; its retry and client_config copies match src/utils
+SIGNED_TRANSPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "leadToOpportunity", "utils", "signed_transport.py")
+spec = importlib.util.spec_from_file_location("signed_transport", SIGNED_TRANSPORT_PATH)
+signed_transport = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(signed_transport)
+
+def http_response(status, body, error_type=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode("utf-8")
+    if error_type:
+        response.headers["x-amzn-ErrorType"] = error_type
+    return response
+
+class CannedSession:
+    """Stands in for the transport's requests.Session: answers with the next outcome, a response or an exception."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def post(self, url, data, headers, timeout):
+        self.calls.append(headers["X-Amz-Target"])
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def transport(outcomes):
+    signed = signed_transport.SignedTransport(Credentials("testing", "testing"), "https://partnercentral.example",
+                                              retry_policy=RetryPolicy(base_delay=0, budget=RetryBudget(None)))
+    signed.session = CannedSession(outcomes)
+    return signed
+
+GET_ENGAGEMENT = {"Catalog": "Sandbox", "Identifier": "eng-1"}
+
+def test_post_retries_throttling_and_server_errors():
+    signed = transport([http_response(429, {}, "ThrottlingException:http://internal.amazon.com/"),
+                        http_response(503, {}),
+                        http_response(200, {"Id": "eng-1"})])
+
+    response = signed.post("GetEngagement", GET_ENGAGEMENT)
+
+    assert response.json() == {"Id": "eng-1"}
+    assert signed.session.calls == ["AWSPartnerCentralSelling.GetEngagement"] * 3
+
+def test_post_retries_throttling_by_error_code_whatever_the_status():
+    signed = transport([http_response(400, {}, "ThrottlingException:http://internal.amazon.com/"),
+                        http_response(400, {"__type": "com.amazonaws.partnercentral#ThrottlingException"}),
+                        http_response(200, {"Id": "eng-1"})])
+
+    response = signed.post("UpdateEngagementContext", {"Catalog": "Sandbox", "EngagementIdentifier": "eng-1"})
+
+    assert response.status_code == 200
+    assert len(signed.session.calls) == 3
+
+def test_post_retries_connection_errors_of_reads():
+    signed = transport([requests.exceptions.ConnectionError("reset"), http_response(200, {"Id": "eng-1"})])
+
+    assert signed.post("GetEngagement", GET_ENGAGEMENT).status_code == 200
+    assert len(signed.session.calls) == 2
+
+def test_post_returns_the_last_response_of_writes_without_client_token():
+    signed = transport([http_response(500, {"message": "boom"}, "InternalServerException")])
+
+    response = signed.post("UpdateEngagementContext", {"Catalog": "Sandbox", "EngagementIdentifier": "eng-1"})
+
+    assert response.status_code == 500
+    assert len(signed.session.calls) == 1
+
+def test_post_returns_client_errors_without_retrying():
+    signed = transport([http_response(400, {"message": "bad"}, "ValidationException")])
+
+    assert signed.post("GetEngagement", GET_ENGAGEMENT).status_code == 400
+    assert len(signed.session.calls) == 1
+
+def test_post_raises_connection_errors_once_the_retries_are_spent():
+    signed = transport([requests.exceptions.ConnectionError("reset")] * 5)
+
+    with pytest.raises(signed_transport.EndpointConnectionError):
+        signed.post("GetEngagement", GET_ENGAGEMENT)
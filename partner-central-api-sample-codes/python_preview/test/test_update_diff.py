@@ -0,0 +1,45 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from botocore.client import ClientError
+
+from utils.update_diff import CHANGED, UNCHANGED, UNKNOWN, diff_update, plan_updates
+
+def test_diff_update_ignores_request_only_fields_and_nulls():
+    desired = {"Identifier": "O1", "LastModifiedDate": "2025-01-01T00:00:00Z",
+               "LifeCycle": {"Stage": "Prospect"}, "Project": {"Title": "new", "Other": None}}
+    current = {"Id": "O1", "Arn": "arn", "LastModifiedDate": "2025-01-01T00:00:00+00:00",
+               "LifeCycle": {"Stage": "Prospect", "ReviewStatus": "Submitted"}, "Project": {"Title": "old"}}
+
+    assert diff_update(desired, current) == [("Project.Title", "old", "new")]
+
+def test_diff_update_reports_fields_the_update_would_clear():
+    desired = {"Identifier": "O1", "Project": {"Title": "same"}}
+    current = {"Id": "O1", "Project": {"Title": "same", "CustomerBusinessProblem": "problem"}, "PrimaryNeedsFromAws": ["Co-Sell"]}
+
+    assert diff_update(desired, current) == [
+        ("Project.CustomerBusinessProblem", "problem", None), ("PrimaryNeedsFromAws", ["Co-Sell"], None)]
+
+def test_diff_update_reports_a_stale_last_modified_date():
+    desired = {"Identifier": "O1", "LastModifiedDate": "2025-01-01T00:00:00Z", "Project": {"Title": "same"}}
+    current = {"Id": "O1", "LastModifiedDate": "2025-01-02T00:00:00Z", "Project": {"Title": "same"}}
+
+    assert diff_update(desired, current) == [("LastModifiedDate", "2025-01-02T00:00:00Z", "2025-01-01T00:00:00Z")]
+
+def test_plan_updates_reads_each_opportunity_once(fake_client):
+    fake_client.opportunities.update({"O1": {"Project": {"Title": "same"}}, "O2": {"Project": {"Title": "old"}}})
+    fake_client.fail["GetOpportunity"] = lambda request: ClientError(
+        {"Error": {"Code": "ResourceNotFoundException"}}, "GetOpportunity") if request["Identifier"] == "O3" else None
+    batch = [("a.json", {"Identifier": "O1", "Project": {"Title": "same"}}),
+             ("b.json", {"Identifier": "O2", "Project": {"Title": "new"}}),
+             ("c.json", {"Identifier": "O1", "Project": {"Title": "changed"}}),
+             ("d.json", {"Identifier": "O3", "Project": {"Title": "new"}}),
+             ("e.json", {"Project": {"Title": "no identifier"}})]
+
+    plan = list(plan_updates(fake_client, batch, concurrency=2))
+
+    assert [(source, status) for source, _, status, _, _ in plan] == [
+        ("a.json", UNCHANGED), ("b.json", CHANGED), ("c.json", CHANGED), ("d.json", UNKNOWN), ("e.json", UNKNOWN)]
+    assert plan[1][3] == [("Project.Title", "old", "new")]
+    assert plan[3][4]["Error"]["Code"] == "ResourceNotFoundException"
+    assert fake_client.calls["GetOpportunity"] == 3
@@ -0,0 +1,49 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import datetime
+
+import pytest
+from botocore.client import ClientError
+
+from utils.verification import VERIFY_DEFERRED, VERIFY_INLINE, VERIFY_OFF, Verifier, diff_fields
+
+def test_diff_fields_compares_only_written_fields():
+    expected = {"ClientToken": "t", "Project": {"Title": "a", "Spend": [{"Amount": 10}]}, "LifeCycle": {"Stage": "Prospect"}}
+    actual = {"Id": "O1", "Project": {"Title": "a", "Spend": [{"Amount": "10"}], "Extra": 1}, "LifeCycle": {"Stage": "Qualified"}}
+
+    assert diff_fields(expected, actual) == [("LifeCycle.Stage", "Prospect", "Qualified")]
+    assert diff_fields({"Date": datetime(2025, 1, 2)}, {"Date": "2025-01-02T00:00:00"}) == []
+    assert diff_fields({"Items": [1, 2]}, {"Items": [1]}) == [("Items", [1, 2], [1])]
+
+def test_inline_verification_reads_every_write(fake_client):
+    fake_client.opportunities["O1"] = {"Project": {"Title": "a"}}
+    verifier = Verifier(fake_client, VERIFY_INLINE)
+
+    verifier.written("O1", {"Project": {"Title": "a"}}, "a.json")
+    verifier.written("O1", {"Project": {"Title": "b"}}, "b.json")
+
+    failures = verifier.finish()
+    assert verifier.verified == 2
+    assert [(failure["source"], failure["mismatches"]) for failure in failures] == [("b.json", [("Project.Title", "b", "a")])]
+
+def test_deferred_verification_reads_at_finish(fake_client):
+    fake_client.fail["GetOpportunity"] = lambda request: ClientError(
+        {"Error": {"Code": "ResourceNotFoundException"}}, "GetOpportunity") if request["Identifier"] == "O2" else None
+    fake_client.opportunities["O1"] = {"Project": {"Title": "a"}}
+    verifier = Verifier(fake_client, VERIFY_DEFERRED, concurrency=2)
+
+    verifier.written("O1", {"Project": {"Title": "a"}})
+    verifier.written("O2", {"Project": {"Title": "a"}})
+    assert fake_client.calls["GetOpportunity"] == 0
+
+    failures = verifier.finish()
+    assert verifier.verified == 2
+    assert [failure["error"]["Error"]["Code"] for failure in failures] == ["ResourceNotFoundException"]
+
+def test_verification_off_makes_no_calls(fake_client):
+    verifier = Verifier(fake_client, VERIFY_OFF)
+    verifier.written("O1", {})
+    assert verifier.finish() == [] and fake_client.calls["GetOpportunity"] == 0
+    with pytest.raises(ValueError):
+        Verifier(fake_client, "sometimes")